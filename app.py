@@ -31,11 +31,26 @@ import re
 import traceback
 import json
 import hashlib
+import hmac
 import time
-from flask import Flask, render_template, request, redirect, url_for, jsonify, session, flash
+import queue
+import threading
+import logging
+from contextlib import asynccontextmanager
+from flask import Flask, render_template, request, redirect, url_for, jsonify, session, flash, Response, stream_with_context, g
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from models import init_db, User, Product, Collection, PriceTracking, Notification, get_db_connection
+from models import User, Product, Collection, PriceTracking, Notification, get_db_connection, get_pool_stats, get_request_query_count, DIALECT, decode_page_cursor, PRODUCT_PAGE_SIZE, MAX_PAGE_SIZE
+from price_scheduler import RefreshScheduler
+from events import event_bus, format_sse
+from migrations import ensure_schema
+from metrics import span, scrape_metrics, http_metrics, query_count_histogram, counters, PrometheusWriter, MAX_METRIC_DOMAINS
+from scrape_stats import ScrapingStats
+from log_setup import setup_logging
+from scrape_worker import ScrapeWorkerClient, ScrapeWorkerError, SCRAPE_WORKER_SOCKET
+from db_pool import GEVENT_PATCHED
+
+if GEVENT_PATCHED:
+    import gevent
 
 try:
     from dotenv import load_dotenv
@@ -44,6 +59,13 @@ except ImportError:
     print("[UYARI] python-dotenv yüklü değil, .env dosyası yüklenmeyecek")
     pass
 
+# Logging konfigürasyonu: kuyruk üzerinden asenkron, dosya boyutla döndürülür (log_setup)
+setup_logging()
+# Scraping pipeline'ının logger'ı; seviyesi LOG_LEVELS ile ayrıca ayarlanabilir
+logger = logging.getLogger('wishya.scraper')
+# Ürün ekleme route'larının logger'ı
+product_logger = logging.getLogger('wishya.products')
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'favit-secret-key-2025')
 
@@ -67,18 +89,23 @@ else:
 scraping_cache = {}
 CACHE_DURATION = 1800  # 30 minutes cache (reduced from 1 hour)
 MAX_CACHE_SIZE = 50  # Maximum cache entries
+# gthread worker'da istek thread'leri ve fiyat zamanlayıcısı önbelleği aynı anda günceller
+scraping_cache_lock = threading.Lock()
 
 # Memory management for free plan
 def cleanup_memory():
     """Clean up memory for Render free plan"""
     gc.collect()
     if psutil.virtual_memory().percent > 80:
-        scraping_cache.clear()
+        with scraping_cache_lock:
+            scraping_cache.clear()
         gc.collect()
     print(f"[DEBUG] Memory cleanup completed - Usage: {psutil.virtual_memory().percent}%")
 
 # File to store dynamically added brands
 BRANDS_FILE = "dynamic_brands.json"
+# Dosyadaki listeyi oku-değiştir-yaz işlemleri arasında başka thread'in eklemesi kaybolmasın
+brands_lock = threading.RLock()
 
 # Site-specific scraping configurations
 SITE_CONFIGS = {
@@ -425,10 +452,10 @@ async def extract_with_site_config(page, url, site_config):
                             title = title.strip().upper()
                             title = re.sub(r'[^\w\s\-\.]', '', title)
                             title = re.sub(r'\s+', ' ', title).strip()
-                            print(f"[DEBUG] Site-specific başlık bulundu: {title}")
+                            logger.debug("Site-specific başlık bulundu: %s", title)
                             break
                 except Exception as e:
-                    print(f"[DEBUG] Title selector hatası {selector}: {e}")
+                    logger.debug("Title selector hatası %s: %s", selector, e)
                     continue
         
         # Fiyat çekme
@@ -456,7 +483,7 @@ async def extract_with_site_config(page, url, site_config):
                                         price_num = float(price_clean)
                                         # Türkçe format: 6.503 TL
                                         price = f"{price_num:,.0f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                        print(f"[DEBUG] Superstep fiyat temizlendi: {price}")
+                                        logger.debug("Superstep fiyat temizlendi: %s", price)
                                         break
                             # MediaMarkt için özel fiyat temizleme
                             elif "mediamarkt.com.tr" in url:
@@ -470,7 +497,7 @@ async def extract_with_site_config(page, url, site_config):
                                 # 35.999 -> 35999 (binlik ayırıcıyı kaldır)
                                 if '.' in price_text:
                                     price_text = price_text.replace('.', '')
-                                print(f"[DEBUG] MediaMarkt fiyat temizlendi: {price_text}")
+                                logger.debug("MediaMarkt fiyat temizlendi: %s", price_text)
                             else:
                                 # Diğer siteler için standart temizleme
                                 price_text = re.sub(r'[^\d,\.]', '', price_text)
@@ -499,7 +526,7 @@ async def extract_with_site_config(page, url, site_config):
                                             price = f"{price_str} TL"
                                     else:
                                         price = f"{int(price_num)} TL"
-                                    print(f"[DEBUG] MediaMarkt fiyat temizlendi: {price}")
+                                    logger.debug("MediaMarkt fiyat temizlendi: %s", price)
                                 # Sahibinden.com için özel fiyat temizleme
                                 elif "sahibinden.com" in url:
                                     # Binlik ayırıcıları kaldır
@@ -507,17 +534,17 @@ async def extract_with_site_config(page, url, site_config):
                                     price_clean = price_clean.replace('.', '').replace(',', '.')
                                     if price_clean:
                                         price = price_clean
-                                        print(f"[DEBUG] Sahibinden.com fiyat temizlendi: {price}")
+                                        logger.debug("Sahibinden.com fiyat temizlendi: %s", price)
                                 else:
                                     # Diğer siteler için standart format
                                     if price_num >= 1000:
                                         price = f"{price_num:,.2f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
                                     else:
                                         price = f"{price_num:.2f} TL".replace('.', ',')
-                                print(f"[DEBUG] Site-specific fiyat bulundu: {price}")
+                                logger.debug("Site-specific fiyat bulundu: %s", price)
                                 break
                 except Exception as e:
-                    print(f"[DEBUG] Price selector hatası {selector}: {e}")
+                    logger.debug("Price selector hatası %s: %s", selector, e)
                     continue
         
         # Eski fiyat çekme
@@ -545,7 +572,7 @@ async def extract_with_site_config(page, url, site_config):
                                         old_price_num = float(old_price_clean)
                                         # Türkçe format: 9.290 TL
                                         old_price = f"{old_price_num:,.0f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
-                                        print(f"[DEBUG] Superstep eski fiyat temizlendi: {old_price}")
+                                        logger.debug("Superstep eski fiyat temizlendi: %s", old_price)
                                         break
                             # Mavi için özel eski fiyat temizleme
                             elif "mavi.com" in url:
@@ -559,7 +586,7 @@ async def extract_with_site_config(page, url, site_config):
                                         old_price_num = float(old_price_clean)
                                         # Türkçe format: 499,99 TL
                                         old_price = f"{old_price_num:.2f} TL".replace('.', ',')
-                                        print(f"[DEBUG] Mavi eski fiyat temizlendi: {old_price}")
+                                        logger.debug("Mavi eski fiyat temizlendi: %s", old_price)
                                         break
                             else:
                                 # Diğer siteler için standart temizleme
@@ -575,10 +602,10 @@ async def extract_with_site_config(page, url, site_config):
                                     old_price = f"{old_price_num:,.2f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
                                 else:
                                     old_price = f"{old_price_num:.2f} TL".replace('.', ',')
-                                print(f"[DEBUG] Site-specific eski fiyat bulundu: {old_price}")
+                                logger.debug("Site-specific eski fiyat bulundu: %s", old_price)
                                 break
                 except Exception as e:
-                    print(f"[DEBUG] Old price selector hatası {selector}: {e}")
+                    logger.debug("Old price selector hatası %s: %s", selector, e)
                     continue
         
         # Görsel çekme
@@ -631,7 +658,7 @@ async def extract_with_site_config(page, url, site_config):
                                         # Eğer boyut 1000'den küçükse, 1920'ye çevir
                                         if int(current_size) < 1000:
                                             src = src.replace(f'size{current_size}', 'size1920')
-                                            print(f"[DEBUG] Superstep görsel kalitesi artırıldı: {current_size} -> 1920")
+                                            logger.debug("Superstep görsel kalitesi artırıldı: %s -> 1920", current_size)
                             # Diğer siteler için boyut parametrelerini optimize et
                             elif 'w=' in src and 'h=' in src:
                                 # Boyut parametrelerini daha yüksek değerlerle değiştir
@@ -646,20 +673,20 @@ async def extract_with_site_config(page, url, site_config):
                                     if "w=" in src:
                                         # Genişliği artır
                                         src = re.sub(r'w=\d+', 'w=2000', src)
-                                        print(f"[DEBUG] Zara görsel genişliği artırıldı: {src}")
+                                        logger.debug("Zara görsel genişliği artırıldı: %s", src)
                                     elif "h=" in src:
                                         # Yüksekliği artır
                                         src = re.sub(r'h=\d+', 'h=2000', src)
-                                        print(f"[DEBUG] Zara görsel yüksekliği artırıldı: {src}")
+                                        logger.debug("Zara görsel yüksekliği artırıldı: %s", src)
                                     else:
                                         # Parametre yoksa ekle
                                         if "?" in src:
                                             src += "&w=2000&h=2000"
                                         else:
                                             src += "?w=2000&h=2000"
-                                        print(f"[DEBUG] Zara görsel parametreleri eklendi: {src}")
+                                        logger.debug("Zara görsel parametreleri eklendi: %s", src)
                                 else:
-                                    print(f"[DEBUG] Zara görsel mevcut kalite: {src}")
+                                    logger.debug("Zara görsel mevcut kalite: %s", src)
                             
                             # PullandBear için görsel kalitesini artır
                             if "pullandbear.net" in src or "pullandbear.com" in src:
@@ -668,22 +695,22 @@ async def extract_with_site_config(page, url, site_config):
                                     # Genişliği artır ve formatı optimize et
                                     src = re.sub(r'w=\d+', 'w=2000', src)
                                     src = re.sub(r'f=auto', 'f=webp', src)
-                                    print(f"[DEBUG] PullandBear görsel kalitesi artırıldı (site-config): {src}")
+                                    logger.debug("PullandBear görsel kalitesi artırıldı (site-config): %s", src)
                                 elif "w=" in src:
                                     # Sadece genişliği artır
                                     src = re.sub(r'w=\d+', 'w=2000', src)
-                                    print(f"[DEBUG] PullandBear görsel genişliği artırıldı (site-config): {src}")
+                                    logger.debug("PullandBear görsel genişliği artırıldı (site-config): %s", src)
                                 elif "f=auto" in src:
                                     # Sadece formatı optimize et
                                     src = re.sub(r'f=auto', 'f=webp', src)
-                                    print(f"[DEBUG] PullandBear görsel formatı optimize edildi (site-config): {src}")
+                                    logger.debug("PullandBear görsel formatı optimize edildi (site-config): %s", src)
                                 else:
                                     # Parametre yoksa ekle
                                     if "?" in src:
                                         src += "&w=2000&f=webp"
                                     else:
                                         src += "?w=2000&f=webp"
-                                    print(f"[DEBUG] PullandBear görsel parametreleri eklendi (site-config): {src}")
+                                    logger.debug("PullandBear görsel parametreleri eklendi (site-config): %s", src)
                             
                             # Mavi için görsel kalitesini artır (basitleştirilmiş)
                             if "mavi.com" in src or "sky-static.mavi.com" in src:
@@ -692,22 +719,22 @@ async def extract_with_site_config(page, url, site_config):
                                     # Sadece düşük kaliteli görselleri yükselt
                                     if "600x600" in src:
                                         src = src.replace("600x600", "800x800")
-                                        print(f"[DEBUG] Mavi görsel kalitesi artırıldı: 600x600 -> 800x800")
+                                        logger.debug("Mavi görsel kalitesi artırıldı: 600x600 -> 800x800")
                                     elif "400x400" in src:
                                         src = src.replace("400x400", "800x800")
-                                        print(f"[DEBUG] Mavi görsel kalitesi artırıldı: 400x400 -> 800x800")
+                                        logger.debug("Mavi görsel kalitesi artırıldı: 400x400 -> 800x800")
                                     else:
-                                        print(f"[DEBUG] Mavi görsel mevcut kalite: {src}")
+                                        logger.debug("Mavi görsel mevcut kalite: %s", src)
                             
                             image = src
-                            print(f"[DEBUG] Site-specific görsel bulundu: {image}")
+                            logger.debug("Site-specific görsel bulundu: %s", image)
                             break
                 except Exception as e:
-                    print(f"[DEBUG] Image selector hatası {selector}: {e}")
+                    logger.debug("Image selector hatası %s: %s", selector, e)
                     continue
     
     except Exception as e:
-        print(f"[HATA] Site-specific extraction hatası: {e}")
+        logger.error("Site-specific extraction hatası: %s", e)
     
     return title, price, old_price, image
 
@@ -718,24 +745,29 @@ def get_cache_key(url):
 def get_cached_result(url):
     """Cache'den sonuç al"""
     cache_key = get_cache_key(url)
-    if cache_key in scraping_cache:
-        cached_data, timestamp = scraping_cache[cache_key]
+    with scraping_cache_lock:
+        entry = scraping_cache.get(cache_key)
+    if entry is not None:
+        cached_data, timestamp = entry
         if time.time() - timestamp < CACHE_DURATION:
+            counters.inc('cache_lookups_total', cache='scrape', result='hit')
             return cached_data
+    counters.inc('cache_lookups_total', cache='scrape', result='miss')
     return None
 
 def set_cached_result(url, data):
     """Sonucu cache'e kaydet (memory optimized for free plan)"""
     cache_key = get_cache_key(url)
     
-    # Clean up old cache entries if cache is too large
-    if len(scraping_cache) >= MAX_CACHE_SIZE:
-        # Remove oldest entries
-        sorted_cache = sorted(scraping_cache.items(), key=lambda x: x[1][1])
-        for key, _ in sorted_cache[:10]:  # Remove 10 oldest entries
-            del scraping_cache[key]
-    
-    scraping_cache[cache_key] = (data, time.time())
+    with scraping_cache_lock:
+        # Clean up old cache entries if cache is too large
+        if len(scraping_cache) >= MAX_CACHE_SIZE:
+            # Remove oldest entries
+            sorted_cache = sorted(scraping_cache.items(), key=lambda x: x[1][1])
+            for key, _ in sorted_cache[:10]:  # Remove 10 oldest entries
+                del scraping_cache[key]
+        
+        scraping_cache[cache_key] = (data, time.time())
     
     # Clean up memory if needed
     cleanup_memory()
@@ -766,8 +798,11 @@ def load_dynamic_brands():
 def save_dynamic_brands(brands):
     """Dinamik markaları kaydet"""
     try:
-        with open(BRANDS_FILE, 'w', encoding='utf-8') as f:
+        # Okuyan thread yarım yazılmış dosya görmesin: geçici dosyaya yaz, sonra yer değiştir
+        temp_file = f"{BRANDS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
             json.dump(brands, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, BRANDS_FILE)
     except Exception as e:
         print(f"[HATA] Dinamik markalar kaydedilemedi: {e}")
 
@@ -814,18 +849,19 @@ def add_brand_automatically(domain):
     if domain.split('.')[0].lower() in brand_mappings:
         brand_name = brand_mappings[domain.split('.')[0].lower()]
     
-    # Dinamik markaları yükle
-    dynamic_brands = load_dynamic_brands()
-    
-    # Marka zaten var mı kontrol et
-    for existing_domain, existing_name in dynamic_brands:
-        if existing_domain == domain:
-            return existing_name
-    
-    # Yeni markayı ekle
-    new_brand = (domain, brand_name)
-    dynamic_brands.append(new_brand)
-    save_dynamic_brands(dynamic_brands)
+    with brands_lock:
+        # Dinamik markaları yükle
+        dynamic_brands = load_dynamic_brands()
+        
+        # Marka zaten var mı kontrol et
+        for existing_domain, existing_name in dynamic_brands:
+            if existing_domain == domain:
+                return existing_name
+        
+        # Yeni markayı ekle
+        new_brand = (domain, brand_name)
+        dynamic_brands.append(new_brand)
+        save_dynamic_brands(dynamic_brands)
     
     print(f"[YENİ MARKA] Otomatik olarak eklendi: {domain} -> {brand_name}")
     return brand_name
@@ -889,13 +925,34 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Kullanıcı satırının imzalı session çerezinde tutulduğu süre (saniye); 0 kapatır
+USER_SESSION_CACHE_TTL = int(os.environ.get('USER_SESSION_CACHE_TTL', 60))
+USER_SESSION_CACHE_KEY = '_user_row'
+
+def cache_user_in_session(user):
+    """Kullanıcının hassas olmayan alanlarını session'a yaz (password_hash hariç)"""
+    if USER_SESSION_CACHE_TTL > 0:
+        session[USER_SESSION_CACHE_KEY] = {**user.to_session(), 'cached_at': time.time()}
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.get_by_id(user_id)
+    cached = session.get(USER_SESSION_CACHE_KEY)
+    if cached and cached.get('id') == user_id and time.time() - cached.get('cached_at', 0) < USER_SESSION_CACHE_TTL:
+        counters.inc('cache_lookups_total', cache='user_session', result='hit')
+        return User.from_session(cached)
+    
+    counters.inc('cache_lookups_total', cache='user_session', result='miss')
+    user = User.get_by_id(user_id)
+    if user:
+        cache_user_in_session(user)
+    else:
+        session.pop(USER_SESSION_CACHE_KEY, None)
+    return user
 
-# Initialize database
-with app.app_context():
-    init_db()
+# Database şeması: migration'lar import sırasında değil, ilk istekte process başına bir kez kontrol edilir
+@app.before_request
+def ensure_database_schema():
+    ensure_schema()
 
 # Health check endpoint
 @app.route('/health')
@@ -903,11 +960,10 @@ def health_check():
     """Health check endpoint for Render"""
     try:
         # Database bağlantısını test et
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1')
-        conn.close()
-        return jsonify({'status': 'healthy', 'database': 'connected'}), 200
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+        return jsonify({'status': 'healthy', 'database': 'connected', 'pool': get_pool_stats(), 'sql': DIALECT.get_stats()}), 200
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
@@ -1480,57 +1536,51 @@ def get_enhanced_selectors():
 
 # Rate limiting ve retry mekanizması
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 
 # Rate limiting için global değişkenler
-request_timestamps = defaultdict(list)
 RATE_LIMIT_PER_DOMAIN = 2  # Her domain için saniyede maksimum istek
 RATE_LIMIT_WINDOW = 60  # 60 saniyelik pencere
+# Karar için son RATE_LIMIT_PER_DOMAIN istek yeterli; daha eskileri tutulmaz
+request_timestamps = defaultdict(lambda: deque(maxlen=RATE_LIMIT_PER_DOMAIN))
+request_timestamps_lock = threading.Lock()
 
 def check_rate_limit(domain):
-    """Rate limiting kontrolü"""
-    now = datetime.now()
-    timestamps = request_timestamps[domain]
-    
-    # Eski timestamp'leri temizle (60 saniyeden eski)
-    timestamps = [ts for ts in timestamps if now - ts < timedelta(seconds=RATE_LIMIT_WINDOW)]
-    request_timestamps[domain] = timestamps
-    
-    # Rate limit kontrolü
-    if len(timestamps) >= RATE_LIMIT_PER_DOMAIN:
-        oldest_timestamp = min(timestamps)
-        wait_time = RATE_LIMIT_WINDOW - (now - oldest_timestamp).total_seconds()
-        if wait_time > 0:
-            print(f"[RATE LIMIT] {domain} için {wait_time:.2f} saniye bekleniyor...")
-            time.sleep(wait_time)
+    """Rate limiting kontrolü
     
-    # Yeni timestamp ekle
-    request_timestamps[domain].append(now)
+    Aynı domain'e eş zamanlı gelen thread'ler kilit altında sırayla bir zaman
+    dilimi ayırır (gelecekteki bir zaman olabilir); bekleme kilit dışında yapılır.
+    """
+    with request_timestamps_lock:
+        now = time.time()
+        timestamps = request_timestamps[domain]
+        
+        # Rate limit kontrolü: penceredeki en eski istek deque'nun başındadır
+        scheduled = now
+        if len(timestamps) >= RATE_LIMIT_PER_DOMAIN:
+            scheduled = max(now, timestamps[0] + RATE_LIMIT_WINDOW)
+        
+        # Yeni timestamp ekle
+        timestamps.append(scheduled)
+        
+        # Penceresi dolmuş domain'leri at, sözlük sınırsız büyümesin
+        if len(request_timestamps) > MAX_METRIC_DOMAINS:
+            for idle_domain in [d for d, ts in request_timestamps.items() if now - ts[-1] >= RATE_LIMIT_WINDOW]:
+                del request_timestamps[idle_domain]
+    
+    wait_time = scheduled - now
+    if wait_time > 0:
+        logger.info("%s için %.2f saniye bekleniyor...", domain, wait_time)
+        time.sleep(wait_time)
 
 # Gelişmiş hata yakalama ve loglama sistemi
 import logging
 import json
 from datetime import datetime
 
-# Logging konfigürasyonu
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraping.log'),
-        logging.StreamHandler()
-    ]
-)
-
-# Scraping istatistikleri
-scraping_stats = {
-    'total_requests': 0,
-    'successful_requests': 0,
-    'failed_requests': 0,
-    'domain_stats': defaultdict(lambda: {'success': 0, 'failed': 0}),
-    'error_log': []
-}
+# Scraping istatistikleri: sınırlı hata kaydı, domain bazında kayan pencere sayaçları
+scraping_stats = ScrapingStats()
 
 def log_scraping_error(url, error, attempt=1):
     """Scraping hatasını logla"""
@@ -1542,73 +1592,69 @@ def log_scraping_error(url, error, attempt=1):
         'error': str(error),
         'attempt': attempt
     }
-    scraping_stats['error_log'].append(error_info)
-    scraping_stats['failed_requests'] += 1
-    scraping_stats['domain_stats'][domain]['failed'] += 1
+    scraping_stats.record_error(domain, error_info)
     
-    logging.error(f"Scraping hatası - URL: {url}, Domain: {domain}, Hata: {error}, Deneme: {attempt}")
+    logger.error("Scraping hatası - URL: %s, Domain: %s, Hata: %s, Deneme: %s", url, domain, error, attempt)
 
 def log_scraping_success(url, domain):
     """Başarılı scraping'i logla"""
-    scraping_stats['successful_requests'] += 1
-    scraping_stats['domain_stats'][domain]['success'] += 1
-    logging.info(f"Başarılı scraping - URL: {url}, Domain: {domain}")
+    scraping_stats.record_success(domain)
+    logger.info("Başarılı scraping - URL: %s, Domain: %s", url, domain)
 
-def get_scraping_stats():
-    """Scraping istatistiklerini döndür"""
-    total = scraping_stats['total_requests']
-    success = scraping_stats['successful_requests']
-    failed = scraping_stats['failed_requests']
-    
-    stats = {
-        'total_requests': total,
-        'successful_requests': success,
-        'failed_requests': failed,
-        'success_rate': (success / total * 100) if total > 0 else 0,
-        'domain_stats': dict(scraping_stats['domain_stats']),
-        'recent_errors': scraping_stats['error_log'][-10:]  # Son 10 hata
-    }
+def get_scraping_stats(include_domains=True):
+    """Scraping istatistiklerini döndür
+    
+    Özet sayaçlar artımlı tutulur; domain listesi sadece include_domains ile kopyalanır.
+    """
+    stats = scraping_stats.summary()
+    stats['recent_errors'] = scraping_stats.recent_errors(10)  # Son 10 hata
+    if include_domains:
+        stats['domain_stats'] = scraping_stats.domain_stats()
     return stats
 
 # Gelişmiş hata yakalama ile scraping fonksiyonunu güncelle
 async def retry_scraping(url, max_retries=3, base_delay=2):
     """Retry mekanizması ile scraping - Gelişmiş hata yakalama"""
     domain = extract_domain_from_url(url)
-    scraping_stats['total_requests'] += 1
+    scraping_stats.record_request()
     
     for attempt in range(max_retries):
         try:
             # Rate limiting kontrolü
-            check_rate_limit(domain)
+            with span(domain, 'rate_limit_wait'):
+                check_rate_limit(domain)
             
-            print(f"[RETRY] Deneme {attempt + 1}/{max_retries} - {url}")
+            logger.info("Deneme %s/%s - %s", attempt + 1, max_retries, url)
             
             # Scraping işlemi
-            result = await perform_scraping(url)
+            with span(domain, 'attempt'):
+                result = await perform_scraping(url)
             
             # Başarılı sonuç kontrolü
             if result and result.get('name') and result.get('name') != "İsim bulunamadı" and result.get('name') != "Scraping hatası - Lütfen URL'yi kontrol edin":
-                print(f"[SUCCESS] Başarılı scraping - Deneme {attempt + 1}")
+                logger.info("Başarılı scraping - Deneme %s", attempt + 1)
                 log_scraping_success(url, domain)
                 return result
             
             # Başarısız sonuç, tekrar dene
             if attempt < max_retries - 1:
                 delay = base_delay * (2 ** attempt)  # Exponential backoff
-                print(f"[RETRY] Başarısız, {delay} saniye sonra tekrar deneniyor...")
-                await asyncio.sleep(delay)
+                logger.info("Başarısız, %s saniye sonra tekrar deneniyor...", delay)
+                with span(domain, 'retry_backoff'):
+                    await asyncio.sleep(delay)
             
         except Exception as e:
-            print(f"[RETRY ERROR] Deneme {attempt + 1} hatası: {e}")
+            logger.warning("Deneme %s hatası: %s", attempt + 1, e)
             log_scraping_error(url, e, attempt + 1)
             
             if attempt < max_retries - 1:
                 delay = base_delay * (2 ** attempt)
-                print(f"[RETRY] Hata sonrası {delay} saniye bekleniyor...")
-                await asyncio.sleep(delay)
+                logger.info("Hata sonrası %s saniye bekleniyor...", delay)
+                with span(domain, 'retry_backoff'):
+                    await asyncio.sleep(delay)
     
     # Tüm denemeler başarısız
-    print(f"[FAILED] Tüm {max_retries} deneme başarısız")
+    logger.warning("Tüm %s deneme başarısız", max_retries)
     log_scraping_error(url, "Tüm denemeler başarısız", max_retries)
     
     return {
@@ -1629,25 +1675,15 @@ def monitor_scraping_health():
     
     # Başarı oranı düşükse uyarı
     if stats['success_rate'] < 70:
-        logging.warning(f"Düşük başarı oranı: {stats['success_rate']:.2f}%")
-    
-    # En çok hata alan domain'leri raporla
-    problematic_domains = []
-    for domain, domain_stats in stats['domain_stats'].items():
-        total = domain_stats['success'] + domain_stats['failed']
-        if total > 5:  # En az 5 istek yapılmışsa
-            success_rate = (domain_stats['success'] / total) * 100
-            if success_rate < 50:
-                problematic_domains.append({
-                    'domain': domain,
-                    'success_rate': success_rate,
-                    'total_requests': total
-                })
+        logger.warning("Düşük başarı oranı: %.2f%%", stats['success_rate'])
+    
+    # En çok hata alan domain'leri raporla (son pencerede, kayıt sırasında güncellenir)
+    problematic_domains = stats['problematic_domains']
     
     if problematic_domains:
-        logging.warning("Problemli domain'ler tespit edildi:")
+        logger.warning("Problemli domain'ler tespit edildi:")
         for domain_info in problematic_domains:
-            logging.warning(f"  {domain_info['domain']}: {domain_info['success_rate']:.2f}% başarı ({domain_info['total_requests']} istek)")
+            logger.warning("  %s: %.2f%% başarı (%s istek)", domain_info['domain'], domain_info['success_rate'], domain_info['total_requests'])
     
     return stats
 
@@ -1663,7 +1699,7 @@ def get_scraping_statistics():
 @login_required
 def get_scraping_health():
     """Scraping sağlık durumunu döndür"""
-    stats = get_scraping_stats()
+    stats = get_scraping_stats(include_domains=False)
     
     health_status = {
         'status': 'healthy' if stats['success_rate'] >= 80 else 'warning' if stats['success_rate'] >= 60 else 'critical',
@@ -1675,13 +1711,22 @@ def get_scraping_health():
     
     return jsonify(health_status)
 
+@app.route("/api/scraping/latency")
+@login_required
+def get_scraping_latency():
+    """Domain ve aşama bazında scraping gecikme histogramlarını döndür"""
+    return jsonify({
+        'domains': scrape_metrics.get_stats(),
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route("/api/scraping/errors")
 @login_required
 def get_recent_errors():
     """Son hataları döndür"""
     return jsonify({
-        'errors': scraping_stats['error_log'][-20:],  # Son 20 hata
-        'total_errors': len(scraping_stats['error_log'])
+        'errors': scraping_stats.recent_errors(20),  # Son 20 hata
+        'total_errors': scraping_stats.error_count
     })
 
 @app.route("/api/debug/scrape", methods=['POST'])
@@ -1697,8 +1742,7 @@ def debug_scrape():
         print(f"[DEBUG] Test scraping başlıyor: {url}")
         
         # Asenkron scraping'i çalıştır
-        import asyncio
-        result = asyncio.run(scrape_product(url))
+        result = scrape_product_sync(url)
         
         return jsonify({
             'success': True,
@@ -1752,7 +1796,7 @@ def get_error_suggestions(error_type, domain):
 # Otomatik hata düzeltme önerileri
 def analyze_and_suggest_fixes():
     """Hataları analiz et ve düzeltme önerileri sun"""
-    stats = get_scraping_stats()
+    stats = get_scraping_stats(include_domains=False)
     suggestions = []
     
     # Son hataları analiz et
@@ -1790,9 +1834,32 @@ def get_scraping_suggestions():
     analysis = analyze_and_suggest_fixes()
     return jsonify(analysis)
 
+# Aynı anda açık Chromium sayısı: gthread worker'da her istek thread'i ve fiyat
+# zamanlayıcısı kendi browser'ını açar, free plan belleği birden fazlasını kaldırmaz
+SCRAPE_MAX_BROWSERS = int(os.environ.get('SCRAPE_MAX_BROWSERS', 1))
+browser_slots = threading.BoundedSemaphore(SCRAPE_MAX_BROWSERS)
+# Yuva alındıktan sonra browser oturumunun süre sınırı (saniye); aşılınca browser kapatılır
+SCRAPE_BROWSER_TIMEOUT = float(os.environ.get('SCRAPE_BROWSER_TIMEOUT', 120))
+
+@asynccontextmanager
+async def browser_slot(domain):
+    """Boş browser yuvası bekle; bekleme thread'in event loop'unu bloklamaz
+    
+    Süre yuva alındıktan sonra başlar, kuyrukta beklenen süre sayılmaz. Süre
+    dolunca blok iptal edilir: async_playwright() çıkışı browser'ı kapatır,
+    yuva serbest kalır ve TimeoutError fırlatılır.
+    """
+    with span(domain, 'browser_slot_wait'):
+        await asyncio.to_thread(browser_slots.acquire)
+    try:
+        async with asyncio.timeout(SCRAPE_BROWSER_TIMEOUT):
+            yield
+    finally:
+        browser_slots.release()
+
 async def perform_scraping(url):
     """Asıl scraping işlemi (Render free plan optimized)"""
-    print(f"[DEBUG] Scraping başlıyor: {url}")
+    logger.debug("Scraping başlıyor: %s", url)
     
     # Memory cleanup before scraping
     cleanup_memory()
@@ -1800,13 +1867,13 @@ async def perform_scraping(url):
     # Check cache
     cached_data = get_cached_result(url)
     if cached_data:
-        print(f"[DEBUG] Cache'ten veri alındı: {url}")
+        logger.debug("Cache'ten veri alındı: %s", url)
         return cached_data
     
     # Domain kontrolü
     domain = extract_domain_from_url(url)
     if not domain:
-        print(f"[HATA] Geçersiz URL: {url}")
+        logger.error("Geçersiz URL: %s", url)
         return {
             "id": str(uuid.uuid4()),
             "url": url,
@@ -1820,10 +1887,11 @@ async def perform_scraping(url):
     
     # Hepsiburada için Selenium kullan
     if "hepsiburada.com" in url:
-        print(f"[DEBUG] Hepsiburada için Selenium kullanılıyor")
+        logger.debug("Hepsiburada için Selenium kullanılıyor")
         try:
             from selenium_hepsiburada_scraper import scrape_hepsiburada_product
-            result = scrape_hepsiburada_product(url)
+            with span(domain, 'selenium'):
+                result = scrape_hepsiburada_product(url)
             if result:
                 standardized_result = {
                     'name': result.get('title', ''),
@@ -1835,136 +1903,143 @@ async def perform_scraping(url):
                 set_cached_result(url, standardized_result)
                 return standardized_result
         except ImportError:
-            print(f"[UYARI] Selenium scraper bulunamadı, Playwright kullanılıyor")
+            logger.warning("Selenium scraper bulunamadı, Playwright kullanılıyor")
         except Exception as e:
-            print(f"[HATA] Hepsiburada Selenium hatası: {e}")
+            logger.error("Hepsiburada Selenium hatası: %s", e)
     
     # Dinamik marka tespiti
     brand = detect_brand_from_url(url)
-    print(f"[DEBUG] Tespit edilen marka: {brand}")
+    logger.debug("Tespit edilen marka: %s", brand)
     
     # Render'da headless mode kullan
     headless = True
-    print(f"[DEBUG] Browser headless mode: {headless}")
+    logger.debug("Browser headless mode: %s", headless)
     
     try:
-        async with async_playwright() as p:
+        # Playwright sadece burada yüklenir; scrape worker kullanan web process'i onu hiç import etmez
+        from playwright.async_api import async_playwright
+        async with browser_slot(domain), async_playwright() as p:
             # Browser'ı başlat - Render optimized ayarları
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-gpu',
-                    '--disable-plugins',
-                    '--disable-extensions',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                    '--disable-features=TranslateUI',
-                    '--disable-ipc-flooding-protection',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-default-apps',
-                    '--disable-sync',
-                    '--disable-translate',
-                    '--hide-scrollbars',
-                    '--mute-audio',
-                    '--no-default-browser-check',
-                    '--no-pings',
-                    '--disable-prompt-on-repost',
-                    '--disable-hang-monitor',
-                    '--disable-client-side-phishing-detection',
-                    '--disable-component-update',
-                    '--disable-domain-reliability',
-                    '--disable-features=AudioServiceOutOfProcess',
-                    '--disable-setuid-sandbox',
-                    '--disable-accelerated-2d-canvas',
-                    '--no-first-run',
-                    '--no-zygote',
-                    '--disable-background-networking',
-                    '--disable-background-media-suspend',
-                    '--memory-pressure-off',
-                    '--max_old_space_size=4096',
-                    '--single-process',
-                    '--disable-dev-shm-usage',
-                    '--disable-software-rasterizer',
-                    '--disable-background-networking',
-                    '--disable-default-apps',
-                    '--disable-extensions',
-                    '--disable-sync',
-                    '--disable-translate',
-                    '--hide-scrollbars',
-                    '--metrics-recording-only',
-                    '--mute-audio',
-                    '--no-first-run',
-                    '--safebrowsing-disable-auto-update',
-                    '--ignore-certificate-errors',
-                    '--ignore-ssl-errors',
-                    '--ignore-certificate-errors-spki-list',
-                    '--disable-web-security',
-                    '--allow-running-insecure-content',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-ipc-flooding-protection'
-                ]
-            )
-            print(f"[DEBUG] Browser başlatıldı")
+            with span(domain, 'browser_launch'):
+                browser = await p.chromium.launch(
+                    headless=True,
+                    args=[
+                        '--disable-dev-shm-usage',
+                        '--no-sandbox',
+                        '--disable-gpu',
+                        '--disable-plugins',
+                        '--disable-extensions',
+                        '--disable-background-timer-throttling',
+                        '--disable-backgrounding-occluded-windows',
+                        '--disable-renderer-backgrounding',
+                        '--disable-features=TranslateUI',
+                        '--disable-ipc-flooding-protection',
+                        '--disable-web-security',
+                        '--disable-features=VizDisplayCompositor',
+                        '--disable-default-apps',
+                        '--disable-sync',
+                        '--disable-translate',
+                        '--hide-scrollbars',
+                        '--mute-audio',
+                        '--no-default-browser-check',
+                        '--no-pings',
+                        '--disable-prompt-on-repost',
+                        '--disable-hang-monitor',
+                        '--disable-client-side-phishing-detection',
+                        '--disable-component-update',
+                        '--disable-domain-reliability',
+                        '--disable-features=AudioServiceOutOfProcess',
+                        '--disable-setuid-sandbox',
+                        '--disable-accelerated-2d-canvas',
+                        '--no-first-run',
+                        '--no-zygote',
+                        '--disable-background-networking',
+                        '--disable-background-media-suspend',
+                        '--memory-pressure-off',
+                        '--max_old_space_size=4096',
+                        '--single-process',
+                        '--disable-dev-shm-usage',
+                        '--disable-software-rasterizer',
+                        '--disable-background-networking',
+                        '--disable-default-apps',
+                        '--disable-extensions',
+                        '--disable-sync',
+                        '--disable-translate',
+                        '--hide-scrollbars',
+                        '--metrics-recording-only',
+                        '--mute-audio',
+                        '--no-first-run',
+                        '--safebrowsing-disable-auto-update',
+                        '--ignore-certificate-errors',
+                        '--ignore-ssl-errors',
+                        '--ignore-certificate-errors-spki-list',
+                        '--disable-web-security',
+                        '--allow-running-insecure-content',
+                        '--disable-features=VizDisplayCompositor',
+                        '--disable-ipc-flooding-protection'
+                    ]
+                )
+            logger.debug("Browser başlatıldı")
+            counters.inc('browser_launches_total')
+            counters.inc('browsers_active')
             
+            context = None
             try:
                 # Context oluştur - Gelişmiş ayarlar
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='tr-TR',
-                    timezone_id='Europe/Istanbul',
-                    extra_http_headers={
-                        'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'Referer': 'https://www.google.com/',
-                        'Connection': 'keep-alive',
-                        'Upgrade-Insecure-Requests': '1',
-                        'Sec-Fetch-Dest': 'document',
-                        'Sec-Fetch-Mode': 'navigate',
-                        'Sec-Fetch-Site': 'none',
-                        'Sec-Fetch-User': '?1',
-                        'Cache-Control': 'max-age=0',
-                        'DNT': '1',
-                        'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-                        'Sec-Ch-Ua-Mobile': '?0',
-                        'Sec-Ch-Ua-Platform': '"Windows"',
-                    }
-                )
-                print(f"[DEBUG] Context oluşturuldu")
+                with span(domain, 'page_setup'):
+                    context = await browser.new_context(
+                        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                        viewport={'width': 1920, 'height': 1080},
+                        locale='tr-TR',
+                        timezone_id='Europe/Istanbul',
+                        extra_http_headers={
+                            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+                            'Accept-Encoding': 'gzip, deflate, br',
+                            'Referer': 'https://www.google.com/',
+                            'Connection': 'keep-alive',
+                            'Upgrade-Insecure-Requests': '1',
+                            'Sec-Fetch-Dest': 'document',
+                            'Sec-Fetch-Mode': 'navigate',
+                            'Sec-Fetch-Site': 'none',
+                            'Sec-Fetch-User': '?1',
+                            'Cache-Control': 'max-age=0',
+                            'DNT': '1',
+                            'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+                            'Sec-Ch-Ua-Mobile': '?0',
+                            'Sec-Ch-Ua-Platform': '"Windows"',
+                        },
+                        **har_record_options(url)
+                    )
+                    logger.debug("Context oluşturuldu")
+                    
+                    # Benchmark: canlı site yerine yerel fixture sunucusu veya kayıtlı HAR
+                    await route_offline_network(context, url)
                 
-                # Sayfa oluştur
-                page = await context.new_page()
+                    # Sayfa oluştur
+                    page = await context.new_page()
                 
-                # Gelişmiş stealth script ekle
-                await page.add_init_script(get_advanced_stealth_script())
+                    # Gelişmiş stealth script ekle
+                    await page.add_init_script(get_advanced_stealth_script())
                 
                 # Ürün sayfasına git
-                await navigate_to_product_page(page, url)
+                with span(domain, 'navigate'):
+                    await navigate_to_product_page(page, url)
                 
                 # Render'da daha uzun bekleme
-                print(f"[DEBUG] Sayfa yükleme tamamlandı, veri çekme başlıyor...")
-                await page.wait_for_timeout(5000)  # 5 saniye ek bekleme
+                logger.debug("Sayfa yükleme tamamlandı, veri çekme başlıyor...")
+                with span(domain, 'settle_wait'):
+                    await page.wait_for_timeout(5000)  # 5 saniye ek bekleme
                 
                 # Gelişmiş veri çekme
                 title, price, old_price, image, sizes = await extract_enhanced_data(page, url)
                 
-                print(f"[DEBUG] ===== SCRAPING SONUÇLARI =====")
-                print(f"[DEBUG] URL: {url}")
-                print(f"[DEBUG] Başlık: {title}")
-                print(f"[DEBUG] Mevcut Fiyat: {price}")
-                print(f"[DEBUG] Eski Fiyat: {old_price}")
-                print(f"[DEBUG] Marka: {brand}")
-                print(f"[DEBUG] Görsel: {image}")
-                print(f"[DEBUG] ================================")
+                logger.debug("Scraping sonuçları: url=%s başlık=%s fiyat=%s eski_fiyat=%s marka=%s görsel=%s",
+                             url, title, price, old_price, brand, image)
                 
                 # Fiyat karşılaştırması için ek debug
                 if price and old_price and price != "🤷" and old_price != "🤷":
-                    print(f"[DEBUG] Fiyat analizi: Mevcut={price}, Eski={old_price}")
+                    logger.debug("Fiyat analizi: Mevcut=%s, Eski=%s", price, old_price)
                     try:
                         # Basit sayısal karşılaştırma
                         price_clean = re.sub(r'[^\d,\.]', '', price)
@@ -1984,11 +2059,11 @@ async def perform_scraping(url):
                         old_price_num = float(old_price_clean)
                         
                         if price_num > old_price_num:
-                            print(f"[DEBUG] ⚠️  Mevcut fiyat ({price_num}) eski fiyattan ({old_price_num}) büyük!")
+                            logger.debug("⚠️  Mevcut fiyat (%s) eski fiyattan (%s) büyük!", price_num, old_price_num)
                         else:
-                            print(f"[DEBUG] ✅ Fiyatlar mantıklı: Mevcut ({price_num}) <= Eski ({old_price_num})")
+                            logger.debug("✅ Fiyatlar mantıklı: Mevcut (%s) <= Eski (%s)", price_num, old_price_num)
                     except:
-                        print(f"[DEBUG] Fiyat sayısal karşılaştırma yapılamadı")
+                        logger.debug("Fiyat sayısal karşılaştırma yapılamadı")
                 
                 result = {
                     "id": str(uuid.uuid4()),
@@ -2004,11 +2079,15 @@ async def perform_scraping(url):
                 return result
                 
             finally:
-                await browser.close()
+                counters.dec('browsers_active')
+                with span(domain, 'browser_close'):
+                    if context is not None:
+                        # HAR kaydı context kapanırken diske yazılır
+                        await context.close()
+                    await browser.close()
 
     except Exception as e:
-        print(f"[HATA] Scraping başarısız: {e}")
-        traceback.print_exc()
+        logger.exception("Scraping başarısız: %s", e)
         result = {
             "id": str(uuid.uuid4()),
             "url": url,
@@ -2022,29 +2101,109 @@ async def perform_scraping(url):
         set_cached_result(url, result)
         return result
 
+# SCRAPE_WORKER_SOCKET tanımlıysa Chromium bu process'te açılmaz, işler scrape worker'ına gider
+scrape_worker_client = ScrapeWorkerClient(SCRAPE_WORKER_SOCKET) if SCRAPE_WORKER_SOCKET else None
+
 # Ana scraping fonksiyonunu güncelle
 async def scrape_product(url):
-    """Ana scraping fonksiyonu - Retry mekanizması ile"""
-    return await retry_scraping(url, max_retries=3, base_delay=2)
+    """Ana scraping fonksiyonu - Retry mekanizması ile (worker varsa orada)"""
+    if scrape_worker_client is not None:
+        return await scrape_product_remote(url)
+    return await scrape_product_local(url)
+
+async def scrape_product_local(url):
+    """Scraping pipeline'ını bu process'te çalıştır"""
+    with span(extract_domain_from_url(url), 'total'):
+        return await retry_scraping(url, max_retries=3, base_delay=2)
+
+async def scrape_product_remote(url):
+    """İşi scrape worker'ına gönder; worker'a ulaşılamazsa hata sonucu döndür"""
+    try:
+        with span(extract_domain_from_url(url), 'worker_rpc'):
+            return await scrape_worker_client.scrape(url)
+    except ScrapeWorkerError as e:
+        logger.error("Scrape worker hatası: %s (%s)", e, url)
+        return {
+            "id": str(uuid.uuid4()),
+            "url": url,
+            "name": "Scraping hatası - Lütfen URL'yi kontrol edin",
+            "price": "🤷",
+            "old_price": None,
+            "image": None,
+            "brand": detect_brand_from_url(url),
+            "sizes": []
+        }
+
+
+
+# Offline scraping: SCRAPE_FIXTURE_SERVER tanımlıysa (örn. http://127.0.0.1:8765) sayfa
+# belgeleri canlı siteden değil <sunucu>/<host><path>?<query> adresinden gelir, diğer istekler
+# (görsel, script, analytics) engellenir. Sayfa URL'si değişmediği için site-specific
+# seçiciler aynı çalışır. Bkz. benchmarks/extraction_bench.py
+SCRAPE_FIXTURE_SERVER = os.environ.get('SCRAPE_FIXTURE_SERVER')
+
+# HAR kayıt/tekrar: SCRAPE_HAR_RECORD=<dizin> her sayfa yüklemesinin tüm ağ trafiğini
+# <dizin>/<domain>_<url hash>.har.zip dosyasına kaydeder; SCRAPE_HAR_REPLAY=<dizin> aynı
+# dosyayı route_from_har ile geri oynatır, HAR'da olmayan istekler engellenir.
+# Bkz. benchmarks/har_bench.py
+SCRAPE_HAR_RECORD = os.environ.get('SCRAPE_HAR_RECORD')
+SCRAPE_HAR_REPLAY = os.environ.get('SCRAPE_HAR_REPLAY')
 
+def har_path_for(directory, url):
+    """URL'nin HAR dosya yolu (kayıt ve tekrar aynı adı kullanır)"""
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(directory, f"{extract_domain_from_url(url) or 'site'}_{digest}.har.zip")
 
+def har_record_options(url):
+    """HAR kaydı açıksa new_context() için kayıt parametreleri"""
+    if not SCRAPE_HAR_RECORD:
+        return {}
+    os.makedirs(SCRAPE_HAR_RECORD, exist_ok=True)
+    # .zip uzantısında yanıt gövdeleri HAR'a gömülmez, arşive ayrı dosya olarak eklenir
+    return {'record_har_path': har_path_for(SCRAPE_HAR_RECORD, url), 'record_har_mode': 'full'}
+
+async def route_offline_network(context, url):
+    """Context'in ağ trafiğini offline kaynağa yönlendir (ayar yoksa bir şey yapmaz)"""
+    if SCRAPE_HAR_REPLAY:
+        har_path = har_path_for(SCRAPE_HAR_REPLAY, url)
+        if not os.path.exists(har_path):
+            raise FileNotFoundError(f"HAR kaydı bulunamadı: {har_path}")
+        await context.route_from_har(har_path, not_found='abort')
+        return
+    
+    if not SCRAPE_FIXTURE_SERVER:
+        return
+    
+    from urllib.parse import urlsplit
+    server = SCRAPE_FIXTURE_SERVER.rstrip('/')
+    
+    async def serve_fixture(route):
+        if route.request.resource_type != 'document':
+            await route.abort()
+            return
+        parts = urlsplit(route.request.url)
+        query = f"?{parts.query}" if parts.query else ''
+        response = await route.fetch(url=f"{server}/{parts.netloc}{parts.path}{query}")
+        await route.fulfill(response=response)
+    
+    await context.route('**/*', serve_fixture)
 
 async def navigate_to_product_page(page, url):
     """Ürün sayfasına gitme işlemleri - Render optimized"""
-    print(f"[DEBUG] Ürün sayfasına gidiliyor: {url}")
+    logger.debug("Ürün sayfasına gidiliyor: %s", url)
     
     # Genel ürün sayfası yükleme (tüm siteler için)
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-        print(f"[DEBUG] Sayfa yüklendi, bekleniyor...")
+        logger.debug("Sayfa yüklendi, bekleniyor...")
         await page.wait_for_timeout(2000)
         
         # Sayfanın tam yüklenmesini bekle
         try:
             await page.wait_for_load_state("networkidle", timeout=20000)
-            print(f"[DEBUG] Network idle durumu beklendi")
+            logger.debug("Network idle durumu beklendi")
         except:
-            print(f"[DEBUG] Network idle timeout, devam ediliyor")
+            logger.debug("Network idle timeout, devam ediliyor")
             pass
         
         # Basit scroll
@@ -2053,25 +2212,25 @@ async def navigate_to_product_page(page, url):
         await page.evaluate("window.scrollTo(0, 0)")
         await page.wait_for_timeout(1000)
         
-        print(f"[DEBUG] Genel sayfa hazırlığı tamamlandı")
+        logger.debug("Genel sayfa hazırlığı tamamlandı")
     except Exception as e:
-        print(f"[DEBUG] Genel sayfa yükleme hatası: {e}")
+        logger.debug("Genel sayfa yükleme hatası: %s", e)
     
     # Site-specific işlemler (sadece kritik siteler için)
     if "zara.com" in url:
-        print(f"[DEBUG] Zara için ek bekleme...")
+        logger.debug("Zara için ek bekleme...")
         await page.wait_for_timeout(3000)
     elif "mango.com" in url:
-        print(f"[DEBUG] Mango için ek bekleme...")
+        logger.debug("Mango için ek bekleme...")
         await page.wait_for_timeout(3000)
     elif "bershka.com" in url:
-        print(f"[DEBUG] Bershka için ek bekleme...")
+        logger.debug("Bershka için ek bekleme...")
         await page.wait_for_timeout(3000)
     elif "sahibinden.com" in url:
-        print(f"[DEBUG] Sahibinden.com için ek bekleme...")
+        logger.debug("Sahibinden.com için ek bekleme...")
         await page.wait_for_timeout(3000)
     elif "hm.com" in url:
-        print(f"[DEBUG] H&M ürün sayfasına gidiliyor...")
+        logger.debug("H&M ürün sayfasına gidiliyor...")
         
         # H&M ürün sayfasına git
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
@@ -2105,14 +2264,14 @@ async def navigate_to_product_page(page, url):
         try:
             page_title = await page.title()
             if "Access Denied" in page_title or "403" in page_title or "Forbidden" in page_title:
-                print(f"[DEBUG] H&M bot koruması tespit edildi, daha uzun bekleniyor...")
+                logger.debug("H&M bot koruması tespit edildi, daha uzun bekleniyor...")
                 await page.wait_for_timeout(15000)  # 15 saniye daha bekle
                 await page.reload()
                 await page.wait_for_timeout(8000)
         except:
             pass
         
-        print(f"[DEBUG] H&M ürün sayfası hazırlandı")
+        logger.debug("H&M ürün sayfası hazırlandı")
     else:
         # Diğer siteler için normal yaklaşım
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
@@ -2141,10 +2300,10 @@ async def extract_sizes(page, url, site_config):
                     if size_text and size_text.strip():
                         sizes.append(size_text.strip())
                 if sizes:
-                    print(f"[DEBUG] Site-specific bedenler bulundu: {sizes}")
+                    logger.debug("Site-specific bedenler bulundu: %s", sizes)
                     break
             except Exception as e:
-                print(f"[DEBUG] Size selector hatası {selector}: {e}")
+                logger.debug("Size selector hatası %s: %s", selector, e)
                 continue
     
     # Columbia.com.tr ve Mudo.com.tr için özel filtreleme
@@ -2222,30 +2381,36 @@ async def extract_sizes(page, url, site_config):
         except:
             continue
     
-    print(f"[DEBUG] Çekilen bedenler: {sizes}")
+    logger.debug("Çekilen bedenler: %s", sizes)
     return sizes
 
 async def extract_enhanced_data(page, url):
     """Gelişmiş veri çekme işlemleri - Render optimized"""
-    print(f"[DEBUG] Gelişmiş veri çekme başlıyor: {url}")
+    logger.debug("Gelişmiş veri çekme başlıyor: %s", url)
     
     # Site-specific konfigürasyon al
     site_config = get_site_config(url)
+    domain = extract_domain_from_url(url)
     
     # Başlık çekme
-    title = await extract_title(page, url, site_config)
+    with span(domain, 'extract_title'):
+        title = await extract_title(page, url, site_config)
     
     # Fiyat çekme
-    price = await extract_price(page, url, site_config)
+    with span(domain, 'extract_price'):
+        price = await extract_price(page, url, site_config)
     
     # Eski fiyat çekme
-    old_price = await extract_old_price(page, url, site_config)
+    with span(domain, 'extract_old_price'):
+        old_price = await extract_old_price(page, url, site_config)
     
     # Görsel çekme
-    image = await extract_image(page, url, site_config)
+    with span(domain, 'extract_image'):
+        image = await extract_image(page, url, site_config)
     
     # Beden bilgisi çekme
-    sizes = await extract_sizes(page, url, site_config)
+    with span(domain, 'extract_sizes'):
+        sizes = await extract_sizes(page, url, site_config)
     
     return title, price, old_price, image, sizes
     
@@ -2266,10 +2431,10 @@ async def extract_title(page, url, site_config):
                         title = title.strip().upper()
                         title = re.sub(r'[^\w\s\-\.]', '', title)
                         title = re.sub(r'\s+', ' ', title).strip()
-                        print(f"[DEBUG] Site-specific başlık bulundu: {title}")
+                        logger.debug("Site-specific başlık bulundu: %s", title)
                         break
             except Exception as e:
-                print(f"[DEBUG] Title selector hatası {selector}: {e}")
+                logger.debug("Title selector hatası %s: %s", selector, e)
                 continue
     
     # Gelişmiş selector'ları kullan
@@ -2315,7 +2480,7 @@ async def extract_image(page, url, site_config):
     """Görsel çekme işlemleri - Render optimized"""
     image = None
     
-    print(f"[DEBUG] Görsel çekme başlıyor: {url}")
+    logger.debug("Görsel çekme başlıyor: %s", url)
     
     # Site-specific görsel çekme
     if site_config and 'image_selectors' in site_config:
@@ -2334,15 +2499,15 @@ async def extract_image(page, url, site_config):
                             src = f"{parsed.scheme}://{parsed.netloc}{src}"
                         
                         image = src
-                        print(f"[DEBUG] Site-specific görsel bulundu: {image}")
+                        logger.debug("Site-specific görsel bulundu: %s", image)
                         break
             except Exception as e:
-                print(f"[DEBUG] Image selector hatası {selector}: {e}")
+                logger.debug("Image selector hatası %s: %s", selector, e)
                 continue
     
     # Pull&Bear için özel görsel çekme
     if "pullandbear.com" in url:
-        print(f"[DEBUG] Pull&Bear özel görsel çekme başlıyor")
+        logger.debug("Pull&Bear özel görsel çekme başlıyor")
         
         # Pull&Bear'ın özel görsel selector'ları
         pullandbear_selectors = [
@@ -2370,7 +2535,7 @@ async def extract_image(page, url, site_config):
         
         for selector in pullandbear_selectors:
             try:
-                print(f"[DEBUG] Pull&Bear selector deneniyor: {selector}")
+                logger.debug("Pull&Bear selector deneniyor: %s", selector)
                 
                 # Sayfayı scroll et
                 await page.evaluate("window.scrollTo(0, 300)")
@@ -2379,7 +2544,7 @@ async def extract_image(page, url, site_config):
                 await page.wait_for_timeout(1000)
                 
                 img_elements = await page.query_selector_all(selector)
-                print(f"[DEBUG] Pull&Bear {len(img_elements)} img elementi bulundu")
+                logger.debug("Pull&Bear %s img elementi bulundu", len(img_elements))
                 
                 for img in img_elements:
                     try:
@@ -2387,7 +2552,7 @@ async def extract_image(page, url, site_config):
                         srcset = await img.get_attribute('srcset')
                         alt = await img.get_attribute('alt') or ''
                         
-                        print(f"[DEBUG] Pull&Bear element: src={src}, alt={alt}")
+                        logger.debug("Pull&Bear element: src=%s, alt=%s", src, alt)
                         
                         # Ürün görseli kontrolü
                         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
@@ -2398,11 +2563,11 @@ async def extract_image(page, url, site_config):
                                     size = await img.bounding_box()
                                     if size and size['width'] > 100 and size['height'] > 100:
                                         image = src
-                                        print(f"[DEBUG] Pull&Bear uygun görsel bulundu: {image}")
+                                        logger.debug("Pull&Bear uygun görsel bulundu: %s", image)
                                         break
                                 except:
                                     image = src
-                                    print(f"[DEBUG] Pull&Bear boyut kontrolü yapılamadı, görsel kabul edildi: {image}")
+                                    logger.debug("Pull&Bear boyut kontrolü yapılamadı, görsel kabul edildi: %s", image)
                                     break
                         
                         # srcset kontrolü
@@ -2413,21 +2578,21 @@ async def extract_image(page, url, site_config):
                                 if any(ext in url_part.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
                                     if not any(skip in url_part.lower() for skip in ['logo', 'icon', 'banner']):
                                         image = url_part
-                                        print(f"[DEBUG] Pull&Bear srcset'ten görsel bulundu: {image}")
+                                        logger.debug("Pull&Bear srcset'ten görsel bulundu: %s", image)
                                         break
                         
                         if image:
                             break
                             
                     except Exception as e:
-                        print(f"[DEBUG] Pull&Bear element işlenirken hata: {e}")
+                        logger.debug("Pull&Bear element işlenirken hata: %s", e)
                         continue
                 
                 if image:
                     break
                     
             except Exception as e:
-                print(f"[DEBUG] Pull&Bear selector {selector} hatası: {e}")
+                logger.debug("Pull&Bear selector %s hatası: %s", selector, e)
                 continue
         
         if image:
@@ -2442,14 +2607,14 @@ async def extract_image(page, url, site_config):
                 from urllib.parse import urljoin
                 image = urljoin(url, image)
             
-            print(f"[DEBUG] Pull&Bear final görsel URL: {image}")
+            logger.debug("Pull&Bear final görsel URL: %s", image)
             return image
         else:
-            print(f"[DEBUG] Pull&Bear hiçbir görsel bulunamadı!")
+            logger.debug("Pull&Bear hiçbir görsel bulunamadı!")
     
     # Mudo.com.tr için özel görsel çekme
     if "mudo.com.tr" in url:
-        print(f"[DEBUG] Mudo.com.tr özel görsel çekme başlıyor")
+        logger.debug("Mudo.com.tr özel görsel çekme başlıyor")
         
         # Mudo'nun özel görsel selector'ları
         mudo_selectors = [
@@ -2485,7 +2650,7 @@ async def extract_image(page, url, site_config):
         
         for selector in mudo_selectors:
             try:
-                print(f"[DEBUG] Mudo selector deneniyor: {selector}")
+                logger.debug("Mudo selector deneniyor: %s", selector)
                 
                 # Sayfayı scroll et
                 await page.evaluate("window.scrollTo(0, 300)")
@@ -2494,7 +2659,7 @@ async def extract_image(page, url, site_config):
                 await page.wait_for_timeout(1000)
                 
                 img_elements = await page.query_selector_all(selector)
-                print(f"[DEBUG] Mudo {len(img_elements)} img elementi bulundu")
+                logger.debug("Mudo %s img elementi bulundu", len(img_elements))
                 
                 for img in img_elements:
                     try:
@@ -2502,7 +2667,7 @@ async def extract_image(page, url, site_config):
                         srcset = await img.get_attribute('srcset')
                         alt = await img.get_attribute('alt') or ''
                         
-                        print(f"[DEBUG] Mudo element: src={src}, alt={alt}")
+                        logger.debug("Mudo element: src=%s, alt=%s", src, alt)
                         
                         # Ürün görseli kontrolü
                         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
@@ -2513,11 +2678,11 @@ async def extract_image(page, url, site_config):
                                     size = await img.bounding_box()
                                     if size and size['width'] > 100 and size['height'] > 100:
                                         image = src
-                                        print(f"[DEBUG] Mudo uygun görsel bulundu: {image}")
+                                        logger.debug("Mudo uygun görsel bulundu: %s", image)
                                         break
                                 except:
                                     image = src
-                                    print(f"[DEBUG] Mudo boyut kontrolü yapılamadı, görsel kabul edildi: {image}")
+                                    logger.debug("Mudo boyut kontrolü yapılamadı, görsel kabul edildi: %s", image)
                                     break
                         
                         # srcset kontrolü
@@ -2528,21 +2693,21 @@ async def extract_image(page, url, site_config):
                                 if any(ext in url_part.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
                                     if not any(skip in url_part.lower() for skip in ['logo', 'icon', 'banner']):
                                         image = url_part
-                                        print(f"[DEBUG] Mudo srcset'ten görsel bulundu: {image}")
+                                        logger.debug("Mudo srcset'ten görsel bulundu: %s", image)
                                         break
                         
                         if image:
                             break
                             
                     except Exception as e:
-                        print(f"[DEBUG] Mudo element işlenirken hata: {e}")
+                        logger.debug("Mudo element işlenirken hata: %s", e)
                         continue
                 
                 if image:
                     break
                     
             except Exception as e:
-                print(f"[DEBUG] Mudo selector {selector} hatası: {e}")
+                logger.debug("Mudo selector %s hatası: %s", selector, e)
                 continue
         
         if image:
@@ -2557,14 +2722,14 @@ async def extract_image(page, url, site_config):
                 from urllib.parse import urljoin
                 image = urljoin(url, image)
             
-            print(f"[DEBUG] Mudo final görsel URL: {image}")
+            logger.debug("Mudo final görsel URL: %s", image)
             return image
         else:
-            print(f"[DEBUG] Mudo hiçbir görsel bulunamadı!")
+            logger.debug("Mudo hiçbir görsel bulunamadı!")
     
     # Columbia.com.tr için özel görsel çekme
     if "columbia.com.tr" in url:
-        print(f"[DEBUG] Columbia.com.tr özel görsel çekme başlıyor")
+        logger.debug("Columbia.com.tr özel görsel çekme başlıyor")
         
         # Columbia'nın özel görsel selector'ları
         columbia_selectors = [
@@ -2600,7 +2765,7 @@ async def extract_image(page, url, site_config):
         
         for selector in columbia_selectors:
             try:
-                print(f"[DEBUG] Columbia selector deneniyor: {selector}")
+                logger.debug("Columbia selector deneniyor: %s", selector)
                 
                 # Sayfayı scroll et
                 await page.evaluate("window.scrollTo(0, 300)")
@@ -2609,7 +2774,7 @@ async def extract_image(page, url, site_config):
                 await page.wait_for_timeout(1000)
                 
                 img_elements = await page.query_selector_all(selector)
-                print(f"[DEBUG] Columbia {len(img_elements)} img elementi bulundu")
+                logger.debug("Columbia %s img elementi bulundu", len(img_elements))
                 
                 for img in img_elements:
                     try:
@@ -2617,7 +2782,7 @@ async def extract_image(page, url, site_config):
                         srcset = await img.get_attribute('srcset')
                         alt = await img.get_attribute('alt') or ''
                         
-                        print(f"[DEBUG] Columbia element: src={src}, alt={alt}")
+                        logger.debug("Columbia element: src=%s, alt=%s", src, alt)
                         
                         # Ürün görseli kontrolü
                         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
@@ -2628,11 +2793,11 @@ async def extract_image(page, url, site_config):
                                     size = await img.bounding_box()
                                     if size and size['width'] > 100 and size['height'] > 100:
                                         image = src
-                                        print(f"[DEBUG] Columbia uygun görsel bulundu: {image}")
+                                        logger.debug("Columbia uygun görsel bulundu: %s", image)
                                         break
                                 except:
                                     image = src
-                                    print(f"[DEBUG] Columbia boyut kontrolü yapılamadı, görsel kabul edildi: {image}")
+                                    logger.debug("Columbia boyut kontrolü yapılamadı, görsel kabul edildi: %s", image)
                                     break
                         
                         # srcset kontrolü
@@ -2643,21 +2808,21 @@ async def extract_image(page, url, site_config):
                                 if any(ext in url_part.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
                                     if not any(skip in url_part.lower() for skip in ['logo', 'icon', 'banner']):
                                         image = url_part
-                                        print(f"[DEBUG] Columbia srcset'ten görsel bulundu: {image}")
+                                        logger.debug("Columbia srcset'ten görsel bulundu: %s", image)
                                         break
                         
                         if image:
                             break
                             
                     except Exception as e:
-                        print(f"[DEBUG] Columbia element işlenirken hata: {e}")
+                        logger.debug("Columbia element işlenirken hata: %s", e)
                         continue
                 
                 if image:
                     break
                     
             except Exception as e:
-                print(f"[DEBUG] Columbia selector {selector} hatası: {e}")
+                logger.debug("Columbia selector %s hatası: %s", selector, e)
                 continue
         
         if image:
@@ -2672,14 +2837,14 @@ async def extract_image(page, url, site_config):
                 from urllib.parse import urljoin
                 image = urljoin(url, image)
             
-            print(f"[DEBUG] Columbia final görsel URL: {image}")
+            logger.debug("Columbia final görsel URL: %s", image)
             return image
         else:
-            print(f"[DEBUG] Columbia hiçbir görsel bulunamadı!")
+            logger.debug("Columbia hiçbir görsel bulunamadı!")
     
     # Bershka için özel görsel çekme
     if "bershka.com" in url:
-        print(f"[DEBUG] Bershka özel görsel çekme başlıyor")
+        logger.debug("Bershka özel görsel çekme başlıyor")
         
         # Bershka'nın özel görsel selector'ları
         bershka_selectors = [
@@ -2708,7 +2873,7 @@ async def extract_image(page, url, site_config):
         
         for selector in bershka_selectors:
             try:
-                print(f"[DEBUG] Bershka selector deneniyor: {selector}")
+                logger.debug("Bershka selector deneniyor: %s", selector)
                 
                 # Sayfayı scroll et
                 await page.evaluate("window.scrollTo(0, 300)")
@@ -2717,7 +2882,7 @@ async def extract_image(page, url, site_config):
                 await page.wait_for_timeout(1000)
                 
                 img_elements = await page.query_selector_all(selector)
-                print(f"[DEBUG] Bershka {len(img_elements)} img elementi bulundu")
+                logger.debug("Bershka %s img elementi bulundu", len(img_elements))
                 
                 for img in img_elements:
                     try:
@@ -2725,7 +2890,7 @@ async def extract_image(page, url, site_config):
                         srcset = await img.get_attribute('srcset')
                         alt = await img.get_attribute('alt') or ''
                         
-                        print(f"[DEBUG] Bershka element: src={src}, alt={alt}")
+                        logger.debug("Bershka element: src=%s, alt=%s", src, alt)
                         
                         # Ürün görseli kontrolü
                         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
@@ -2736,11 +2901,11 @@ async def extract_image(page, url, site_config):
                                     size = await img.bounding_box()
                                     if size and size['width'] > 100 and size['height'] > 100:
                                         image = src
-                                        print(f"[DEBUG] Bershka uygun görsel bulundu: {image}")
+                                        logger.debug("Bershka uygun görsel bulundu: %s", image)
                                         break
                                 except:
                                     image = src
-                                    print(f"[DEBUG] Bershka boyut kontrolü yapılamadı, görsel kabul edildi: {image}")
+                                    logger.debug("Bershka boyut kontrolü yapılamadı, görsel kabul edildi: %s", image)
                                     break
                         
                         # srcset kontrolü
@@ -2751,21 +2916,21 @@ async def extract_image(page, url, site_config):
                                 if any(ext in url_part.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
                                     if not any(skip in url_part.lower() for skip in ['logo', 'icon', 'banner']):
                                         image = url_part
-                                        print(f"[DEBUG] Bershka srcset'ten görsel bulundu: {image}")
+                                        logger.debug("Bershka srcset'ten görsel bulundu: %s", image)
                                         break
                         
                         if image:
                             break
                             
                     except Exception as e:
-                        print(f"[DEBUG] Bershka element işlenirken hata: {e}")
+                        logger.debug("Bershka element işlenirken hata: %s", e)
                         continue
                 
                 if image:
                     break
                     
             except Exception as e:
-                print(f"[DEBUG] Bershka selector {selector} hatası: {e}")
+                logger.debug("Bershka selector %s hatası: %s", selector, e)
                 continue
         
         if image:
@@ -2780,17 +2945,17 @@ async def extract_image(page, url, site_config):
                 from urllib.parse import urljoin
                 image = urljoin(url, image)
             
-            print(f"[DEBUG] Bershka final görsel URL: {image}")
+            logger.debug("Bershka final görsel URL: %s", image)
             return image
         else:
-            print(f"[DEBUG] Bershka hiçbir görsel bulunamadı!")
+            logger.debug("Bershka hiçbir görsel bulunamadı!")
     
     # Render'da daha uzun bekleme
     
     # Render'da daha uzun bekleme
     try:
         await page.wait_for_timeout(3000)  # 3 saniye bekle
-        print(f"[DEBUG] Sayfa yükleme beklendi")
+        logger.debug("Sayfa yükleme beklendi")
     except:
         pass
     
@@ -2799,7 +2964,7 @@ async def extract_image(page, url, site_config):
     enhanced_selectors = get_enhanced_selectors()
     if domain in enhanced_selectors:
         selectors = enhanced_selectors[domain]["image_selectors"]
-        print(f"[DEBUG] Domain-specific selector'lar kullanılıyor: {domain}")
+        logger.debug("Domain-specific selector'lar kullanılıyor: %s", domain)
     else:
         selectors = [
             # Öncelikli selector'lar
@@ -2823,13 +2988,13 @@ async def extract_image(page, url, site_config):
             # Tüm img elementleri (son çare)
             'img'
         ]
-        print(f"[DEBUG] Genel selector'lar kullanılıyor")
+        logger.debug("Genel selector'lar kullanılıyor")
     
-    print(f"[DEBUG] Toplam {len(selectors)} selector deneniyor")
+    logger.debug("Toplam %s selector deneniyor", len(selectors))
     
     for i, selector in enumerate(selectors):
         try:
-            print(f"[DEBUG] Selector {i+1}/{len(selectors)} deneniyor: {selector}")
+            logger.debug("Selector %s/%s deneniyor: %s", i+1, len(selectors), selector)
             
             # Sayfayı scroll et (görsellerin yüklenmesi için)
             await page.evaluate("window.scrollTo(0, 300)")
@@ -2838,7 +3003,7 @@ async def extract_image(page, url, site_config):
             await page.wait_for_timeout(1000)
             
             img_elements = await page.query_selector_all(selector)
-            print(f"[DEBUG] {len(img_elements)} img elementi bulundu")
+            logger.debug("%s img elementi bulundu", len(img_elements))
             
             for j, img in enumerate(img_elements):
                 try:
@@ -2846,7 +3011,7 @@ async def extract_image(page, url, site_config):
                     srcset = await img.get_attribute('srcset')
                     alt = await img.get_attribute('alt') or ''
                     
-                    print(f"[DEBUG] Element {j+1}: src={src}, alt={alt}")
+                    logger.debug("Element %s: src=%s, alt=%s", j+1, src, alt)
                     
                     # Ürün görseli olup olmadığını kontrol et
                     if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
@@ -2857,11 +3022,11 @@ async def extract_image(page, url, site_config):
                                 size = await img.bounding_box()
                                 if size and size['width'] > 100 and size['height'] > 100:
                                     image = src
-                                    print(f"[DEBUG] Uygun görsel bulundu: {image}")
+                                    logger.debug("Uygun görsel bulundu: %s", image)
                                     break
                             except:
                                 image = src
-                                print(f"[DEBUG] Boyut kontrolü yapılamadı, görsel kabul edildi: {image}")
+                                logger.debug("Boyut kontrolü yapılamadı, görsel kabul edildi: %s", image)
                                 break
                     
                     # srcset kontrolü
@@ -2872,21 +3037,21 @@ async def extract_image(page, url, site_config):
                             if any(ext in url_part.lower() for ext in ['.jpg', '.jpeg', '.webp', '.png', '.gif']):
                                 if not any(skip in url_part.lower() for skip in ['logo', 'icon', 'banner']):
                                     image = url_part
-                                    print(f"[DEBUG] srcset'ten görsel bulundu: {image}")
+                                    logger.debug("srcset'ten görsel bulundu: %s", image)
                                     break
                     
                     if image:
                         break
                         
                 except Exception as e:
-                    print(f"[DEBUG] Element {j+1} işlenirken hata: {e}")
+                    logger.debug("Element %s işlenirken hata: %s", j+1, e)
                     continue
             
             if image:
                 break
                 
         except Exception as e:
-            print(f"[DEBUG] Selector {selector} hatası: {e}")
+            logger.debug("Selector %s hatası: %s", selector, e)
             continue
     
     # Görsel URL'ini düzelt
@@ -2901,9 +3066,9 @@ async def extract_image(page, url, site_config):
             from urllib.parse import urljoin
             image = urljoin(url, image)
         
-        print(f"[DEBUG] Final görsel URL: {image}")
+        logger.debug("Final görsel URL: %s", image)
     else:
-        print(f"[DEBUG] Hiçbir görsel bulunamadı! Alternatif yöntem deneniyor...")
+        logger.debug("Hiçbir görsel bulunamadı! Alternatif yöntem deneniyor...")
         
         # Alternatif yöntem: Tüm görselleri topla ve en uygun olanını seç
         try:
@@ -2931,7 +3096,7 @@ async def extract_image(page, url, site_config):
                 }
             """)
             
-            print(f"[DEBUG] Alternatif yöntemle {len(all_images)} görsel bulundu")
+            logger.debug("Alternatif yöntemle %s görsel bulundu", len(all_images))
             
             # En büyük görseli seç
             best_image = None
@@ -2945,12 +3110,12 @@ async def extract_image(page, url, site_config):
             
             if best_image:
                 image = best_image
-                print(f"[DEBUG] Alternatif yöntemle görsel bulundu: {image}")
+                logger.debug("Alternatif yöntemle görsel bulundu: %s", image)
             else:
-                print(f"[DEBUG] Alternatif yöntemle de görsel bulunamadı")
+                logger.debug("Alternatif yöntemle de görsel bulunamadı")
                 
         except Exception as e:
-            print(f"[DEBUG] Alternatif görsel çekme hatası: {e}")
+            logger.debug("Alternatif görsel çekme hatası: %s", e)
     
     return image
 
@@ -2976,10 +3141,10 @@ async def extract_price(page, url, site_config):
                                 price = f"{price_num:,.2f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
                             else:
                                 price = f"{price_num:.2f} TL".replace('.', ',')
-                            print(f"[DEBUG] Site-specific fiyat bulundu: {price}")
+                            logger.debug("Site-specific fiyat bulundu: %s", price)
                             break
             except Exception as e:
-                print(f"[DEBUG] Price selector hatası {selector}: {e}")
+                logger.debug("Price selector hatası %s: %s", selector, e)
                 continue
     
     # Gelişmiş selector'ları kullan
@@ -3038,7 +3203,7 @@ async def extract_price(page, url, site_config):
                                      for indicator in ['old', 'original', 'before', 'previous', 'crossed', 'strikethrough', 'line-through'])
                     
                     if is_old_price:
-                        print(f"[DEBUG] Eski fiyat elementi atlandı: {text}")
+                        logger.debug("Eski fiyat elementi atlandı: %s", text)
                         continue
                     
                     # Fiyat regex'i
@@ -3046,7 +3211,7 @@ async def extract_price(page, url, site_config):
                     match = price_pattern.search(text)
                     if match:
                         price = match.group(1)
-                        print(f"[DEBUG] Mevcut fiyat bulundu: {price} (selector: {selector})")
+                        logger.debug("Mevcut fiyat bulundu: %s (selector: %s)", price, selector)
                         break
             if price:
                 break
@@ -3064,10 +3229,10 @@ async def extract_price(page, url, site_config):
             else:
                 price = "🤷"
         except Exception as e:
-            print(f"[DEBUG] Page text content hatası: {e}")
+            logger.debug("Page text content hatası: %s", e)
             price = "🤷"
     
-    print(f"[DEBUG] Mevcut fiyat çekme sonucu: {price}")
+    logger.debug("Mevcut fiyat çekme sonucu: %s", price)
     return price
 
 async def compare_and_validate_prices(current_price, old_price):
@@ -3096,13 +3261,13 @@ async def compare_and_validate_prices(current_price, old_price):
         if current_num and old_num:
             # Eğer mevcut fiyat eski fiyattan büyükse, muhtemelen yanlış
             if current_num > old_num:
-                print(f"[DEBUG] Fiyat karşılaştırması: Mevcut fiyat ({current_price}) eski fiyattan ({old_price}) büyük, değiştiriliyor")
+                logger.debug("Fiyat karşılaştırması: Mevcut fiyat (%s) eski fiyattan (%s) büyük, değiştiriliyor", current_price, old_price)
                 return old_price, current_price
             else:
-                print(f"[DEBUG] Fiyat karşılaştırması: Mevcut fiyat ({current_price}) eski fiyattan ({old_price}) küçük, doğru")
+                logger.debug("Fiyat karşılaştırması: Mevcut fiyat (%s) eski fiyattan (%s) küçük, doğru", current_price, old_price)
         
     except Exception as e:
-        print(f"[DEBUG] Fiyat karşılaştırma hatası: {e}")
+        logger.debug("Fiyat karşılaştırma hatası: %s", e)
     
     return current_price, old_price
 
@@ -3128,10 +3293,10 @@ async def extract_old_price(page, url, site_config):
                                 old_price = f"{old_price_num:,.2f} TL".replace(',', 'X').replace('.', ',').replace('X', '.')
                             else:
                                 old_price = f"{old_price_num:.2f} TL".replace('.', ',')
-                            print(f"[DEBUG] Site-specific eski fiyat bulundu: {old_price}")
+                            logger.debug("Site-specific eski fiyat bulundu: %s", old_price)
                             break
             except Exception as e:
-                print(f"[DEBUG] Old price selector hatası {selector}: {e}")
+                logger.debug("Old price selector hatası %s: %s", selector, e)
                 continue
     
     # Genel eski fiyat selector'ları
@@ -3182,7 +3347,7 @@ async def extract_old_price(page, url, site_config):
                                     old_price_num = float(old_price_clean)
                                     # Türkçe format: 499,99 TL
                                     old_price = f"{old_price_num:.2f} TL".replace('.', ',')
-                                    print(f"[DEBUG] Mavi eski fiyat genel selector'dan bulundu: {old_price}")
+                                    logger.debug("Mavi eski fiyat genel selector'dan bulundu: %s", old_price)
                                     break
                                 except ValueError:
                                     continue
@@ -3205,7 +3370,7 @@ async def extract_old_price(page, url, site_config):
                             match = re.search(pattern, text_clean)
                             if match:
                                 old_price = match.group(1)
-                                print(f"[DEBUG] Eski fiyat bulundu: {old_price}")
+                                logger.debug("Eski fiyat bulundu: %s", old_price)
                                 break
                         
                         if old_price:
@@ -3215,7 +3380,7 @@ async def extract_old_price(page, url, site_config):
         except:
             continue
     
-    print(f"[DEBUG] Eski fiyat çekme sonucu: {old_price}")
+    logger.debug("Eski fiyat çekme sonucu: %s", old_price)
     return old_price
 
 @app.route("/")
@@ -3244,17 +3409,12 @@ def test_scraping():
     for url in test_urls:
         try:
             # Async scraping'i test et
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(scrape_product(url))
-                results.append({
-                    "url": url,
-                    "success": True,
-                    "data": result
-                })
-            finally:
-                loop.close()
+            result = scrape_product_sync(url)
+            results.append({
+                "url": url,
+                "success": True,
+                "data": result
+            })
         except Exception as e:
             results.append({
                 "url": url,
@@ -3283,18 +3443,19 @@ def add_brand_manual():
     brand_name = request.form.get("brand_name")
     
     if domain and brand_name:
-        dynamic_brands = load_dynamic_brands()
-        
-        # Zaten var mı kontrol et
-        for existing_domain, existing_name in dynamic_brands:
-            if existing_domain == domain:
-                flash("Bu domain zaten mevcut", "error")
-                return redirect(url_for("manage_brands"))
-        
-        # Yeni markayı ekle
-        new_brand = (domain, brand_name)
-        dynamic_brands.append(new_brand)
-        save_dynamic_brands(dynamic_brands)
+        with brands_lock:
+            dynamic_brands = load_dynamic_brands()
+            
+            # Zaten var mı kontrol et
+            for existing_domain, existing_name in dynamic_brands:
+                if existing_domain == domain:
+                    flash("Bu domain zaten mevcut", "error")
+                    return redirect(url_for("manage_brands"))
+            
+            # Yeni markayı ekle
+            new_brand = (domain, brand_name)
+            dynamic_brands.append(new_brand)
+            save_dynamic_brands(dynamic_brands)
         
         flash(f"Marka başarıyla eklendi: {domain} -> {brand_name}", "success")
     else:
@@ -3306,17 +3467,18 @@ def add_brand_manual():
 @login_required
 def delete_brand(domain):
     """Dinamik markayı sil"""
-    dynamic_brands = load_dynamic_brands()
-    
-    # Markayı bul ve sil
-    for i, (brand_domain, brand_name) in enumerate(dynamic_brands):
-        if brand_domain == domain:
-            deleted_brand = dynamic_brands.pop(i)
-            save_dynamic_brands(dynamic_brands)
-            flash(f"Marka silindi: {deleted_brand[0]} -> {deleted_brand[1]}", "success")
-            break
-    else:
-        flash("Marka bulunamadı", "error")
+    with brands_lock:
+        dynamic_brands = load_dynamic_brands()
+        
+        # Markayı bul ve sil
+        for i, (brand_domain, brand_name) in enumerate(dynamic_brands):
+            if brand_domain == domain:
+                deleted_brand = dynamic_brands.pop(i)
+                save_dynamic_brands(dynamic_brands)
+                flash(f"Marka silindi: {deleted_brand[0]} -> {deleted_brand[1]}", "success")
+                break
+        else:
+            flash("Marka bulunamadı", "error")
     
     return redirect(url_for("manage_brands"))
 
@@ -3324,12 +3486,14 @@ def delete_brand(domain):
 @login_required
 def dashboard():
     try:
-        products = current_user.get_products()
-        return render_template("dashboard.html", products=products)
+        # İlk sayfa sunucuda render edilir, sonrakiler /products/page ile sonsuz kaydırmada gelir
+        products, next_cursor = current_user.get_products_page(PRODUCT_PAGE_SIZE)
+        return render_template("dashboard.html", products=products, next_cursor=next_cursor,
+                               user_collections=current_user.get_collections())
     except Exception as e:
         print(f"[HATA] Dashboard yükleme hatası: {e}")
         flash("Ürünler yüklenirken hata oluştu", "error")
-        return render_template("dashboard.html", products=[])
+        return render_template("dashboard.html", products=[], next_cursor=None, user_collections=[])
 
 @app.route("/profile")
 @login_required
@@ -3353,6 +3517,7 @@ def profile_settings():
             else:
                 current_user.username = username
                 current_user.save()
+                cache_user_in_session(current_user)
                 flash("Kullanıcı adı güncellendi", "success")
         
         if email and email != current_user.email:
@@ -3361,12 +3526,12 @@ def profile_settings():
             else:
                 current_user.email = email
                 current_user.save()
+                cache_user_in_session(current_user)
                 flash("E-posta adresi güncellendi", "success")
         
         if current_password and new_password:
             if current_user.check_password(current_password):
                 current_user.set_password(new_password)
-                current_user.save()
                 flash("Şifre güncellendi", "success")
             else:
                 flash("Mevcut şifre yanlış", "error")
@@ -3402,8 +3567,10 @@ def profile_collections():
 @login_required
 def profile_favorites():
     """Kullanıcının favorileri sayfası"""
-    products = Product.get_user_products(current_user.id)
-    return render_template("profile_favorites.html", products=products)
+    after = decode_page_cursor(request.args.get("cursor"))
+    products, next_cursor = Product.get_user_products_page(current_user.id, PRODUCT_PAGE_SIZE, after)
+    return render_template("profile_favorites.html", products=products, next_cursor=next_cursor,
+                           user_collections=current_user.get_collections())
 
 @app.route("/profile/<profile_url>")
 def public_profile(profile_url):
@@ -3413,8 +3580,8 @@ def public_profile(profile_url):
         flash("Kullanıcı bulunamadı", "error")
         return redirect(url_for("index"))
     
-    products = user.get_products()
-    return render_template("public_profile.html", user=user, products=products)
+    # Şablon ürün listesi göstermez; ürün sorgusu yapılmaz
+    return render_template("public_profile.html", user=user)
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -3429,6 +3596,7 @@ def login():
         user = User.get_by_username(username)
         if user and user.check_password(password):
             login_user(user, remember=remember)
+            cache_user_in_session(user)
             flash("Başarıyla giriş yaptınız!", "success")
             return redirect(url_for("dashboard"))
         else:
@@ -3479,11 +3647,6 @@ def register():
                 flash("Bu email adresi zaten kullanılıyor", "error")
                 return render_template("register.html")
             
-            # Veritabanını başlat (eğer yoksa)
-            print(f"[DEBUG] Veritabanı başlatılıyor...")
-            from models import init_db
-            init_db()
-            
             print(f"[DEBUG] Kullanıcı oluşturuluyor...")
             user = User.create(username, email, password)
             if user:
@@ -3507,6 +3670,7 @@ def register():
 @login_required
 def logout():
     logout_user()
+    session.pop(USER_SESSION_CACHE_KEY, None)
     flash("Başarıyla çıkış yaptınız", "success")
     return redirect(url_for("index"))
 
@@ -3520,12 +3684,7 @@ def add_product():
         product_data = None  # Variable'ı önceden tanımla
         try:
             # Async scraping'i Flask context'inde çalıştır
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                product_data = loop.run_until_complete(scrape_product(product_url))
-            finally:
-                loop.close()
+            product_data = scrape_product_sync(product_url)
                 
             if product_data:
                     # Hepsiburada için özel alan adları
@@ -3535,14 +3694,8 @@ def add_product():
                     image = product_data.get('image', '')
                     brand = product_data.get('brand', '')
                     
-                    print(f"[DEBUG] ===== ÜRÜN EKLEME =====")
-                    print(f"[DEBUG] Name: {name}")
-                    print(f"[DEBUG] Price: {price}")
-                    print(f"[DEBUG] Old Price: {old_price}")
-                    print(f"[DEBUG] Image: {image}")
-                    print(f"[DEBUG] Brand: {brand}")
-                    print(f"[DEBUG] URL: {product_data['url']}")
-                    print(f"[DEBUG] ========================")
+                    product_logger.debug("Ürün ekleniyor: name=%r price=%r old_price=%r image=%r brand=%r url=%s",
+                                         name, price, old_price, image, brand, product_data['url'])
                     
                     Product.create(
                         current_user.id,
@@ -3561,18 +3714,13 @@ def add_product():
     
     elif bulk_urls:
         urls = [url.strip() for url in bulk_urls.split('\n') if url.strip()]
-        added_count = 0
+        scraped_products = []
         
         for url in urls:
             product_data = None  # Variable'ı önceden tanımla
             try:
                 # Async scraping'i Flask context'inde çalıştır
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    product_data = loop.run_until_complete(scrape_product(url))
-                finally:
-                    loop.close()
+                product_data = scrape_product_sync(url)
                     
                 if product_data:
                     name = product_data.get('title') or product_data.get('name', '')
@@ -3581,28 +3729,15 @@ def add_product():
                     image = product_data.get('image', '')
                     brand = product_data.get('brand', '')
                     
-                    print(f"[DEBUG] ===== TOPLU ÜRÜN EKLEME =====")
-                    print(f"[DEBUG] URL: {url}")
-                    print(f"[DEBUG] Name: {name}")
-                    print(f"[DEBUG] Price: {price}")
-                    print(f"[DEBUG] Old Price: {old_price}")
-                    print(f"[DEBUG] Image: {image}")
-                    print(f"[DEBUG] Brand: {brand}")
-                    print(f"[DEBUG] ==============================")
+                    product_logger.debug("Toplu ürün ekleniyor: name=%r price=%r old_price=%r image=%r brand=%r url=%s",
+                                         name, price, old_price, image, brand, url)
                     
-                    Product.create(
-                        current_user.id,
-                        name,
-                        price,
-                        image,
-                        brand,
-                        product_data['url'],
-                        old_price
-                    )
-                    added_count += 1
+                    scraped_products.append((name, price, image, brand, product_data['url'], old_price))
             except Exception as e:
                 print(f"[HATA] Toplu ekleme hatası ({url}): {e}")
         
+        # Scrape edilen ürünler tek transaction'da yazılır
+        added_count = len(Product.create_many(current_user.id, scraped_products))
         if added_count > 0:
             flash(f"{added_count} ürün eklendi", "success")
         else:
@@ -3655,8 +3790,9 @@ def view_collection(collection_id):
         flash("Koleksiyon bulunamadı", "error")
         return redirect(url_for("collections"))
     
-    products = collection.get_products()
-    return render_template("view_collection.html", collection=collection, products=products)
+    after = decode_page_cursor(request.args.get("cursor"))
+    products, next_cursor = collection.get_products_page(PRODUCT_PAGE_SIZE, after)
+    return render_template("view_collection.html", collection=collection, products=products, next_cursor=next_cursor)
 
 @app.route("/collections/<collection_id>/add_product/<product_id>", methods=["POST"])
 @login_required
@@ -3687,6 +3823,46 @@ def remove_from_collection(collection_id, product_id):
     flash("Ürün koleksiyondan çıkarıldı", "success")
     return redirect(request.referrer or url_for("collections"))
 
+MAX_COLLECTION_BATCH = 500
+
+def get_batch_product_ids():
+    """JSON gövdesindeki product_ids listesini doğrula; geçersizse None"""
+    data = request.get_json(silent=True) or {}
+    product_ids = data.get("product_ids")
+    if not isinstance(product_ids, list) or not product_ids or len(product_ids) > MAX_COLLECTION_BATCH:
+        return None
+    return [str(product_id) for product_id in product_ids]
+
+@app.route("/collections/<collection_id>/add_products", methods=["POST"])
+@login_required
+def add_products_to_collection(collection_id):
+    """Birden fazla ürünü tek istekte koleksiyona ekle"""
+    collection = Collection.get_by_id(collection_id)
+    if not collection or collection.user_id != current_user.id:
+        return jsonify({"success": False, "message": "Koleksiyon bulunamadı"}), 404
+    
+    product_ids = get_batch_product_ids()
+    if product_ids is None:
+        return jsonify({"success": False, "message": "Geçersiz ürün listesi"}), 400
+    
+    added = collection.add_products(product_ids)
+    return jsonify({"success": True, "added": added})
+
+@app.route("/collections/<collection_id>/remove_products", methods=["POST"])
+@login_required
+def remove_products_from_collection(collection_id):
+    """Birden fazla ürünü tek istekte koleksiyondan çıkar"""
+    collection = Collection.get_by_id(collection_id)
+    if not collection or collection.user_id != current_user.id:
+        return jsonify({"success": False, "message": "Koleksiyon bulunamadı"}), 404
+    
+    product_ids = get_batch_product_ids()
+    if product_ids is None:
+        return jsonify({"success": False, "message": "Geçersiz ürün listesi"}), 400
+    
+    removed = collection.remove_products(product_ids)
+    return jsonify({"success": True, "removed": removed})
+
 @app.route("/collections/<collection_id>/delete", methods=["POST"])
 @login_required
 def delete_collection(collection_id):
@@ -3709,8 +3885,9 @@ def public_collection(share_url):
         return redirect(url_for("index"))
     
     user = User.get_by_id(collection.user_id)
-    products = collection.get_products()
-    return render_template("public_collection.html", collection=collection, user=user, products=products)
+    after = decode_page_cursor(request.args.get("cursor"))
+    products, next_cursor = collection.get_products_page(PRODUCT_PAGE_SIZE, after)
+    return render_template("public_collection.html", collection=collection, user=user, products=products, next_cursor=next_cursor)
 
 @app.route("/price-tracking")
 @login_required
@@ -3724,7 +3901,7 @@ def price_tracking():
     # İstatistikleri hesapla
     tracking_stats = {
         'total_products': len(tracking_items),
-        'active_alerts': sum(1 for item in tracking_items if item[7]),  # alert_price
+        'active_alerts': sum(1 for item in tracking_items if item.alert_price),
         'price_drops': 0,  # Bu özellik henüz implement edilmedi
         'total_savings': 0  # Bu özellik henüz implement edilmedi
     }
@@ -3826,6 +4003,93 @@ def update_prices():
         "message": "Otomatik fiyat güncelleme özelliği henüz mevcut değil"
     })
 
+# Fiyat yenileme zamanlayıcısı
+def run_scrape_product(url):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(scrape_product(url))
+    finally:
+        loop.close()
+
+def scrape_product_sync(url):
+    """scrape_product'ı senkron bağlamda (route'lar, arka plan thread'i) çalıştır
+    
+    gevent worker'ında greenlet'ler aynı OS thread'ini paylaşır ve iki event loop
+    aynı anda çalışamaz; iş gevent'in thread havuzunda gerçek bir thread'de
+    yapılır, bekleyen greenlet diğer istekleri bloklamaz.
+    """
+    if GEVENT_PATCHED:
+        return gevent.get_hub().threadpool.apply(run_scrape_product, (url,))
+    return run_scrape_product(url)
+
+def scrape_product_local_sync(url):
+    """scrape_product_local'ı senkron bağlamda çalıştır (scrape worker thread'leri)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(scrape_product_local(url))
+    finally:
+        loop.close()
+
+price_refresh_scheduler = RefreshScheduler(scrape_product_sync)
+
+@app.before_request
+def start_price_refresh_scheduler():
+    """Zamanlayıcıyı worker process'inde ilk istekte başlat (--preload ile fork sonrası)"""
+    if os.environ.get('PRICE_REFRESH_ENABLED') and price_refresh_scheduler.thread is None:
+        price_refresh_scheduler.start()
+
+@app.route("/api/price-refresh/stats")
+@login_required
+def get_price_refresh_stats():
+    """Fiyat yenileme zamanlayıcısının durumunu döndür"""
+    return jsonify(price_refresh_scheduler.get_stats())
+
+# Server-Sent Events: bildirim ve fiyat değişimlerini anlık gönder
+# gevent worker'ında her bağlantı sadece bir greenlet tutar ve varsayılan olarak açıktır.
+# sync/gthread worker'ında her bağlantı bir request thread'ini meşgul eder; orada
+# varsayılan kapalıdır (istemci polling'e geçer), SSE_ENABLED=1 ile zorla açılabilir.
+SSE_ENABLED = os.environ.get('SSE_ENABLED', '1' if GEVENT_PATCHED else '').lower() in ('1', 'true', 'yes')
+SSE_STREAM_TIMEOUT = 55  # Saniye; bağlantı kapanınca EventSource otomatik yeniden bağlanır
+SSE_HEARTBEAT_INTERVAL = 15
+SSE_RETRY_MS = 5000
+
+@app.route("/events")
+@login_required
+def event_stream():
+    """Kullanıcının bildirim ve fiyat değişimi olaylarını SSE ile akıt"""
+    if not SSE_ENABLED:
+        # 204 yanıtı EventSource'un yeniden bağlanmasını durdurur, istemci polling'e geçer
+        return Response(status=204)
+    
+    user_id = current_user.id
+    unread_count = Notification.get_unread_count(user_id)
+    subscriber = event_bus.subscribe(user_id)
+    
+    def generate():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            yield format_sse('unread_count', {'count': unread_count})
+            
+            deadline = time.time() + SSE_STREAM_TIMEOUT
+            while time.time() < deadline:
+                try:
+                    event, data = subscriber.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+        finally:
+            event_bus.unsubscribe(user_id, subscriber)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 # Bildirim sistemi için yeni rotalar
 @app.route("/notifications")
 @login_required
@@ -3974,6 +4238,65 @@ def get_product_tracking_status(product_id):
 
 
 
+MAX_TRACKING_STATUS_BATCH = 500
+
+@app.route("/products/tracking-status", methods=["POST"])
+@login_required
+def get_products_tracking_status():
+    """Birden fazla ürünün fiyat takip durumunu tek istekte döndür"""
+    data = request.get_json(silent=True) or {}
+    product_ids = data.get("product_ids") or []
+    
+    if not isinstance(product_ids, list) or len(product_ids) > MAX_TRACKING_STATUS_BATCH:
+        return jsonify({"success": False, "message": "Geçersiz ürün listesi"}), 400
+    
+    product_ids = [str(product_id) for product_id in product_ids]
+    statuses = PriceTracking.get_statuses_for_products(current_user.id, product_ids)
+    
+    return jsonify({
+        "success": True,
+        "statuses": {
+            product_id: {
+                "is_tracked": product_id in statuses,
+                "tracking_id": statuses.get(product_id)
+            } for product_id in product_ids
+        }
+    })
+
+@app.route("/products/page")
+@login_required
+def products_page():
+    """Dashboard sonsuz kaydırması için sonraki ürün sayfasını JSON olarak döndür"""
+    cursor = request.args.get("cursor")
+    after = decode_page_cursor(cursor)
+    if cursor and after is None:
+        return jsonify({"success": False, "message": "Geçersiz sayfa imleci"}), 400
+    
+    try:
+        limit = min(max(int(request.args.get("limit", PRODUCT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"success": False, "message": "Geçersiz sayfa boyutu"}), 400
+    
+    products, next_cursor = current_user.get_products_page(limit, after)
+    html = render_template("_product_cards.html", products=products,
+                           user_collections=current_user.get_collections())
+    
+    return jsonify({
+        "success": True,
+        "products": [{
+            "id": product.id,
+            "name": product.name,
+            "brand": product.brand,
+            "price": product.price,
+            "old_price": product.old_price,
+            "image": product.image,
+            "url": product.url,
+            "is_tracked": product.is_tracked
+        } for product in products],
+        "html": html,
+        "next_cursor": next_cursor
+    })
+
 @app.errorhandler(405)
 def method_not_allowed(e):
     return redirect(url_for("index"))
@@ -3984,5 +4307,96 @@ def add_security_headers(response):
     response.headers['Content-Security-Policy'] = "default-src 'self' 'unsafe-inline' 'unsafe-eval'; script-src 'self' 'unsafe-inline' 'unsafe-eval'; style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; font-src 'self' https://fonts.gstatic.com; img-src 'self' data: https:; connect-src 'self'"
     return response
 
+# İstek başına model katmanı sorgu sayısı (tekrarlı lookup'ları doğrulamak için)
+@app.after_request
+def add_query_count_header(response):
+    response.headers['X-DB-Query-Count'] = str(get_request_query_count())
+    return response
+
+@app.before_request
+def start_request_timer():
+    g._request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Route bazında gecikme, durum kodu ve sorgu sayısını kaydet"""
+    started = g.pop('_request_started', None)
+    if started is None or request.endpoint == 'prometheus_metrics':
+        return response
+    # Ham path yerine route kuralı: etiket sayısı sabit kalır
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    http_metrics.observe(route, request.method, time.perf_counter() - started, response.status_code >= 500)
+    counters.inc('http_responses_total', route=route, method=request.method, status=response.status_code)
+    query_count_histogram.observe(get_request_query_count())
+    return response
+
+# Prometheus /metrics: "Authorization: Bearer <METRICS_TOKEN>" gerekir; token tanımlı değilse endpoint kapalıdır (404)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+def collect_prometheus_metrics():
+    """Process metriklerini Prometheus metin formatında topla"""
+    writer = PrometheusWriter()
+    
+    # HTTP
+    writer.stage_histograms('http_request_duration_seconds', 'HTTP istek süresi (route, method)', http_metrics, ('route', 'method'))
+    writer.counter_family('http_responses_total', 'counter', 'Durum koduna göre HTTP yanıtları', counters)
+    writer.declare('db_queries_per_request', 'histogram', 'İstek başına model katmanı sorgu sayısı')
+    writer.histogram('db_queries_per_request', query_count_histogram)
+    
+    # Scraping
+    writer.metric('scrape_requests_total', 'counter', 'Toplam scraping isteği', scraping_stats.total_requests)
+    writer.declare('scrape_outcomes_total', 'counter', 'Domain ve sonuca göre scraping')
+    for domain, success, failed in scraping_stats.domain_counts():
+        writer.sample('scrape_outcomes_total', success, {'domain': domain, 'result': 'success'})
+        writer.sample('scrape_outcomes_total', failed, {'domain': domain, 'result': 'failed'})
+    writer.stage_histograms('scrape_stage_duration_seconds', 'Scraping aşama süresi (domain, stage)', scrape_metrics, ('domain', 'stage'))
+    writer.metric('scrape_cache_entries', 'gauge', 'Scraping önbelleğindeki kayıt sayısı', len(scraping_cache))
+    writer.counter_family('cache_lookups_total', 'counter', 'Önbellek sorguları (hit/miss)', counters)
+    
+    # Browser (her scrape kendi Chromium'unu açar; havuz yok)
+    writer.counter_family('browser_launches_total', 'counter', 'Başlatılan Chromium sayısı', counters)
+    writer.counter_family('browsers_active', 'gauge', 'Şu an açık Chromium sayısı', counters)
+    
+    # Veritabanı
+    pool = get_pool_stats() or {}
+    for key in ('checkouts', 'waits', 'health_check_failures', 'connections_opened'):
+        if key in pool:
+            writer.metric(f'db_pool_{key}_total', 'counter', f'Bağlantı havuzu {key}', pool[key])
+    if 'wait_time_total' in pool:
+        writer.metric('db_pool_wait_seconds_total', 'counter', 'Havuzda bağlantı beklenen toplam süre', pool['wait_time_total'])
+    for key in ('size', 'in_use', 'idle', 'max_size'):
+        if key in pool:
+            writer.metric(f'db_pool_{key}', 'gauge', f'Bağlantı havuzu {key}', pool[key])
+    sql_stats = DIALECT.get_stats()
+    for key in ('prepares', 'prepared_executions', 'reprepares'):
+        writer.metric(f'db_{key}_total', 'counter', f'Prepared statement {key}', sql_stats[key])
+    
+    # Kuyruklar
+    scheduler = price_refresh_scheduler.get_stats()
+    writer.metric('refresh_queue_depth', 'gauge', 'Fiyat zamanlayıcısındaki katalog ürünü sayısı', scheduler['queued_products'])
+    for key in ('refreshed', 'changed', 'failed', 'writes', 'writes_skipped'):
+        writer.metric(f'refresh_{key}_total', 'counter', f'Fiyat yenileme {key}', scheduler[key])
+    writer.metric('write_behind_pending', 'gauge', 'Write-behind tamponunda bekleyen güncelleme', scheduler['write_behind']['pending'])
+    events = event_bus.get_stats()
+    writer.metric('sse_connections', 'gauge', 'Açık SSE bağlantısı', events['connections'])
+    writer.metric('sse_events_dropped_total', 'counter', 'Kuyruk dolduğu için düşen SSE olayı', events['dropped'])
+    
+    # Process
+    process = psutil.Process()
+    cpu = process.cpu_times()
+    writer.metric('process_resident_memory_bytes', 'gauge', 'Resident set size', process.memory_info().rss)
+    writer.metric('process_cpu_seconds_total', 'counter', 'Kullanıcı + sistem CPU süresi', cpu.user + cpu.system)
+    writer.metric('process_threads', 'gauge', 'Thread sayısı', process.num_threads())
+    return writer.render()
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """Prometheus scrape endpoint'i"""
+    if not METRICS_TOKEN:
+        return Response(status=404)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'):
+        return Response(status=401)
+    return Response(collect_prometheus_metrics(), content_type=PrometheusWriter.CONTENT_TYPE)
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
\ No newline at end of file
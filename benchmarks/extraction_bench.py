@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Offline veri çekme benchmark'ı
+benchmarks/fixtures/pages altındaki kayıtlı ürün sayfalarını yerel bir HTTP
+sunucusundan servis eder ve iki yolu ölçer:
+
+    static   simple_scraper.parse_product_html (HTTP fetch + BeautifulSoup)
+    browser  app.perform_scraping (Playwright; SCRAPE_FIXTURE_SERVER ile
+             belge istekleri fixture sunucusuna yönlenir, diğerleri engellenir)
+
+Her vaka için toplam süre, aşama süreleri (metrics.span histogramları) ve
+fixtures/golden.json'daki beklenen değerlere göre alan doğruluğu raporlanır.
+Canlı sitelere hiç istek gitmez.
+
+Kullanım:
+    python benchmarks/extraction_bench.py --mode both --repeat 3
+    python benchmarks/extraction_bench.py --mode static --case zara --json sonuc.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+PAGES_DIR = os.path.join(FIXTURES_DIR, 'pages')
+GOLDEN_FILE = os.path.join(FIXTURES_DIR, 'golden.json')
+
+sys.path.insert(0, ROOT_DIR)
+
+from metrics import StageMetrics  # noqa: E402
+from price_scheduler import parse_price, normalize_text  # noqa: E402
+
+STATIC_FIELDS = ('name', 'price', 'image')
+BROWSER_FIELDS = ('name', 'price', 'old_price', 'image', 'brand')
+
+# Pipeline'ın "bulunamadı" yerine döndürdüğü değerler
+MISSING_VALUES = {'', '🤷', 'başlık bulunamadı', 'isim bulunamadı'}
+
+
+def load_cases(names=None):
+    with open(GOLDEN_FILE, encoding='utf-8') as f:
+        cases = json.load(f)
+    if names:
+        cases = [case for case in cases if case['name'] in names]
+    return cases
+
+
+def fixture_key(url):
+    parts = urlsplit(url)
+    return parts.netloc + parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+def start_fixture_server(cases):
+    """Fixture'ları /<host><path> altında servis eden sunucuyu başlat, adresini döndür"""
+    pages = {}
+    for case in cases:
+        with open(os.path.join(PAGES_DIR, case['fixture']), 'rb') as f:
+            pages[fixture_key(case['url'])] = f.read()
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path.lstrip('/'))
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def normalize_field(field, value):
+    """Alanı karşılaştırılabilir biçime getir (fiyat sayısal, görsel sadece path)"""
+    if value is None or normalize_text(value) in MISSING_VALUES:
+        return None
+    if field in ('price', 'old_price'):
+        return parse_price(value)
+    if field == 'image':
+        return urlsplit(str(value)).path
+    # Pipeline başlığı str.upper() ile büyütür; Türkçe ı/İ farkı doğruluğu etkilemesin
+    return normalize_text(value).replace('i\u0307', 'i').replace('ı', 'i')
+
+
+def score(case, result, fields):
+    """(doğru alan sayısı, değerlendirilen alan sayısı, hatalar)"""
+    expected = case['expected']
+    checked = [field for field in fields if field in expected]
+    mismatches = {}
+    for field in checked:
+        got = result.get(field) if result else None
+        if normalize_field(field, got) != normalize_field(field, expected[field]):
+            mismatches[field] = {'expected': expected[field], 'got': got}
+    return len(checked) - len(mismatches), len(checked), mismatches
+
+
+def run_static(cases, server_url, repeat):
+    from simple_scraper import parse_product_html
+
+    stages = StageMetrics()
+    results = []
+    for case in cases:
+        domain = urlsplit(case['url']).netloc
+        walls = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch_started = time.perf_counter()
+            with urllib.request.urlopen(f"{server_url}/{fixture_key(case['url'])}") as response:
+                content = response.read()
+            stages.observe(domain, 'fetch', time.perf_counter() - fetch_started)
+            parse_started = time.perf_counter()
+            result = parse_product_html(content, case['url'])
+            stages.observe(domain, 'parse', time.perf_counter() - parse_started)
+            walls.append(time.perf_counter() - started)
+        results.append(case_result(case, result, STATIC_FIELDS, walls))
+    return results, stages.get_stats()
+
+
+def browser_unavailable_reason():
+    """Chromium başlatılamıyorsa nedenini döndür (pipeline hatayı yutar, sonuçlar yanıltıcı olur)"""
+    from playwright.async_api import async_playwright
+
+    async def probe():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(probe())
+    except Exception as e:
+        return str(e).splitlines()[0]
+    return None
+
+
+def run_browser(cases, repeat):
+    import app
+    from metrics import scrape_metrics
+
+    scrape_metrics.reset()
+    results = []
+    for case in cases:
+        walls = []
+        result = None
+        for _ in range(repeat):
+            # perform_scraping sonucu önbelleğe alır; her tekrar tam pipeline'ı çalıştırsın
+            app.scraping_cache.clear()
+            started = time.perf_counter()
+            try:
+                result = asyncio.run(app.perform_scraping(case['url']))
+            except Exception as e:
+                result = {'error': str(e)}
+            walls.append(time.perf_counter() - started)
+        results.append(case_result(case, result, BROWSER_FIELDS, walls))
+    return results, scrape_metrics.get_stats()
+
+
+def case_result(case, result, fields, walls):
+    correct, checked, mismatches = score(case, result, fields)
+    walls = sorted(walls)
+    return {
+        'case': case['name'],
+        'wall_min': round(walls[0], 4),
+        'wall_median': round(walls[len(walls) // 2], 4),
+        'correct': correct,
+        'checked': checked,
+        'mismatches': mismatches
+    }
+
+
+def print_report(mode, results, stage_stats):
+    print(f"\n== {mode} ==")
+    print(f"{'vaka':<22}{'min sn':>10}{'medyan sn':>12}{'doğruluk':>12}")
+    correct = checked = 0
+    for result in results:
+        correct += result['correct']
+        checked += result['checked']
+        print(f"{result['case']:<22}{result['wall_min']:>10.4f}{result['wall_median']:>12.4f}"
+              f"{result['correct']:>8}/{result['checked']:<3}")
+        for field, mismatch in result['mismatches'].items():
+            print(f"    {field}: beklenen={mismatch['expected']!r} bulunan={mismatch['got']!r}")
+    total_wall = sum(result['wall_median'] for result in results)
+    accuracy = correct / checked * 100 if checked else 0
+    print(f"toplam medyan süre: {total_wall:.3f} sn, alan doğruluğu: {correct}/{checked} ({accuracy:.1f}%)")
+
+    # Aşamaları domain'ler üzerinden topla
+    totals = {}
+    for stages in stage_stats.values():
+        for stage, stats in stages.items():
+            entry = totals.setdefault(stage, {'count': 0, 'total_seconds': 0.0, 'max': 0.0})
+            entry['count'] += stats['count']
+            entry['total_seconds'] += stats['total_seconds']
+            entry['max'] = max(entry['max'], stats['max'] or 0)
+    print(f"{'aşama':<22}{'sayı':>8}{'toplam sn':>12}{'ortalama sn':>14}{'max sn':>10}")
+    for stage, entry in sorted(totals.items(), key=lambda item: item[1]['total_seconds'], reverse=True):
+        mean = entry['total_seconds'] / entry['count'] if entry['count'] else 0
+        print(f"{stage:<22}{entry['count']:>8}{entry['total_seconds']:>12.3f}{mean:>14.4f}{entry['max']:>10.4f}")
+    return {'results': results, 'stages': stage_stats, 'total_wall': total_wall, 'accuracy': accuracy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline veri çekme benchmark\'ı')
+    parser.add_argument('--mode', choices=('static', 'browser', 'both'), default='both')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', help='Sadece bu vaka(lar)ı çalıştır')
+    parser.add_argument('--json', help='Sonuçları bu dosyaya yaz (değişiklik öncesi/sonrası karşılaştırma için)')
+    args = parser.parse_args()
+
+    cases = load_cases(args.case)
+    if not cases:
+        sys.exit('Vaka bulunamadı')
+
+    server, server_url = start_fixture_server(cases)
+    # app import edilmeden önce: fixture yönlendirmesi ve yan etkiler (db, log, marka dosyası) geçici dizinde
+    os.environ['SCRAPE_FIXTURE_SERVER'] = server_url
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.chdir(tempfile.mkdtemp(prefix='extraction_bench_'))
+
+    report = {}
+    try:
+        if args.mode in ('static', 'both'):
+            report['static'] = print_report('static', *run_static(cases, server_url, args.repeat))
+        if args.mode in ('browser', 'both'):
+            reason = browser_unavailable_reason()
+            if reason:
+                print(f"\n== browser ==\nChromium başlatılamadı, atlandı ({reason}); 'playwright install chromium' gerekli")
+            else:
+                report['browser'] = print_report('browser', *run_browser(cases, args.repeat))
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
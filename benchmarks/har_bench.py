@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+HAR kayıt/tekrar benchmark'ı
+Canlı sayfalar değiştiği ve rate limit uyguladığı için tarayıcı pipeline'ının
+performansı canlı sitede tekrarlanabilir ölçülemez. Bu araç iki adımda çalışır:
+
+    record   URL'leri app.perform_scraping ile canlı siteden çeker; her sayfa
+             yüklemesinin ağ trafiği (SCRAPE_HAR_RECORD) <dizin>/*.har.zip olarak,
+             çıkan sonuç da manifest.json'a beklenen değer olarak yazılır
+    replay   manifest'teki URL'leri SCRAPE_HAR_REPLAY ile sadece HAR'dan
+             (page.route_from_har, bulunamayan istekler engellenir) tekrar çeker;
+             süre, aşama histogramları ve kayıttaki sonuçla alan uyumu raporlanır
+
+Böylece browser havuzu, istek engelleme ve bekleme stratejisi değişiklikleri
+aynı girdiler üzerinde karşılaştırılabilir. Kayıt Chromium ve internet
+erişimi, tekrar sadece Chromium gerektirir.
+
+Kullanım:
+    python benchmarks/har_bench.py record https://www.zara.com/tr/tr/... --dir /tmp/har
+    python benchmarks/har_bench.py replay --dir /tmp/har --repeat 3 --json sonrasi.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+DEFAULT_HAR_DIR = os.path.join(BENCH_DIR, 'fixtures', 'har')
+MANIFEST_NAME = 'manifest.json'
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from extraction_bench import BROWSER_FIELDS, browser_unavailable_reason, case_result, print_report  # noqa: E402
+
+
+def load_manifest(har_dir):
+    path = os.path.join(har_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(har_dir, entries):
+    with open(os.path.join(har_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+def prepare_app(env_name, har_dir):
+    """app'i HAR kayıt/tekrar ayarıyla import et (yan etkiler geçici dizinde kalır)"""
+    os.environ[env_name] = har_dir
+    os.environ.pop('SCRAPE_FIXTURE_SERVER', None)
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.chdir(tempfile.mkdtemp(prefix='har_bench_'))
+    import app
+    return app
+
+
+def record(urls, har_dir):
+    app = prepare_app('SCRAPE_HAR_RECORD', har_dir)
+
+    entries = {entry['url']: entry for entry in load_manifest(har_dir)}
+    for url in urls:
+        app.scraping_cache.clear()
+        started = time.perf_counter()
+        # retry_scraping kullanılmaz: her deneme aynı HAR dosyasının üzerine yazar
+        result = asyncio.run(app.perform_scraping(url))
+        har_path = app.har_path_for(har_dir, url)
+        if not os.path.exists(har_path):
+            print(f"[HATA] HAR yazılmadı: {url}")
+            continue
+        entries[url] = {
+            'name': os.path.basename(har_path).replace('.har.zip', ''),
+            'url': url,
+            'har': os.path.basename(har_path),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'expected': {field: result.get(field) for field in BROWSER_FIELDS}
+        }
+        print(f"{url}\n    {har_path} ({os.path.getsize(har_path) / 1024:.0f} KB, "
+              f"{time.perf_counter() - started:.1f} sn) ad={result.get('name')!r} fiyat={result.get('price')!r}")
+    save_manifest(har_dir, list(entries.values()))
+
+
+def replay(cases, har_dir, repeat):
+    app = prepare_app('SCRAPE_HAR_REPLAY', har_dir)
+    from metrics import scrape_metrics
+
+    scrape_metrics.reset()
+    results = []
+    for case in cases:
+        walls = []
+        result = None
+        for _ in range(repeat):
+            app.scraping_cache.clear()
+            started = time.perf_counter()
+            try:
+                result = asyncio.run(app.perform_scraping(case['url']))
+            except Exception as e:
+                result = {'error': str(e)}
+            walls.append(time.perf_counter() - started)
+        results.append(case_result(case, result, BROWSER_FIELDS, walls))
+    return results, scrape_metrics.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HAR kayıt/tekrar benchmark\'ı')
+    parser.add_argument('command', choices=('record', 'replay'))
+    parser.add_argument('urls', nargs='*', help='Kaydedilecek ürün URL\'leri (record)')
+    parser.add_argument('--dir', default=DEFAULT_HAR_DIR, help='HAR ve manifest dizini')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', help='Sadece bu kayıt(lar)ı tekrar et (manifest adı)')
+    parser.add_argument('--json', help='Sonuçları bu dosyaya yaz (değişiklik öncesi/sonrası karşılaştırma için)')
+    args = parser.parse_args()
+
+    har_dir = os.path.abspath(args.dir)
+    json_path = os.path.abspath(args.json) if args.json else None
+    reason = browser_unavailable_reason()
+    if reason:
+        sys.exit(f"Chromium başlatılamadı ({reason}); 'playwright install chromium' gerekli")
+
+    if args.command == 'record':
+        if not args.urls:
+            sys.exit('Kaydedilecek URL verilmedi')
+        os.makedirs(har_dir, exist_ok=True)
+        record(args.urls, har_dir)
+        return
+
+    cases = load_manifest(har_dir)
+    if args.case:
+        cases = [case for case in cases if case['name'] in args.case]
+    if not cases:
+        sys.exit(f'Kayıt bulunamadı: {os.path.join(har_dir, MANIFEST_NAME)}')
+
+    report = {'replay': print_report('replay', *replay(cases, har_dir, args.repeat))}
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
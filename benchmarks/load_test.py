@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Flask uygulaması için yük testi
+benchmarks/seed_data.py ile doldurulmuş veritabanına karşı karışık bir iş
+yükünü eş zamanlı oturumlarla çalıştırır ve route başına gecikme yüzdelikleri
+(p50/p95/p99) ile istek başına sorgu sayısını (X-DB-Query-Count başlığı)
+raporlar.
+
+Varsayılan olarak uygulama process içinde Flask test client'ı ile çağrılır;
+scraper stub'lanır, böylece /add_product sadece veritabanı yolunu ölçer.
+--base-url ile çalışan bir sunucuya (örn. gunicorn) HTTP üzerinden gidilir;
+bu modda scraper stub'lanamadığı için add_product iş yükünden çıkarılır.
+
+İş yükü (ağırlıklar --mix ile değiştirilebilir):
+    dashboard          GET /dashboard
+    collection         GET /collections/<id>        (oturumun kendi koleksiyonu)
+    public_collection  GET /collection/<share_url>
+    profile            GET /profile/<profile_url>
+    notifications      GET /notifications
+    add_product        POST /add_product            (stub scraper)
+
+Kullanım:
+    SQLITE_DB_PATH=/tmp/load.db python benchmarks/load_test.py --requests 5000 --threads 8
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --duration 60 --json sonuc.json
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --sse-streams 2 --requests 2000
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, BENCH_DIR)
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from models import get_db_connection, execute_query, get_placeholder  # noqa: E402
+from seed_data import SEED_PASSWORD, USERNAME_PREFIX, catalog_product  # noqa: E402
+
+# Saniye; sunucu kuyruğunda bundan uzun bekleyen istek hata sayılır
+REQUEST_TIMEOUT = 30
+
+DEFAULT_MIX = 'dashboard=35,collection=20,public_collection=15,profile=15,notifications=13,add_product=2'
+
+
+def parse_mix(spec):
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        if name.strip() and float(weight or 0) > 0:
+            mix[name.strip()] = float(weight)
+    return mix
+
+
+def percentile(sorted_values, q):
+    """En yakın sıra yöntemiyle yüzdelik (liste sıralı olmalı)"""
+    if not sorted_values:
+        return None
+    index = max(int(round(q * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class TestClientSession:
+    """Process içi oturum (Flask test client)"""
+
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self.client.open(path, method=method, data=data)
+        status, headers = response.status_code, response.headers
+        response.close()
+        return status, headers
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Yönlendirmeler takip edilmez; ölçülen süre sadece istenen route'a ait olsun
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpSession:
+    """Çalışan sunucuya karşı cookie'li HTTP oturumu"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect()
+        )
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+                response.read()
+                return response.status, response.headers
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, e.headers
+        except (urllib.error.URLError, OSError):
+            # Zaman aşımı / bağlantı hatası raporda 0 durum koduyla görünür
+            return 0, {}
+
+
+def fetch_targets(session_count, sample_size=1000):
+    """Seed kullanıcılarından oturum açılacakları ve public hedefleri seç"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    placeholder = get_placeholder()
+    execute_query(cursor, f'''
+        SELECT id, username FROM users WHERE username LIKE {placeholder} ORDER BY RANDOM() LIMIT {placeholder}
+    ''', (f'{USERNAME_PREFIX}%', session_count))
+    users = cursor.fetchall()
+    sessions = []
+    for user_id, username in users:
+        execute_query(cursor, f'SELECT id FROM collections WHERE user_id = {placeholder}', (user_id,))
+        sessions.append({'username': username, 'collections': [row[0] for row in cursor.fetchall()]})
+    execute_query(cursor, f'''
+        SELECT share_url FROM collections WHERE is_public = {placeholder} ORDER BY RANDOM() LIMIT {placeholder}
+    ''', (True, sample_size))
+    share_urls = [row[0] for row in cursor.fetchall()]
+    execute_query(cursor, f'SELECT profile_url FROM users ORDER BY RANDOM() LIMIT {placeholder}', (sample_size,))
+    profile_urls = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return sessions, share_urls, profile_urls
+
+
+def stub_scraper(flask_app_module):
+    """Scraper'ı katalogdan sahte sonuç döndüren coroutine ile değiştir"""
+    async def scrape_product(url):
+        name, price, image, brand, _, old_price, _ = catalog_product(zlib.crc32(url.encode()) % 1000000)
+        return {'url': url, 'name': name, 'price': price, 'old_price': old_price, 'image': image,
+                'brand': brand, 'sizes': []}
+
+    flask_app_module.scrape_product = scrape_product
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, seconds, status, query_count):
+        with self.lock:
+            entry = self.routes.setdefault(route, {'latencies': [], 'queries': [], 'statuses': {}})
+            entry['latencies'].append(seconds)
+            if query_count is not None:
+                entry['queries'].append(query_count)
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+
+    def summary(self):
+        summary = {}
+        for route, entry in sorted(self.routes.items()):
+            latencies = sorted(entry['latencies'])
+            queries = entry['queries']
+            summary[route] = {
+                'count': len(latencies),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+                'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+                'queries_max': max(queries) if queries else None,
+                'statuses': {str(status): count for status, count in sorted(entry['statuses'].items())}
+            }
+        return summary
+
+
+def build_request(route, rng, state, targets):
+    """(method, path, data) veya hedef yoksa None"""
+    sessions, share_urls, profile_urls = targets
+    if route == 'dashboard':
+        return 'GET', '/dashboard', None
+    if route == 'collection':
+        return ('GET', f"/collections/{rng.choice(state['collections'])}", None) if state['collections'] else None
+    if route == 'public_collection':
+        return ('GET', f"/collection/{rng.choice(share_urls)}", None) if share_urls else None
+    if route == 'profile':
+        return ('GET', f"/profile/{rng.choice(profile_urls)}", None) if profile_urls else None
+    if route == 'notifications':
+        return 'GET', '/notifications', None
+    if route == 'add_product':
+        return 'POST', '/add_product', {'product_url': catalog_product(rng.randrange(1000000))[4]}
+    raise ValueError(f'Bilinmeyen route: {route}')
+
+
+def worker(sessions, targets, mix, deadline, budget, recorder, seed):
+    rng = random.Random(seed)
+    routes, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        with budget['lock']:
+            if budget['remaining'] <= 0:
+                return
+            budget['remaining'] -= 1
+        session, state = rng.choice(sessions)
+        route = rng.choices(routes, weights)[0]
+        request = build_request(route, rng, state, targets)
+        if request is None:
+            continue
+        method, path, data = request
+        started = time.perf_counter()
+        status, headers = session.request(method, path, data)
+        elapsed = time.perf_counter() - started
+        query_count = headers.get('X-DB-Query-Count')
+        recorder.record(route, elapsed, status, int(query_count) if query_count is not None else None)
+
+
+def print_report(summary, wall, total):
+    print(f"\n{total} istek, {wall:.1f} sn, {total / wall:.1f} istek/sn")
+    print(f"{'route':<20}{'sayı':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          f"{'sorgu ort':>11}{'sorgu max':>11}  durum")
+    for route, stats in summary.items():
+        statuses = ' '.join(f"{status}:{count}" for status, count in stats['statuses'].items())
+        queries_mean = '-' if stats['queries_mean'] is None else f"{stats['queries_mean']:.1f}"
+        queries_max = '-' if stats['queries_max'] is None else stats['queries_max']
+        print(f"{route:<20}{stats['count']:>8}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+              f"{stats['max_ms']:>10.1f}{queries_mean:>11}{queries_max:>11}  {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flask uygulaması için yük testi')
+    parser.add_argument('--requests', type=int, default=2000, help='Toplam istek sayısı')
+    parser.add_argument('--duration', type=float, help='Süre sınırı (saniye); verilirse --requests üst sınırdır')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--sessions', type=int, default=20, help='Oturum açan seed kullanıcısı sayısı')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='route=ağırlık listesi')
+    parser.add_argument('--warmup', type=int, default=50, help='Ölçülmeyen ısınma isteği sayısı')
+    parser.add_argument('--base-url', help='Çalışan sunucunun adresi (verilmezse process içi test client)')
+    parser.add_argument('--sse-streams', type=int, default=0,
+                        help='Ölçüm boyunca açık tutulan /events bağlantısı (uzun istek; sadece --base-url)')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='Sonuçları bu dosyaya yaz')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    if args.base_url:
+        mix.pop('add_product', None)
+        make_session = lambda: HttpSession(args.base_url)  # noqa: E731
+    else:
+        import app
+        stub_scraper(app)
+        make_session = lambda: TestClientSession(app.app)  # noqa: E731
+
+    # Her thread'in kendi oturumları olsun
+    sessions, share_urls, profile_urls = fetch_targets(max(args.sessions, args.threads))
+    if not sessions:
+        sys.exit(f"Seed kullanıcısı bulunamadı ({USERNAME_PREFIX}*); önce benchmarks/seed_data.py çalıştırın")
+
+    logged_in = []
+    for state in sessions:
+        session = make_session()
+        status, headers = session.request('POST', '/login', {'username': state['username'], 'password': SEED_PASSWORD})
+        if status == 302 and headers.get('Location', '').endswith('/dashboard'):
+            logged_in.append((session, state))
+    if not logged_in:
+        sys.exit('Hiçbir oturum açılamadı')
+    print(f"{len(logged_in)} oturum, {len(share_urls)} public koleksiyon, {len(profile_urls)} profil; "
+          f"iş yükü: {mix}")
+
+    if args.sse_streams and args.base_url:
+        # Uzun süren istekler: sync worker'da açık her akış diğer istekleri bekletir
+        for state in sessions[:args.sse_streams]:
+            session = make_session()
+            session.request('POST', '/login', {'username': state['username'], 'password': SEED_PASSWORD})
+            threading.Thread(target=session.request, args=('GET', '/events'), daemon=True).start()
+        print(f"{min(args.sse_streams, len(sessions))} SSE akışı açıldı")
+
+    targets = (sessions, share_urls, profile_urls)
+    warmup = {'lock': threading.Lock(), 'remaining': args.warmup}
+    worker(logged_in, targets, mix, float('inf'), warmup, Recorder(), args.seed)
+
+    recorder = Recorder()
+    budget = {'lock': threading.Lock(), 'remaining': args.requests}
+    deadline = time.perf_counter() + args.duration if args.duration else float('inf')
+    threads = [
+        # Test client oturumları thread'ler arasında paylaşılmaz
+        threading.Thread(target=worker, args=(logged_in[i::args.threads] or logged_in, targets, mix, deadline, budget,
+                                              recorder, args.seed + i + 1))
+        for i in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    summary = recorder.summary()
+    total = sum(stats['count'] for stats in summary.values())
+    print_report(summary, wall, total)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'routes': summary, 'wall_seconds': round(wall, 3), 'requests': total,
+                       'threads': args.threads, 'mix': mix}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
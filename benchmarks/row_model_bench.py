@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Satır modeli benchmark'ı
+Eski __dict__'li Product sınıfı ile models.Product (__slots__'lu namedtuple)
+arasında satır başına kurulum süresini ve belleği karşılaştırır. Satırlar
+gerçek bir SQLite cursor'ından gelir, böylece fetch + hydrate maliyeti ölçülür.
+
+Kullanım:
+    python benchmarks/row_model_bench.py --rows 100000
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from models import Product, PRODUCT_COLUMNS  # noqa: E402
+
+
+class LegacyProduct:
+    """Önceki Product sınıfı (__dict__'li)"""
+
+    def __init__(self, id, user_id, name, price, image, brand, url, created_at, old_price=None, catalog_item_id=None,
+                 tracking_id=None):
+        self.id = id
+        self.user_id = user_id
+        self.name = name
+        self.price = price
+        self.image = image
+        self.brand = brand
+        self.url = url
+        self.created_at = created_at
+        self.old_price = old_price
+        self.catalog_item_id = catalog_item_id
+        self.tracking_id = tracking_id
+
+
+def build_rows(count):
+    conn = sqlite3.connect(':memory:')
+    conn.execute(f'CREATE TABLE products ({", ".join(PRODUCT_COLUMNS)})')
+    user_id = str(uuid.uuid4())
+    conn.executemany(
+        f'INSERT INTO products VALUES ({", ".join("?" * len(PRODUCT_COLUMNS))})',
+        [
+            (str(uuid.uuid4()), user_id, f'Ürün {i}', '199,90 TL', f'https://example.com/{i}.jpg',
+             'Zara', f'https://example.com/{i}', '2026-01-01 00:00:00', None, None)
+            for i in range(count)
+        ]
+    )
+    rows = conn.execute(f'SELECT {", ".join(PRODUCT_COLUMNS)}, NULL FROM products').fetchall()
+    conn.close()
+    return rows
+
+
+def measure(label, hydrate, rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        objects = hydrate(rows)
+        best = min(best, time.perf_counter() - started)
+        del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = hydrate(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    count = len(rows)
+    print(f"{label:<28}{best / count * 1e9:>12.0f}{current / count:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Satır modeli kurulum maliyeti')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print(f"{args.rows} satır, en iyi {args.repeat} tekrar")
+    print(f"{'model':<28}{'ns/satır':>12}{'bayt/satır':>14}")
+    measure('LegacyProduct(*row)', lambda rows: [LegacyProduct(*row) for row in rows], rows, args.repeat)
+    measure('Product(*row)', lambda rows: [Product(*row) for row in rows], rows, args.repeat)
+    measure('map(Product._make, rows)', lambda rows: list(map(Product._make, rows)), rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
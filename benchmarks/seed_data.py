@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Yük testi için sentetik veri üretici
+Kullanıcı, ürün, koleksiyon, fiyat takibi ve bildirimleri model katmanı
+üzerinden (User/Product.create_many, Collection, PriceTracking,
+Notification.create_many) yazar; şema ve katalog eşleştirmesi uygulamadaki
+ile aynıdır. SQLite için SQLITE_DB_PATH, Postgres için RENDER=1 ve
+DATABASE_URL ortam değişkenleri models'in kendi ayarlarıdır.
+
+Dağılımlar:
+    - Kullanıcı başına ürün sayısı üstel dağılır (ortalama --products-per-user,
+      üst sınır 20 katı); birkaç kullanıcının büyük dashboard'u olur
+    - Ürünler --catalog-size büyüklüğünde ortak bir katalogdan Pareto
+      ağırlığıyla seçilir; popüler ürünler birçok kullanıcıda bulunur
+    - Koleksiyonların yarısı public, kullanıcının ürünlerinin bir kısmını içerir
+
+Tüm kullanıcıların şifresi SEED_PASSWORD'dür (hash bir kez hesaplanır).
+
+Kullanım:
+    SQLITE_DB_PATH=/tmp/load.db SQLITE_PROFILE=production python benchmarks/seed_data.py --users 10000 --products-per-user 100
+    RENDER=1 DATABASE_URL=postgresql://localhost/wishya_load python benchmarks/seed_data.py --users 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from migrations import ensure_schema  # noqa: E402
+from models import User, Product, Collection, PriceTracking, Notification  # noqa: E402
+
+SEED_PASSWORD = 'loadtest123'
+USERNAME_PREFIX = 'load_user_'
+
+# Kullanıcılar bu büyüklükte gruplar halinde oluşturulur
+USER_BATCH_SIZE = 500
+
+RETAILERS = (
+    ('www.zara.com', 'Zara', '/tr/tr/{slug}-p{id}.html'),
+    ('shop.mango.com', 'Mango', '/tr/tr/p/kadin/{slug}_{id}'),
+    ('www.trendyol.com', 'Trendyol', '/marka/{slug}-p-{id}'),
+    ('www.hepsiburada.com', 'Hepsiburada', '/{slug}-p-HB{id}'),
+    ('www.koton.com', 'Koton', '/{slug}-p-{id}'),
+    ('www.ltbjeans.com', 'LTB', '/tr-TR/p/{slug}-{id}'),
+    ('www.pullandbear.com', 'Pull&Bear', '/tr/{slug}-l{id}'),
+    ('www.columbia.com.tr', 'Columbia', '/{slug}-{id}'),
+)
+ADJECTIVES = ('Basic', 'Oversize', 'Slim Fit', 'Keten', 'Pamuklu', 'Triko', 'Deri', 'Crop', 'Yüksek Bel', 'Çizgili')
+ITEMS = ('Gömlek', 'Tişört', 'Elbise', 'Pantolon', 'Ceket', 'Etek', 'Kazak', 'Mont', 'Şort', 'Sneaker')
+COLLECTION_NAMES = ('Yaz Kombini', 'Ofis', 'Hafta Sonu', 'Doğum Günü', 'İndirim Bekleyenler', 'Kış', 'Tatil')
+COLLECTION_TYPES = ('kombinler', 'favoriler')
+NOTIFICATIONS = (
+    ('Fiyat düştü', '{name} fiyatı %{percent} düştü', 'price_drop'),
+    ('Fiyat alarmı', '{name} alarm fiyatınızın altına indi', 'price_alert'),
+    ('Hoş geldiniz', 'Wishya\'ya hoş geldiniz!', 'info'),
+)
+
+
+def format_price(value):
+    """1299.9 -> '1.299,90 TL' (sitelerdeki Türkçe yazım)"""
+    text = f"{value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    return f"{text} TL"
+
+
+def catalog_product(index):
+    """Katalogdaki index'inci ürün (aynı index her zaman aynı ürünü verir)"""
+    rng = random.Random(index)
+    host, brand, path = RETAILERS[index % len(RETAILERS)]
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(ITEMS)}"
+    slug = name.lower().replace(' ', '-')
+    price = round(rng.uniform(99, 4999), 2)
+    old_price = format_price(price * rng.uniform(1.1, 1.6)) if rng.random() < 0.3 else None
+    url = f"https://{host}{path.format(slug=slug, id=100000 + index)}"
+    image = f"https://{host}/images/{100000 + index}.jpg"
+    return name, format_price(price), image, brand, url, old_price, price
+
+
+def pick_catalog_index(rng, catalog_size):
+    # Pareto ağırlığı: düşük index'ler (popüler ürünler) çok daha sık seçilir
+    return min(int(rng.paretovariate(1.2)) - 1, catalog_size - 1)
+
+
+def seed_user(user, rng, args):
+    """Kullanıcının ürün, koleksiyon, takip ve bildirimlerini oluştur; sayaçları döndür"""
+    count = min(int(rng.expovariate(1 / args.products_per_user)), args.products_per_user * 20) \
+        if args.products_per_user else 0
+    indexes = list(dict.fromkeys(
+        pick_catalog_index(rng, args.catalog_size) if rng.random() < 0.5 else rng.randrange(args.catalog_size)
+        for _ in range(count)
+    ))
+    catalog = [catalog_product(index) for index in indexes]
+    products = Product.create_many(user.id, [item[:6] for item in catalog])
+    prices = {product.id: item[6] for product, item in zip(products, catalog)}
+
+    collections = 0
+    for i in range(args.collections_per_user if products else 0):
+        collection = Collection.create(
+            user.id, f"{rng.choice(COLLECTION_NAMES)} {i + 1}", 'Yük testi koleksiyonu',
+            rng.choice(COLLECTION_TYPES), is_public=rng.random() < 0.5
+        )
+        if collection:
+            collection.add_products([product.id for product in rng.sample(products, rng.randint(1, len(products)))])
+            collections += 1
+
+    trackings = 0
+    for product in rng.sample(products, min(args.trackings_per_user, len(products))):
+        current = prices[product.id]
+        if PriceTracking.create(user.id, product.id, current, round(current * rng.uniform(1, 1.3), 2)):
+            trackings += 1
+
+    notifications = []
+    for _ in range(args.notifications_per_user):
+        title, message, type = rng.choice(NOTIFICATIONS)
+        name = rng.choice(products).name if products else 'Ürün'
+        notifications.append((user.id, title, message.format(name=name, percent=rng.randint(5, 40)), type, None))
+    Notification.create_many(notifications)
+
+    return len(products), collections, trackings, len(notifications)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yük testi için sentetik veri üretici')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--products-per-user', type=int, default=100, help='Ortalama (üstel dağılım)')
+    parser.add_argument('--catalog-size', type=int, default=200000, help='Farklı ürün URL\'si sayısı')
+    parser.add_argument('--collections-per-user', type=int, default=3)
+    parser.add_argument('--trackings-per-user', type=int, default=2)
+    parser.add_argument('--notifications-per-user', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    ensure_schema()
+    rng = random.Random(args.seed)
+    password_hash = generate_password_hash(SEED_PASSWORD)
+    # Tekrar çalıştırıldığında mevcut kullanıcı adlarıyla çakışmasın
+    run_id = f"{args.seed}_{int(time.time())}"
+
+    totals = [0, 0, 0, 0]
+    started = time.perf_counter()
+    for start in range(0, args.users, USER_BATCH_SIZE):
+        batch = [
+            (f"{USERNAME_PREFIX}{run_id}_{i}", f"{USERNAME_PREFIX}{run_id}_{i}@example.com", password_hash)
+            for i in range(start, min(start + USER_BATCH_SIZE, args.users))
+        ]
+        users = User.create_many(batch)
+        if not users:
+            sys.exit('Kullanıcılar oluşturulamadı')
+        for user in users:
+            for i, value in enumerate(seed_user(user, rng, args)):
+                totals[i] += value
+        done = start + len(users)
+        elapsed = time.perf_counter() - started
+        print(f"{done}/{args.users} kullanıcı, {totals[0]} ürün, {totals[1]} koleksiyon, "
+              f"{totals[2]} takip, {totals[3]} bildirim ({elapsed:.0f} sn)", flush=True)
+
+    print(f"Tamamlandı: {time.perf_counter() - started:.1f} sn. Kullanıcı adları '{USERNAME_PREFIX}{run_id}_<n>', "
+          f"şifre '{SEED_PASSWORD}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+SQLite profil benchmark'ı
+Varsayılan ayarlar ile SQLITE_PROFILE=production ayarlarını eşzamanlı
+okuyucu/yazıcı senaryosunda karşılaştırır. Yazıcı process'i scrape worker'ı
+(Product.create gibi satır başına commit), okuyucular web worker'ı
+(dashboard ürün listesi) taklit eder.
+
+Kullanım:
+    python benchmarks/sqlite_profile_bench.py --seconds 10 --readers 4
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db_pool import apply_sqlite_production_profile  # noqa: E402
+
+SCHEMA = '''
+    CREATE TABLE users (
+        id TEXT PRIMARY KEY,
+        username TEXT UNIQUE NOT NULL
+    );
+    CREATE TABLE products (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        price TEXT NOT NULL,
+        image TEXT,
+        brand TEXT,
+        url TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        old_price TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+'''
+
+USER_COUNT = 50
+PRODUCTS_PER_USER = 40
+
+
+def connect(path, profile):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    if profile == 'production':
+        apply_sqlite_production_profile(conn)
+    return conn
+
+
+def prepare_database(path, profile):
+    conn = connect(path, profile)
+    conn.executescript(SCHEMA)
+    user_ids = [str(uuid.uuid4()) for _ in range(USER_COUNT)]
+    conn.executemany('INSERT INTO users (id, username) VALUES (?, ?)', [(uid, uid[:12]) for uid in user_ids])
+    conn.executemany(
+        'INSERT INTO products (id, user_id, name, price, image, brand, url) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [
+            (str(uuid.uuid4()), uid, f'Ürün {i}', '199,90 TL', 'https://example.com/i.jpg', 'Zara', f'https://example.com/{i}')
+            for uid in user_ids for i in range(PRODUCTS_PER_USER)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return user_ids
+
+
+def writer(path, profile, user_ids, seconds, results):
+    conn = connect(path, profile)
+    writes = locked = 0
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        try:
+            conn.execute(
+                'INSERT INTO products (id, user_id, name, price, image, brand, url) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (str(uuid.uuid4()), user_ids[writes % len(user_ids)], 'Yeni ürün', '99,90 TL', None, 'Mango', 'https://example.com/new')
+            )
+            conn.commit()
+            writes += 1
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e):
+                locked += 1
+                conn.rollback()
+            else:
+                raise
+    conn.close()
+    results.put(('writer', writes, locked))
+
+
+def reader(path, profile, user_ids, seconds, results):
+    conn = connect(path, profile)
+    reads = locked = 0
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        try:
+            conn.execute(
+                'SELECT * FROM products WHERE user_id = ? ORDER BY created_at DESC',
+                (user_ids[reads % len(user_ids)],)
+            ).fetchall()
+            reads += 1
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e):
+                locked += 1
+            else:
+                raise
+    conn.close()
+    results.put(('reader', reads, locked))
+
+
+def run(profile, seconds, reader_count):
+    directory = tempfile.mkdtemp(prefix='wishya-bench-')
+    path = os.path.join(directory, 'bench.db')
+    user_ids = prepare_database(path, profile)
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=writer, args=(path, profile, user_ids, seconds, results))]
+    processes += [
+        multiprocessing.Process(target=reader, args=(path, profile, user_ids, seconds, results))
+        for _ in range(reader_count)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    writes = sum(count for role, count, _ in collected if role == 'writer')
+    reads = sum(count for role, count, _ in collected if role == 'reader')
+    locked = sum(locked for _, _, locked in collected)
+    return {
+        'profile': profile,
+        'writes_per_sec': writes / seconds,
+        'reads_per_sec': reads / seconds,
+        'locked_errors': locked
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite profil karşılaştırması')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'profil':<12}{'yazma/sn':>12}{'okuma/sn':>12}{'locked':>10}")
+    for profile in ('default', 'production'):
+        result = run(profile, args.seconds, args.readers)
+        print(f"{result['profile']:<12}{result['writes_per_sec']:>12.1f}{result['reads_per_sec']:>12.1f}{result['locked_errors']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+"""
+Database bağlantı havuzu
+PostgreSQL için psycopg2 ThreadedConnectionPool, SQLite için thread başına
+tekrar kullanılan bağlantı. Havuzdan alınan bağlantının close() çağrısı
+bağlantıyı kapatmaz, havuza iade eder; bu sayede models.py içindeki
+conn.close() kullanımı değişmeden kalır.
+
+gevent worker'ında (process monkey-patch edilmişse) psycopg2 sorguları
+bekleme sırasında diğer greenlet'lere geçer; SQLite bağlantıları greenlet'e
+bağlı kalmaz, en dıştaki close()'da kapatılır.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from psycopg2 import pool as pg_pool
+    from psycopg2 import extensions as pg_extensions
+except ImportError:
+    pg_pool = None
+    pg_extensions = None
+
+try:
+    from gevent import monkey as gevent_monkey
+    from gevent.socket import wait_read, wait_write
+except ImportError:
+    gevent_monkey = None
+
+# gunicorn gevent worker'ı uygulamayı import etmeden önce process'i patch'ler (--preload olmadan)
+GEVENT_PATCHED = bool(gevent_monkey and gevent_monkey.is_module_patched('socket'))
+
+# Bu süreden uzun boşta kalan bağlantı checkout sırasında SELECT 1 ile test edilir
+HEALTH_CHECK_INTERVAL = 30
+
+# SQLite production profili: web worker ve scrape worker aynı dosyaya
+# eşzamanlı yazarken "database is locked" beklemelerini azaltır
+SQLITE_PRODUCTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 268435456),  # 256 MB
+    ('cache_size', -20000),  # ~20 MB (negatif değer KiB cinsinden)
+    ('busy_timeout', 5000),  # ms
+    ('foreign_keys', 'ON'),
+)
+
+
+def apply_sqlite_production_profile(conn):
+    """Yeni açılan SQLite bağlantısına production PRAGMA'larını uygula"""
+    for name, value in SQLITE_PRODUCTION_PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """psycopg2 bekleme callback'i: soket hazır olana kadar gevent hub'ına geç"""
+    while True:
+        state = conn.poll()
+        if state == pg_extensions.POLL_OK:
+            return
+        if state == pg_extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == pg_extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise Exception(f"Beklenmeyen psycopg2 poll durumu: {state}")
+
+
+class PooledConnection:
+    """Havuzdan alınmış bağlantı sarmalayıcısı
+
+    Context manager olarak kullanıldığında hata yoksa commit, hata varsa
+    rollback yapar ve bağlantıyı havuza iade eder:
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            ...
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+        # Finalizer başka bir thread'de çalışabilir; iade sahibi thread adına yapılır
+        self._owner = threading.get_ident()
+
+    def cursor(self, *args, **kwargs):
+        return self._conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        """Bağlantıyı havuza iade et"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._conn, self._owner)
+
+    def __del__(self):
+        # Hata yolunda close() çağrılmadan bırakılan bağlantıları havuza geri ver
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def raw(self):
+        """Alttaki DB-API bağlantısı"""
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+
+class BasePool:
+    """Ortak havuz metrikleri"""
+
+    backend = None
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'health_check_failures': 0,
+            'connections_opened': 0
+        }
+
+    def count(self, key, value=1):
+        with self.stats_lock:
+            self.stats[key] += value
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['backend'] = self.backend
+        stats['wait_time_total'] = round(stats['wait_time_total'], 4)
+        return stats
+
+
+class PostgresConnectionPool(BasePool):
+    """psycopg2 ThreadedConnectionPool üzerine bekleme ve sağlık kontrolü ekler
+
+    ThreadedConnectionPool havuz dolduğunda hata fırlatır; burada bir semaphore
+    ile boş bağlantı beklenir ve bekleme sayısı/süresi metriklere yazılır.
+    Not: ThreadedConnectionPool en fazla min_size kadar boşta bağlantı tutar,
+    fazlasını iade sırasında kapatır.
+    """
+
+    backend = 'postgresql'
+
+    def __init__(self, dsn, min_size=1, max_size=5, timeout=10):
+        super().__init__()
+        if pg_pool is None:
+            raise Exception("PostgreSQL havuzu için psycopg2 gerekli")
+        self.max_size = max_size
+        self.timeout = timeout
+        if GEVENT_PATCHED:
+            pg_extensions.set_wait_callback(gevent_wait_callback)
+        self.pool = pg_pool.ThreadedConnectionPool(min_size, max_size, dsn)
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.last_used = {}
+        self.in_use = 0
+        self.stats['connections_opened'] = min_size
+
+    def acquire(self):
+        if not self.slots.acquire(blocking=False):
+            started = time.time()
+            self.count('waits')
+            acquired = self.slots.acquire(timeout=self.timeout)
+            self.count('wait_time_total', time.time() - started)
+            if not acquired:
+                raise Exception(f"Database havuzunda {self.timeout} saniye içinde boş bağlantı bulunamadı")
+
+        try:
+            conn = self._checkout_healthy()
+        except Exception:
+            self.slots.release()
+            raise
+
+        with self.stats_lock:
+            self.stats['checkouts'] += 1
+            self.in_use += 1
+        return PooledConnection(self, conn)
+
+    def _checkout_healthy(self):
+        if not self.pool._pool:
+            self.count('connections_opened')
+        conn = self.pool.getconn()
+        idle_since = self.last_used.get(id(conn))
+        if conn.closed:
+            healthy = False
+        elif idle_since is None or time.time() - idle_since < HEALTH_CHECK_INTERVAL:
+            healthy = True
+        else:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                conn.rollback()
+                healthy = True
+            except Exception:
+                healthy = False
+
+        if not healthy:
+            # Bozuk bağlantıyı at, yerine yenisini aç
+            self.count('health_check_failures')
+            self.last_used.pop(id(conn), None)
+            self.pool.putconn(conn, close=True)
+            conn = self.pool.getconn()
+            self.count('connections_opened')
+        return conn
+
+    def release(self, conn, owner=None):
+        try:
+            if conn.closed:
+                self.last_used.pop(id(conn), None)
+                self.pool.putconn(conn, close=True)
+            else:
+                # Okuma sorgularının açtığı transaction'ı kapat
+                if conn.get_transaction_status() != pg_extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                self.last_used[id(conn)] = time.time()
+                self.pool.putconn(conn)
+        except Exception as e:
+            print(f"[HATA] Bağlantı havuza iade edilemedi: {e}")
+            try:
+                self.pool.putconn(conn, close=True)
+            except Exception:
+                pass
+        finally:
+            with self.stats_lock:
+                self.in_use -= 1
+            self.slots.release()
+
+    def get_stats(self):
+        stats = super().get_stats()
+        with self.stats_lock:
+            in_use = self.in_use
+        stats.update({
+            'size': len(self.pool._pool) + len(self.pool._used),
+            'in_use': in_use,
+            'idle': len(self.pool._pool),
+            'max_size': self.max_size
+        })
+        return stats
+
+
+class SQLiteConnectionPool(BasePool):
+    """Thread başına tek SQLite bağlantısı
+
+    Aynı thread içindeki iç içe checkout'lar aynı bağlantıyı paylaşır;
+    commit edilmemiş değişiklikler sadece en dıştaki close()'da geri alınır.
+    gevent'te her istek yeni bir greenlet olduğundan bağlantı en dıştaki
+    close()'da kapatılır; aksi halde her greenlet bir bağlantı bırakırdı.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path, on_connect=None):
+        super().__init__()
+        self.path = path
+        self.on_connect = on_connect
+        self.local = threading.local()
+        self.connections = {}
+        # Başka thread'den gelen iadeler (GC finalizer'ı): sahip thread -> bekleyen iade sayısı
+        self.deferred_releases = {}
+        self.connections_lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.on_connect:
+            self.on_connect(conn)
+        self.count('connections_opened')
+        with self.connections_lock:
+            self.connections[threading.get_ident()] = conn
+        return conn
+
+    def acquire(self):
+        self._apply_deferred_releases()
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self.local.conn = conn
+            self.local.depth = 0
+            self.local.last_used = time.time()
+        elif self.local.depth == 0 and time.time() - self.local.last_used > HEALTH_CHECK_INTERVAL:
+            try:
+                conn.execute('SELECT 1')
+            except sqlite3.Error:
+                self.count('health_check_failures')
+                conn = self._connect()
+                self.local.conn = conn
+
+        self.local.depth += 1
+        self.count('checkouts')
+        return PooledConnection(self, conn)
+
+    def release(self, conn, owner=None):
+        if owner is not None and owner != threading.get_ident():
+            # Başka thread'in derinliğini değiştirip onun transaction'ını geri almamak
+            # için iade sahip thread'in bir sonraki checkout'una ertelenir
+            with self.connections_lock:
+                self.deferred_releases[owner] = self.deferred_releases.get(owner, 0) + 1
+            return
+        self._release(conn, 1)
+
+    def _apply_deferred_releases(self):
+        with self.connections_lock:
+            count = self.deferred_releases.pop(threading.get_ident(), 0)
+        conn = getattr(self.local, 'conn', None)
+        if count and conn is not None:
+            self._release(conn, count)
+
+    def _release(self, conn, count):
+        self.local.depth = max(0, self.local.depth - count)
+        self.local.last_used = time.time()
+        if self.local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+        if self.local.depth == 0 and GEVENT_PATCHED:
+            self.local.conn = None
+            with self.connections_lock:
+                self.connections.pop(threading.get_ident(), None)
+            conn.close()
+
+    def get_stats(self):
+        stats = super().get_stats()
+        alive = {thread.ident for thread in threading.enumerate()}
+        with self.connections_lock:
+            # Sonlanmış thread'lerin bağlantılarını kapat
+            for ident in [ident for ident in self.connections if ident not in alive]:
+                self.connections.pop(ident).close()
+            for ident in [ident for ident in self.deferred_releases if ident not in alive]:
+                del self.deferred_releases[ident]
+            size = len(self.connections)
+        stats.update({
+            'size': size,
+            'path': self.path
+        })
+        return stats
@@ -0,0 +1,158 @@
+"""
+SQL dialect'i ve önceden derlenmiş sorgular
+Dialect process başında bir kez belirlenir (RENDER varsa PostgreSQL, yoksa
+SQLite). Model sorguları {p}, {true}, {false} işaretleriyle şablon olarak
+kaydedilir ve dialect'e göre bir kez derlenir; çağrı başına f-string ve
+ortam değişkeni okuması yapılmaz.
+
+PostgreSQL'de en sık çalışan sorgular bağlantı başına bir kez PREPARE edilir
+ve sonraki çağrılarda EXECUTE ile planlama maliyeti atlanır.
+"""
+import os
+import threading
+import weakref
+
+try:
+    from psycopg2 import errors as pg_errors
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+except ImportError:
+    pg_errors = None
+    TRANSACTION_STATUS_IDLE = None
+
+# Sunucu tarafı prepared statement isimleri için önek
+PREPARED_PREFIX = 'wishya_'
+
+
+def render_template(template, placeholder, true_value, false_value, numbered=False):
+    """Şablondaki {p}, {true}, {false} işaretlerini dialect değerleriyle değiştir
+
+    numbered=True ise {p} işaretleri sırayla $1, $2, ... olur (PREPARE için).
+    """
+    sql = template.replace('{true}', str(true_value)).replace('{false}', str(false_value))
+    parts = sql.split('{p}')
+    if numbered:
+        return ''.join(part + (f'${index}' if index < len(parts) else '') for index, part in enumerate(parts, 1))
+    return placeholder.join(parts)
+
+
+class Dialect:
+    """Derlenmiş sorgu deposu"""
+
+    def __init__(self, name, placeholder, true_value, false_value, supports_prepare=False):
+        self.name = name
+        self.placeholder = placeholder
+        self.true_value = true_value
+        self.false_value = false_value
+        self.supports_prepare = supports_prepare
+        self.statements = {}
+        self.prepared_sql = {}
+        # Bağlantı -> o bağlantıda PREPARE edilmiş sorgu isimleri
+        self.prepared_connections = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+        self.stats = {
+            'prepares': 0,
+            'prepared_executions': 0,
+            'reprepares': 0
+        }
+
+    @property
+    def is_postgres(self):
+        return self.name == 'postgresql'
+
+    def count(self, key, value=1):
+        with self.lock:
+            self.stats[key] += value
+
+    def boolean(self, value):
+        return self.true_value if value else self.false_value
+
+    def compile(self, template):
+        """Tek bir şablonu bu dialect için derle"""
+        return render_template(template, self.placeholder, self.true_value, self.false_value)
+
+    def register(self, templates, prepared=()):
+        """Şablonları isimleriyle derleyip kaydet
+
+        prepared: PostgreSQL'de sunucu tarafında PREPARE edilecek sorgu isimleri.
+        """
+        for name, template in templates.items():
+            self.statements[name] = self.compile(template)
+            if self.supports_prepare and name in prepared:
+                self.prepared_sql[name] = render_template(
+                    template, self.placeholder, self.true_value, self.false_value, numbered=True
+                )
+
+    def execute(self, cursor, name, params=()):
+        """Kayıtlı sorguyu çalıştır"""
+        if name in self.prepared_sql:
+            self._execute_prepared(cursor, name, tuple(params))
+        else:
+            cursor.execute(self.statements[name], params)
+
+    def execute_many(self, cursor, name, params_seq):
+        """Kayıtlı sorguyu parametre listesiyle executemany olarak çalıştır"""
+        cursor.executemany(self.statements[name], params_seq)
+
+    def _execute_prepared(self, cursor, name, params):
+        conn = cursor.connection
+        with self.lock:
+            prepared = self.prepared_connections.setdefault(conn, set())
+        # Açık transaction yoksa hata sonrası rollback sadece bu sorguyu geri alır
+        at_transaction_start = conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+
+        try:
+            self._prepare_and_execute(cursor, name, params, prepared)
+        except Exception as e:
+            if pg_errors is None or not isinstance(e, (pg_errors.InvalidSqlStatementName,
+                                                       pg_errors.DuplicatePreparedStatement)):
+                raise
+            if not at_transaction_start:
+                # Rollback çağıranın önceki yazmalarını da silerdi; transaction zaten
+                # iptal olduğu için hata çağırana iletilir. Önbellek bu sorgu için
+                # düzeltilir, bir sonraki çağrı doğru yoldan gider.
+                if isinstance(e, pg_errors.InvalidSqlStatementName):
+                    prepared.discard(name)
+                else:
+                    prepared.add(name)
+                raise
+            # Bağlantıdaki gerçek durumla senkronize ol ve bir kez daha dene
+            conn.rollback()
+            cursor.execute('SELECT name FROM pg_prepared_statements')
+            existing = {row[0] for row in cursor.fetchall()}
+            prepared.clear()
+            prepared.update(
+                statement for statement in self.prepared_sql
+                if PREPARED_PREFIX + statement in existing
+            )
+            self.count('reprepares')
+            self._prepare_and_execute(cursor, name, params, prepared)
+
+    def _prepare_and_execute(self, cursor, name, params, prepared):
+        statement = PREPARED_PREFIX + name
+        if name not in prepared:
+            cursor.execute(f'PREPARE {statement} AS {self.prepared_sql[name]}')
+            prepared.add(name)
+            self.count('prepares')
+
+        if params:
+            cursor.execute(f'EXECUTE {statement} ({", ".join(["%s"] * len(params))})', params)
+        else:
+            cursor.execute(f'EXECUTE {statement}')
+        self.count('prepared_executions')
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            'dialect': self.name,
+            'statements': len(self.statements),
+            'prepared_statements': len(self.prepared_sql)
+        }
+
+
+def resolve_dialect():
+    """Ortama göre dialect'i belirle (RENDER: PostgreSQL, değilse SQLite)"""
+    if os.environ.get('RENDER'):
+        return Dialect('postgresql', '%s', True, False, supports_prepare=True)
+    return Dialect('sqlite', '?', 1, 0)
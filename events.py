@@ -0,0 +1,75 @@
+"""
+Process içi yayın/abonelik (pub/sub)
+Fiyat zamanlayıcısı yeni bildirimleri ve fiyat değişimlerini buraya yayınlar,
+/events SSE endpoint'i her kullanıcı bağlantısı için bir kuyruğa abone olur.
+"""
+import json
+import queue
+import threading
+from collections import defaultdict
+
+SUBSCRIBER_QUEUE_SIZE = 100  # Yavaş istemciler için kuyruk sınırı; dolarsa olay atlanır
+
+
+class EventBus:
+    """Kullanıcı bazlı olay dağıtıcısı"""
+
+    def __init__(self):
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'dropped': 0
+        }
+
+    def subscribe(self, user_id):
+        """Kullanıcı için yeni bir olay kuyruğu aç"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.lock:
+            self.subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        """Kuyruğu kapat"""
+        with self.lock:
+            user_subscribers = self.subscribers.get(user_id)
+            if user_subscribers is None:
+                return
+            user_subscribers.discard(subscriber)
+            if not user_subscribers:
+                del self.subscribers[user_id]
+
+    def publish(self, user_id, event, data):
+        """Kullanıcının tüm açık bağlantılarına olay gönder"""
+        with self.lock:
+            user_subscribers = list(self.subscribers.get(user_id, ()))
+            self.stats['published'] += 1
+
+        for subscriber in user_subscribers:
+            try:
+                subscriber.put_nowait((event, data))
+                self.stats['delivered'] += 1
+            except queue.Full:
+                self.stats['dropped'] += 1
+
+        return len(user_subscribers)
+
+    def get_stats(self):
+        """Abone ve olay sayılarını döndür"""
+        with self.lock:
+            connections = sum(len(subscribers) for subscribers in self.subscribers.values())
+            users = len(self.subscribers)
+        return {
+            **self.stats,
+            'connections': connections,
+            'users': users
+        }
+
+
+def format_sse(event, data):
+    """Olayı text/event-stream formatına çevir"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+event_bus = EventBus()
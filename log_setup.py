@@ -0,0 +1,184 @@
+"""
+Seviyeli ve asenkron loglama
+Log kayıtları istek/scraping thread'inde sadece bir kuyruğa konur
+(QueueHandler); konsola ve boyutla döndürülen dosyaya yazma işini ayrı bir
+QueueListener thread'i yapar. Aynı satırdan gelen sık DEBUG/INFO kayıtları
+örneklenir.
+
+Ortam değişkenleri:
+    LOG_LEVEL                  Uygulama logger'larının (wishya.*) seviyesi; RENDER'da varsayılan INFO, lokalde DEBUG
+    LOG_LEVELS                 Logger bazında seviye: "wishya.scraper=INFO,urllib3=WARNING,root=INFO"
+    LOG_FORMAT                 "text" (varsayılan) veya "json"
+    LOG_FILE                   Dosya yolu (varsayılan scraping.log, boşsa dosyaya yazılmaz)
+    LOG_FILE_MAX_BYTES         Döndürme boyutu (varsayılan 5 MB)
+    LOG_FILE_BACKUP_COUNT      Saklanan eski dosya sayısı (varsayılan 3)
+    LOG_SAMPLE_BURST           Aynı satırdan pencere başına geçen kayıt (varsayılan 20, 0 kapalı)
+    LOG_SAMPLE_INTERVAL        Örnekleme penceresi, saniye (varsayılan 10)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+APP_LOGGER = 'wishya'
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO' if os.environ.get('RENDER') else 'DEBUG').upper()
+LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_FILE = os.environ.get('LOG_FILE', 'scraping.log')
+LOG_FILE_MAX_BYTES = int(os.environ.get('LOG_FILE_MAX_BYTES', 5 * 1024 * 1024))
+LOG_FILE_BACKUP_COUNT = int(os.environ.get('LOG_FILE_BACKUP_COUNT', 3))
+LOG_SAMPLE_BURST = int(os.environ.get('LOG_SAMPLE_BURST', 20))
+LOG_SAMPLE_INTERVAL = float(os.environ.get('LOG_SAMPLE_INTERVAL', 10))
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+# LogRecord'un standart alanları; json çıktısında bunların dışındakiler extra sayılır
+STANDARD_ATTRIBUTES = set(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
+
+class SamplingFilter(logging.Filter):
+    """Aynı çağrı noktasından (dosya, satır) gelen kayıtları örnekle
+
+    Her pencerede ilk `burst` kayıt geçer, kalanı atılır. Pencere dolunca
+    geçen ilk kayda atlanan kayıt sayısı eklenir. WARNING ve üstü hiç
+    örneklenmez.
+    """
+
+    def __init__(self, burst=LOG_SAMPLE_BURST, interval=LOG_SAMPLE_INTERVAL):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.sites = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if self.burst <= 0 or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            window_start, passed, dropped = self.sites.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                if dropped:
+                    record.msg = f'{record.msg} ({dropped} benzer kayıt atlandı)'
+                window_start, passed, dropped = now, 0, 0
+            if passed < self.burst:
+                self.sites[key] = (window_start, passed + 1, dropped)
+                return True
+            self.sites[key] = (window_start, passed, dropped + 1)
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satır JSON; extra={'domain': ...} gibi alanlar da yazılır"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def parse_levels(spec):
+    """"a=DEBUG,b=WARNING" -> {'a': 'DEBUG', 'b': 'WARNING'}"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def build_handlers():
+    formatter = JsonFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_in_child():
+    # Listener thread'i fork'tan sonra çocuk process'e geçmez (gunicorn --preload)
+    if _queue_handler is not None:
+        _start_listener()
+
+
+def stop_logging():
+    """Kuyruktaki kayıtları yaz ve listener'ı durdur"""
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            # gevent worker'ında hub kapandıktan sonra listener greenlet'i çalışamaz;
+            # kuyrukta kalan kayıtlar bu thread'de yazılır
+            _drain_listener(_listener)
+        _listener = None
+
+
+def _drain_listener(listener):
+    while True:
+        try:
+            record = listener.dequeue(False)
+        except queue.Empty:
+            return
+        if record is listener._sentinel:
+            return
+        listener.handle(record)
+
+
+def setup_logging():
+    """Kök logger'ı kuyruk üzerinden yazacak şekilde ayarla (idempotent)"""
+    global _queue_handler
+    with _setup_lock:
+        if _queue_handler is not None:
+            return
+
+        _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        # Üçüncü parti kütüphaneler INFO'da kalır; DEBUG sadece uygulama logger'larında açılır
+        root.setLevel(logging.INFO)
+        logging.getLogger(APP_LOGGER).setLevel(LOG_LEVEL)
+        for name, level in parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _start_listener()
+        atexit.register(stop_logging)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
@@ -0,0 +1,279 @@
+"""
+Scraping pipeline gecikme ölçümleri ve Prometheus metin formatı
+Her aşama (browser başlatma, sayfaya gitme, bekleme, extract_* adımları,
+retry denemeleri) span(domain, stage) ile sarılır; süreler domain ve aşama
+bazında sabit kovalı histogramlara yazılır. Kovalar kümülatif tutulmaz,
+dışa aktarırken toplanır.
+
+Kullanım:
+    with span(domain, 'navigate'):
+        await navigate_to_product_page(page, url)
+
+    counters.inc('cache_lookups', cache='scrape', result='hit')
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# Saniye cinsinden kova üst sınırları (son kova +Inf)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+# İstek başına sorgu sayısı kovaları
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+# Domain sayısı kullanıcı URL'lerinden gelir; sınırsız büyümesin
+MAX_METRIC_DOMAINS = 200
+OTHER_DOMAIN = 'other'
+
+
+class Histogram:
+    """Sabit kovalı gecikme histogramı"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value, error=False):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            if error:
+                self.errors += 1
+
+    def quantile(self, q):
+        """Kovalardan doğrusal interpolasyonla yaklaşık yüzdelik değeri"""
+        with self.lock:
+            counts = list(self.counts)
+            total = self.count
+            minimum, maximum = self.min, self.max
+        if not total:
+            return None
+
+        target = q * total
+        seen = 0
+        lower = 0.0
+        for i, count in enumerate(counts):
+            upper = self.buckets[i] if i < len(self.buckets) else maximum
+            if count and seen + count >= target:
+                value = lower + (upper - lower) * (target - seen) / count
+                # Kova sınırları gözlenen aralığın dışına taşmasın
+                return round(min(max(value, minimum), maximum), 4)
+            seen += count
+            lower = upper
+        return maximum
+
+    def cumulative_buckets(self):
+        """[(üst sınır, kümülatif sayı), ...] - son eleman '+Inf'"""
+        with self.lock:
+            counts = list(self.counts)
+        cumulative = []
+        running = 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], counts):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative
+
+    def snapshot(self):
+        with self.lock:
+            count, total, minimum, maximum, errors = self.count, self.sum, self.min, self.max, self.errors
+        return {
+            'count': count,
+            'errors': errors,
+            'total_seconds': round(total, 3),
+            'mean': round(total / count, 4) if count else None,
+            'min': round(minimum, 4) if minimum is not None else None,
+            'max': round(maximum, 4) if maximum is not None else None,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+
+class StageMetrics:
+    """(domain, aşama) -> Histogram kaydı
+
+    HTTP istekleri için aynı yapı (route, method) anahtarıyla kullanılır.
+    """
+
+    def __init__(self, max_domains=MAX_METRIC_DOMAINS, buckets=LATENCY_BUCKETS):
+        self.max_domains = max_domains
+        self.buckets = buckets
+        self.histograms = {}
+        self.domains = set()
+        self.lock = threading.Lock()
+
+    def histogram(self, domain, stage):
+        domain = domain or OTHER_DOMAIN
+        key = (domain, stage)
+        histogram = self.histograms.get(key)
+        if histogram is not None:
+            return histogram
+        with self.lock:
+            if domain not in self.domains:
+                if len(self.domains) >= self.max_domains:
+                    domain = OTHER_DOMAIN
+                    key = (domain, stage)
+                self.domains.add(domain)
+            return self.histograms.setdefault(key, Histogram(self.buckets))
+
+    def observe(self, domain, stage, seconds, error=False):
+        self.histogram(domain, stage).observe(seconds, error)
+
+    def items(self):
+        with self.lock:
+            return sorted(self.histograms.items())
+
+    def get_stats(self):
+        """{domain: {aşama: özet}}; aşamalar toplam süreye göre azalan sırada"""
+        stats = {}
+        for (domain, stage), histogram in self.items():
+            stats.setdefault(domain, {})[stage] = histogram.snapshot()
+        return {
+            domain: dict(sorted(stages.items(), key=lambda item: item[1]['total_seconds'], reverse=True))
+            for domain, stages in stats.items()
+        }
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.domains = set()
+
+
+class Counters:
+    """Etiketli sayaçlar; dec() ile gauge olarak da kullanılır"""
+
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, name, amount=1, **labels):
+        self.inc(name, -amount, **labels)
+
+    def family(self, name):
+        """İsmin [(etiketler, değer), ...] listesi"""
+        with self.lock:
+            family = sorted((labels, value) for (key, labels), value in self.values.items() if key == name)
+        return [(dict(labels), value) for labels, value in family]
+
+    def reset(self):
+        with self.lock:
+            self.values = {}
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    if value is None:
+        return 'NaN'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class PrometheusWriter:
+    """Prometheus text exposition (0.0.4) çıktısı oluşturur
+
+    Aynı metriğin örnekleri art arda yazılmalıdır; declare() her metrik
+    için HELP/TYPE satırlarını bir kez ekler.
+    """
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, prefix='wishya_'):
+        self.prefix = prefix
+        self.lines = []
+        self.declared = set()
+
+    def declare(self, name, kind, help_text):
+        name = self.prefix + name
+        if name not in self.declared:
+            self.declared.add(name)
+            self.lines.append(f'# HELP {name} {help_text}')
+            self.lines.append(f'# TYPE {name} {kind}')
+        return name
+
+    def sample(self, name, value, labels=None):
+        name = self.prefix + name
+        if labels:
+            label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+            name = f'{name}{{{label_text}}}'
+        self.lines.append(f'{name} {format_value(value)}')
+
+    def metric(self, name, kind, help_text, value, labels=None):
+        """Tek örnekli metrik"""
+        self.declare(name, kind, help_text)
+        self.sample(name, value, labels)
+
+    def histogram(self, name, histogram, labels=None):
+        """Histogramı _bucket/_sum/_count örnekleri olarak yaz (declare ayrıca çağrılmalı)"""
+        labels = labels or {}
+        for bound, count in histogram.cumulative_buckets():
+            self.sample(f'{name}_bucket', count, {**labels, 'le': bound})
+        with histogram.lock:
+            total, count = histogram.sum, histogram.count
+        self.sample(f'{name}_sum', total, labels)
+        self.sample(f'{name}_count', count, labels)
+
+    def stage_histograms(self, name, help_text, metrics, key_labels):
+        """StageMetrics kaydındaki tüm histogramları tek metrik ailesi olarak yaz"""
+        self.declare(name, 'histogram', help_text)
+        for key, histogram in metrics.items():
+            self.histogram(name, histogram, dict(zip(key_labels, key)))
+
+    def counter_family(self, name, kind, help_text, counters):
+        """Counters kaydındaki bir ismin tüm etiket kombinasyonlarını yaz"""
+        family = counters.family(name)
+        if not family:
+            return
+        self.declare(name, kind, help_text)
+        for labels, value in family:
+            self.sample(name, value, labels)
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+scrape_metrics = StageMetrics()
+http_metrics = StageMetrics()
+query_count_histogram = Histogram(QUERY_COUNT_BUCKETS)
+counters = Counters()
+
+
+@contextmanager
+def span(domain, stage, metrics=scrape_metrics):
+    """Bloğun süresini (domain, stage) histogramına yaz; hata olsa da ölçülür
+
+    Senkron ve async fonksiyonların içinde aynı şekilde kullanılır.
+    """
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        metrics.observe(domain, stage, time.perf_counter() - started, error)
@@ -0,0 +1,282 @@
+"""
+Versiyonlu şema migration'ları
+Uygulanan her migration schema_migrations tablosuna yazılır; run_migrations()
+sadece henüz uygulanmamış sürümleri çalıştırır. Sıcak sorgu yollarının
+index'leri burada tanımlanır ve explain_hot_queries() ile planlarda
+kullanıldıkları doğrulanır.
+
+Kullanım:
+    python migrations.py            # bekleyen migration'ları uygula
+    python migrations.py --check    # uygula ve EXPLAIN ile index kullanımını doğrula
+"""
+import sys
+import threading
+
+from models import (
+    DIALECT, get_db_connection, get_placeholder, get_boolean_value, create_tables, add_missing_columns,
+    create_catalog_tables, upsert_catalog_items, canonical_url, is_catalog_url
+)
+
+# Aynı anda açılan birden fazla worker'ın migration'ları paralel çalıştırmasını engeller
+MIGRATION_LOCK_ID = 72451
+
+SCHEMA_MIGRATIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# (index adı, tablo, kolonlar) - sıcak sorgu yolları için
+HOT_PATH_INDEXES = (
+    # Dashboard: products WHERE user_id ORDER BY created_at DESC
+    ('idx_products_user_created', 'products', 'user_id, created_at, id'),
+    # Profil: collections WHERE user_id ORDER BY created_at DESC
+    ('idx_collections_user_created', 'collections', 'user_id, created_at'),
+    # Ürün silme ve ürünün koleksiyonları: collection_products WHERE product_id
+    ('idx_collection_products_product', 'collection_products', 'product_id'),
+    # Koleksiyon sayfası: collection_products WHERE collection_id ORDER BY added_at DESC, product_id DESC
+    ('idx_collection_products_added', 'collection_products', 'collection_id, added_at, product_id'),
+    # Fiyat takip sayfası: price_tracking WHERE user_id ORDER BY created_at DESC
+    ('idx_price_tracking_user_created', 'price_tracking', 'user_id, created_at'),
+    # Takip durumu: price_tracking WHERE product_id AND user_id
+    ('idx_price_tracking_product_user', 'price_tracking', 'product_id, user_id'),
+    # Bildirimler: notifications WHERE user_id AND is_read ORDER BY created_at
+    ('idx_notifications_user_read_created', 'notifications', 'user_id, is_read, created_at'),
+)
+
+
+def migration_base_tables(cursor):
+    create_tables(cursor)
+
+
+def migration_hot_path_indexes(cursor):
+    for name, table, columns in HOT_PATH_INDEXES:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+
+def migration_catalog_items(cursor):
+    create_catalog_tables(cursor)
+    backfill_catalog_items(cursor)
+
+
+def backfill_catalog_items(cursor):
+    """Mevcut ürünleri canonical URL'ye göre kataloğa bağla ve fiyat durumunu taşı
+    
+    Aynı URL'nin en yeni kaydı katalog alanlarını belirler. Takip kayıtlarındaki
+    kontrol sayıları ve bir sonraki kontrol zamanı katalog satırına toplanır.
+    """
+    placeholder = get_placeholder()
+    cursor.execute('''
+        SELECT id, url, name, price, image, brand, old_price FROM products
+        WHERE catalog_item_id IS NULL
+        ORDER BY created_at DESC
+    ''')
+    products = [row for row in cursor.fetchall() if is_catalog_url(row[1])]
+    if not products:
+        return
+    
+    catalog_ids = upsert_catalog_items(cursor, [row[1:] for row in products])
+    cursor.executemany(
+        f'UPDATE products SET catalog_item_id = {placeholder} WHERE id = {placeholder}',
+        [(catalog_ids[canonical_url(row[1])], row[0]) for row in products]
+    )
+    
+    tracked = '''
+        FROM price_tracking pt JOIN products p ON pt.product_id = p.id
+        WHERE p.catalog_item_id = catalog_items.id
+    '''
+    cursor.execute(f'''
+        UPDATE catalog_items SET
+            current_price = (SELECT pt.current_price {tracked} ORDER BY pt.last_checked DESC LIMIT 1),
+            last_checked = (SELECT MAX(pt.last_checked) {tracked}),
+            next_check_at = (SELECT MIN(pt.next_check_at) {tracked}),
+            check_count = COALESCE((SELECT MAX(pt.check_count) {tracked}), 0),
+            change_count = COALESCE((SELECT MAX(pt.change_count) {tracked}), 0)
+    ''')
+    print(f"[DEBUG] {len(products)} ürün {len(catalog_ids)} katalog ürününe bağlandı")
+
+
+def migration_catalog_fingerprint(cursor):
+    # Boş parmak izi ilk kontrolde yazılır; o zamana kadar her kontrol değişmiş sayılır
+    add_missing_columns(cursor, 'catalog_items', [
+        ('content_fingerprint', 'VARCHAR(32)' if DIALECT.is_postgres else 'TEXT'),
+    ])
+
+
+# (sürüm, açıklama, fonksiyon) - sürümler artan sırada, uygulananlar değiştirilmez
+MIGRATIONS = (
+    (1, 'Temel tablolar ve sonradan eklenen kolonlar', migration_base_tables),
+    (2, 'Sıcak sorgu yolları için index\'ler', migration_hot_path_indexes),
+    # Yeni index'ler HOT_PATH_INDEXES'e eklenir; IF NOT EXISTS sayesinde sadece eksikler oluşur
+    (3, 'Koleksiyon ürünleri keyset sayfalama index\'i', migration_hot_path_indexes),
+    (4, 'Canonical URL ile paylaşılan ürün kataloğu', migration_catalog_items),
+    (5, 'Katalog içerik parmak izi', migration_catalog_fingerprint),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def get_schema_version(cursor):
+    """Uygulanmış en yüksek migration sürümünü döndür (tablo yoksa 0)"""
+    cursor.execute(SCHEMA_MIGRATIONS_TABLE)
+    cursor.execute('SELECT MAX(version) FROM schema_migrations')
+    row = cursor.fetchone()
+    return row[0] or 0
+
+
+def read_schema_version():
+    """Şema sürümünü DDL çalıştırmadan oku (tablo yoksa 0)"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT MAX(version) FROM schema_migrations')
+        row = cursor.fetchone()
+        return row[0] or 0
+    except Exception:
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
+
+def ensure_schema():
+    """Şema sürümünü process başına bir kez kontrol et, eskiyse migration'ları uygula
+
+    Güncel bir veritabanında maliyeti tek bir SELECT'tir; sonraki çağrılar
+    sadece bayrağa bakar.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        version = read_schema_version()
+        if version < LATEST_VERSION:
+            print(f"[DEBUG] Şema sürümü {version}, güncel sürüm {LATEST_VERSION}; migration'lar uygulanıyor")
+            run_migrations()
+        _schema_ready = True
+
+
+def run_migrations():
+    """Bekleyen migration'ları sırayla uygula, güncel sürümü döndür"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        placeholder = get_placeholder()
+
+        if DIALECT.is_postgres:
+            # Transaction sonuna kadar diğer worker'lar burada bekler
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+        else:
+            if conn.raw.in_transaction:
+                conn.commit()
+            # Yazma kilidini baştan al; diğer process'ler busy_timeout kadar bekler
+            cursor.execute('BEGIN IMMEDIATE')
+
+        version = get_schema_version(cursor)
+        pending = [migration for migration in MIGRATIONS if migration[0] > version]
+        if not pending:
+            conn.commit()
+            return version
+
+        for migration_version, description, migrate in pending:
+            print(f"[DEBUG] Migration {migration_version} uygulanıyor: {description}")
+            migrate(cursor)
+            cursor.execute(
+                f'INSERT INTO schema_migrations (version, description) VALUES ({placeholder}, {placeholder})',
+                (migration_version, description)
+            )
+            version = migration_version
+
+        conn.commit()
+        print(f"[DEBUG] Şema sürümü: {version}")
+        return version
+    except Exception as e:
+        conn.rollback()
+        print(f"[HATA] Migration hatası: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+def hot_queries():
+    """(isim, sorgu, parametreler, beklenen index) listesi"""
+    placeholder = get_placeholder()
+    return [
+        ('user_products',
+         f'SELECT * FROM products WHERE user_id = {placeholder} ORDER BY created_at DESC',
+         ('',), 'idx_products_user_created'),
+        ('user_products_page',
+         f'SELECT * FROM products WHERE user_id = {placeholder} AND (created_at, id) < ({placeholder}, {placeholder}) '
+         f'ORDER BY created_at DESC, id DESC LIMIT 49',
+         ('', '', ''), 'idx_products_user_created'),
+        ('user_collections',
+         f'SELECT * FROM collections WHERE user_id = {placeholder} ORDER BY created_at DESC',
+         ('',), 'idx_collections_user_created'),
+        ('product_collections',
+         f'SELECT collection_id FROM collection_products WHERE product_id = {placeholder}',
+         ('',), 'idx_collection_products_product'),
+        ('collection_products_page',
+         f'SELECT product_id FROM collection_products WHERE collection_id = {placeholder} ORDER BY added_at DESC, product_id DESC',
+         ('',), 'idx_collection_products_added'),
+        ('user_trackings',
+         f'SELECT * FROM price_tracking WHERE user_id = {placeholder} ORDER BY created_at DESC',
+         ('',), 'idx_price_tracking_user_created'),
+        ('product_tracking',
+         f'SELECT * FROM price_tracking WHERE product_id = {placeholder} AND user_id = {placeholder}',
+         ('', ''), 'idx_price_tracking_product_user'),
+        ('catalog_fanout',
+         f'SELECT id FROM products WHERE catalog_item_id = {placeholder}',
+         ('',), 'idx_products_catalog_item'),
+        ('unread_notifications',
+         f'SELECT COUNT(*) FROM notifications WHERE user_id = {placeholder} AND is_read = {get_boolean_value(False)}',
+         ('',), 'idx_notifications_user_read_created'),
+    ]
+
+
+def explain_hot_queries():
+    """Sıcak sorguların planlarını çıkar ve beklenen index'in kullanılıp kullanılmadığını döndür"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        if DIALECT.is_postgres:
+            # Küçük tablolarda planner seq scan seçer; index'in kullanılabilir olduğunu görmek için kapat
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            explain = 'EXPLAIN'
+            detail_column = 0
+        else:
+            explain = 'EXPLAIN QUERY PLAN'
+            detail_column = 3
+
+        results = []
+        for name, query, params, index in hot_queries():
+            cursor.execute(f'{explain} {query}', params)
+            plan = '\n'.join(str(row[detail_column]) for row in cursor.fetchall())
+            results.append({
+                'name': name,
+                'index': index,
+                'used': index in plan,
+                'plan': plan
+            })
+        conn.rollback()
+        return results
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    run_migrations()
+    if '--check' in sys.argv:
+        failed = False
+        for result in explain_hot_queries():
+            status = 'OK' if result['used'] else 'INDEX KULLANILMIYOR'
+            print(f"{result['name']}: {status} ({result['index']})")
+            print('    ' + result['plan'].replace('\n', '\n    '))
+            failed = failed or not result['used']
+        sys.exit(1 if failed else 0)
@@ -1,10 +1,21 @@
+import base64
+import json
+import logging
 import sqlite3
+import threading
 import uuid
-from datetime import datetime
+from collections import namedtuple
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from werkzeug.security import generate_password_hash, check_password_hash
+from flask import g, has_request_context
 from flask_login import UserMixin
 import os
 
+from db_pool import PostgresConnectionPool, SQLiteConnectionPool, apply_sqlite_production_profile
+from dialect import resolve_dialect
+from metrics import counters
+
 # PostgreSQL için import
 try:
     import psycopg2
@@ -14,47 +25,113 @@ except ImportError:
     PSYCOPG2_AVAILABLE = False
     print("[UYARI] psycopg2 modülü bulunamadı, PostgreSQL desteği devre dışı")
 
-def get_db_connection():
-    """Database bağlantısı - Render PostgreSQL veya local SQLite"""
-    # Render ortamında PostgreSQL kullan
-    if os.environ.get('RENDER'):
-        database_url = os.environ.get('DATABASE_URL')
-        if database_url and PSYCOPG2_AVAILABLE:
-            print(f"[DEBUG] Render ortamında PostgreSQL kullanılıyor")
+# Bağlantı havuzu ayarları (MIN_SIZE aynı zamanda boşta tutulan bağlantı sayısıdır)
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 5))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+SQLITE_DB_PATH = os.environ.get('SQLITE_DB_PATH', 'wishya.db')
+# 'production': WAL, synchronous=NORMAL, mmap, cache, busy_timeout ve foreign key kontrolü
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+
+_pool = None
+_pool_lock = threading.Lock()
+
+logger = logging.getLogger('wishya.db')
+
+# Process başında bir kez belirlenir; sorgular aşağıda bu dialect için derlenir
+DIALECT = resolve_dialect()
+
+def get_pool():
+    """Process'e ait bağlantı havuzunu döndür, yoksa oluştur
+    
+    gunicorn --preload ile fork edilen worker'lar master'ın bağlantılarını
+    paylaşmamalı; pid değiştiyse yeni havuz açılır.
+    """
+    global _pool
+    if _pool is not None and _pool.pid == os.getpid():
+        return _pool
+    
+    with _pool_lock:
+        if _pool is not None and _pool.pid == os.getpid():
+            return _pool
+        
+        # Render ortamında PostgreSQL kullan
+        if DIALECT.is_postgres:
+            database_url = os.environ.get('DATABASE_URL')
+            if not database_url or not PSYCOPG2_AVAILABLE:
+                print(f"[HATA] Render ortamında DATABASE_URL veya psycopg2 bulunamadı")
+                raise Exception("Render ortamında PostgreSQL gerekli")
             
             # postgres:// -> postgresql:// dönüşümü
             if database_url.startswith('postgres://'):
                 database_url = database_url.replace('postgres://', 'postgresql://', 1)
-                print(f"[DEBUG] URL güncellendi: postgresql://")
             
             try:
-                conn = psycopg2.connect(database_url)
-                print(f"[DEBUG] PostgreSQL bağlantısı başarılı")
-                return conn
+                _pool = PostgresConnectionPool(database_url, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT)
             except Exception as e:
                 print(f"[HATA] PostgreSQL bağlantı hatası: {e}")
-                raise e
+                raise
+            logger.debug("PostgreSQL bağlantı havuzu oluşturuldu (max %s)", DB_POOL_MAX_SIZE)
         else:
-            print(f"[HATA] Render ortamında DATABASE_URL veya psycopg2 bulunamadı")
-            raise Exception("Render ortamında PostgreSQL gerekli")
-    else:
-        # Local ortamda SQLite kullan
-        print(f"[DEBUG] Local ortamda SQLite kullanılıyor")
-        return sqlite3.connect('wishya.db')
+            # Local ortamda SQLite kullan
+            on_connect = apply_sqlite_production_profile if SQLITE_PROFILE == 'production' else None
+            _pool = SQLiteConnectionPool(SQLITE_DB_PATH, on_connect)
+            logger.debug("SQLite bağlantı havuzu oluşturuldu: %s (profil: %s)", SQLITE_DB_PATH, SQLITE_PROFILE)
+        
+        return _pool
 
-def init_db():
-    """Database tablolarını oluştur"""
-    try:
-        print(f"[DEBUG] init_db başladı, RENDER: {os.environ.get('RENDER')}")
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        print(f"[DEBUG] Database bağlantısı başarılı")
-    except Exception as e:
-        print(f"[HATA] Database bağlantı hatası: {e}")
-        raise
+def get_db_connection():
+    """Havuzdan database bağlantısı al - Render PostgreSQL veya local SQLite
     
+    close() bağlantıyı havuza iade eder. Context manager olarak da kullanılabilir.
+    """
+    return get_pool().acquire()
+
+# Keyset sayfalama: sayfa boyutu ve istemcinin isteyebileceği üst sınır
+PRODUCT_PAGE_SIZE = 48
+MAX_PAGE_SIZE = 200
+
+# Toplu yazmalarda tek multi-row INSERT'e konan satır sayısı
+# (eski SQLite sürümlerinin 999 parametre sınırının altında kalır)
+BATCH_WRITE_SIZE = 100
+
+def chunked(items, size):
+    """Listeyi size uzunluğunda parçalara böl"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def encode_page_cursor(sort_value, row_id):
+    """Son satırın (sıralama değeri, id) çiftini URL güvenli imlece çevir"""
+    payload = json.dumps([str(sort_value), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_page_cursor(cursor):
+    """İmleci (sıralama değeri, id) çiftine çevir; geçersizse None"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(sort_value), str(row_id)
+    except Exception:
+        return None
+
+def get_pool_stats():
+    """Bağlantı havuzu metriklerini döndür"""
+    if _pool is None:
+        return {'backend': None, 'size': 0, 'checkouts': 0, 'waits': 0}
+    return _pool.get_stats()
+
+def init_db():
+    """Database şemasını migration runner ile güncel sürüme getir"""
+    print(f"[DEBUG] init_db başladı, RENDER: {os.environ.get('RENDER')}")
+    from migrations import run_migrations
+    run_migrations()
+
+def create_tables(cursor):
+    """Temel tabloları ve sonradan eklenen kolonları oluştur (migration 1)"""
     # Render ortamında PostgreSQL kullan
-    if os.environ.get('RENDER'):
+    if DIALECT.is_postgres:
         # PostgreSQL için tablo oluşturma
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -117,6 +194,10 @@ def init_db():
                 alert_price DECIMAL(10,2),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                next_check_at TIMESTAMP,
+                check_count INTEGER DEFAULT 0,
+                change_count INTEGER DEFAULT 0,
+                previous_price DECIMAL(10,2),
                 FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
                 FOREIGN KEY (product_id) REFERENCES products (id) ON DELETE CASCADE
             )
@@ -131,6 +212,7 @@ def init_db():
                 type VARCHAR(50) DEFAULT 'info',
                 is_read BOOLEAN DEFAULT FALSE,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                dedup_key VARCHAR(255),
                 FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
             )
         ''')
@@ -198,6 +280,10 @@ def init_db():
                 alert_price REAL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                next_check_at TIMESTAMP,
+                check_count INTEGER DEFAULT 0,
+                change_count INTEGER DEFAULT 0,
+                previous_price REAL,
                 FOREIGN KEY (user_id) REFERENCES users (id),
                 FOREIGN KEY (product_id) REFERENCES products (id)
             )
@@ -212,73 +298,538 @@ def init_db():
                 type TEXT DEFAULT 'info',
                 is_read BOOLEAN DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                dedup_key TEXT,
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
     
-    conn.commit()
-    conn.close()
-    print(f"[DEBUG] Database tabloları başarıyla oluşturuldu")
+    # Sonradan eklenen kolonlar (mevcut veritabanları için)
+    add_missing_columns(cursor, 'price_tracking', [
+        ('next_check_at', 'TIMESTAMP'),
+        ('check_count', 'INTEGER DEFAULT 0'),
+        ('change_count', 'INTEGER DEFAULT 0'),
+        ('previous_price', 'DECIMAL(10,2)' if DIALECT.is_postgres else 'REAL'),
+    ])
+    add_missing_columns(cursor, 'notifications', [
+        ('dedup_key', 'VARCHAR(255)' if DIALECT.is_postgres else 'TEXT'),
+    ])
+    # Aynı alarm için tekrar bildirim üretilmesini engelle
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_dedup_key ON notifications (dedup_key)')
+
+def create_catalog_tables(cursor):
+    """Canonical URL ile anahtarlanan paylaşılan ürün kataloğunu oluştur (migration 4)
+    
+    Scrape edilen alanlar ve fiyat durumu (kontrol sayıları, bir sonraki kontrol)
+    katalogda tutulur; products.catalog_item_id kullanıcı ürününü kataloğa bağlar.
+    """
+    if DIALECT.is_postgres:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS catalog_items (
+                id VARCHAR(255) PRIMARY KEY,
+                canonical_url TEXT UNIQUE NOT NULL,
+                url TEXT NOT NULL,
+                name TEXT,
+                price VARCHAR(255),
+                image TEXT,
+                brand VARCHAR(255),
+                old_price VARCHAR(255),
+                current_price DECIMAL(10,2),
+                last_checked TIMESTAMP,
+                next_check_at TIMESTAMP,
+                check_count INTEGER DEFAULT 0,
+                change_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        catalog_reference = 'VARCHAR(255) REFERENCES catalog_items (id) ON DELETE SET NULL'
+    else:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS catalog_items (
+                id TEXT PRIMARY KEY,
+                canonical_url TEXT UNIQUE NOT NULL,
+                url TEXT NOT NULL,
+                name TEXT,
+                price TEXT,
+                image TEXT,
+                brand TEXT,
+                old_price TEXT,
+                current_price REAL,
+                last_checked TIMESTAMP,
+                next_check_at TIMESTAMP,
+                check_count INTEGER DEFAULT 0,
+                change_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        catalog_reference = 'TEXT REFERENCES catalog_items (id)'
+    
+    add_missing_columns(cursor, 'products', [('catalog_item_id', catalog_reference)])
+    # Fiyat sonucunun takipçilere dağıtımı: products WHERE catalog_item_id
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_catalog_item ON products (catalog_item_id)')
+
+def get_table_columns(cursor, table):
+    """Tablodaki kolon isimlerini döndür"""
+    if DIALECT.is_postgres:
+        cursor.execute(
+            'SELECT column_name FROM information_schema.columns WHERE table_name = %s',
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+def add_missing_columns(cursor, table, columns):
+    """Tabloda olmayan kolonları ALTER TABLE ile ekle"""
+    existing = get_table_columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            print(f"[DEBUG] {table}.{name} kolonu ekleniyor")
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
 
 def get_placeholder():
     """Database placeholder'ını döndür (PostgreSQL: %s, SQLite: ?)"""
-    if os.environ.get('RENDER'):
-        return '%s'  # PostgreSQL
-    else:
-        return '?'   # SQLite
+    return DIALECT.placeholder
 
 def execute_query(cursor, query, params=None):
-    """Database query'sini çalıştır"""
+    """Dinamik query'yi çalıştır (IN listeleri, toplu INSERT gibi şekli değişen sorgular)"""
     if params is None:
         params = ()
     
+    count_query()
     try:
-        if os.environ.get('RENDER'):
-            # PostgreSQL için parametreleri tuple'a çevir
-            if isinstance(params, list):
-                params = tuple(params)
-            cursor.execute(query, params)
-        else:
-            # SQLite için parametreleri olduğu gibi kullan
-            cursor.execute(query, params)
+        cursor.execute(query, tuple(params))
     except Exception as e:
         print(f"[HATA] Query çalıştırma hatası: {e}")
         print(f"[HATA] Query: {query}")
         print(f"[HATA] Params: {params}")
         raise
 
+def execute_statement(cursor, name, params=()):
+    """STATEMENTS içindeki derlenmiş sorguyu çalıştır"""
+    count_query()
+    try:
+        DIALECT.execute(cursor, name, params)
+    except Exception as e:
+        print(f"[HATA] Query çalıştırma hatası ({name}): {e}")
+        print(f"[HATA] Params: {params}")
+        raise
+
+def execute_statement_many(cursor, name, params_seq):
+    """STATEMENTS içindeki derlenmiş sorguyu birden fazla parametre satırıyla çalıştır"""
+    count_query()
+    try:
+        DIALECT.execute_many(cursor, name, params_seq)
+    except Exception as e:
+        print(f"[HATA] Toplu query çalıştırma hatası ({name}): {e}")
+        raise
+
 def get_boolean_value(value):
-    """Database için boolean değerini döndür"""
-    if os.environ.get('RENDER'):
-        # PostgreSQL için True/False
-        return True if value else False
-    else:
-        # SQLite için 1/0
-        return 1 if value else 0
+    """Database için boolean değerini döndür (PostgreSQL: True/False, SQLite: 1/0)"""
+    return DIALECT.boolean(value)
+
+# İstek kapsamlı identity map: aynı istek içinde bir satır birincil anahtarıyla
+# en fazla bir kez sorgulanır. Önbellek flask.g'de tutulur ve istekle birlikte
+# silinir; istek dışında (scheduler thread'leri) her çağrı veritabanına gider.
+_MISSING = object()
+
+def request_cache():
+    """Aktif isteğin satır önbelleğini döndür, istek dışında None"""
+    if not has_request_context():
+        return None
+    cache = g.get('_row_cache')
+    if cache is None:
+        cache = g._row_cache = {}
+    return cache
+
+def recall(kind, key):
+    """Önbellekteki satırı döndür; yoksa _MISSING (bulunamayan satırlar None olarak saklanır)"""
+    cache = request_cache()
+    if cache is None:
+        return _MISSING
+    value = cache.get((kind, key), _MISSING)
+    counters.inc('cache_lookups_total', cache='identity_map', result='miss' if value is _MISSING else 'hit')
+    return value
+
+def remember(kind, key, value):
+    """Satırı istek önbelleğine koy ve geri döndür"""
+    cache = request_cache()
+    if cache is not None:
+        cache[(kind, key)] = value
+    return value
+
+def forget(kind, key):
+    """Silinen satırı istek önbelleğinden çıkar"""
+    cache = request_cache()
+    if cache is not None:
+        cache.pop((kind, key), None)
+
+def count_query():
+    """İstek başına çalışan sorgu sayısını artır (X-DB-Query-Count başlığı için)"""
+    if has_request_context():
+        g._query_count = g.get('_query_count', 0) + 1
+
+def get_request_query_count():
+    """Aktif istekte şimdiye kadar çalışan sorgu sayısı"""
+    return g.get('_query_count', 0) if has_request_context() else 0
+
+# Katalog anahtarından atılan izleme parametreleri (utm_* önekiyle birlikte)
+TRACKING_QUERY_PARAMS = {'gclid', 'fbclid', 'msclkid', 'yclid', 'dclid', '_ga', 'ref', 'referrer'}
+
+def canonical_url(url):
+    """Aynı ürün sayfasının farklı yazımlarını tek bir katalog anahtarına indir
+    
+    Şema https'e, host küçük harfe çevrilir; www. öneki, fragment, sondaki /
+    ve izleme parametreleri atılır, kalan parametreler sıralanır.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme in ('', 'http'):
+        scheme = 'https'
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path.rstrip('/') or '/', urlencode(query), ''))
+
+def is_catalog_url(url):
+    """Scrape edilebilir ürün URL'si mi (manuel eklenen '#' ürünler kataloğa girmez)"""
+    return bool(url) and url != '#' and '://' in url
+
+def upsert_catalog_items(cursor, items):
+    """Katalog ürünlerini canonical URL'ye göre ekle/güncelle, {canonical_url: id} döndür
+    
+    items: (url, name, price, image, brand, old_price) tuple listesi. Aynı
+    canonical URL birden fazla kez geçerse ilki kullanılır. Çağıran
+    transaction'ı commit etmekten sorumludur.
+    
+    Katalogda zaten olan ürünün fiyat durumu değiştirilmez (sadece
+    PriceTracking.record_check yazar); kullanıcının scrape'i eksik görünen
+    alanları doldurur. DO UPDATE, RETURNING'in mevcut satırı da döndürmesi içindir.
+    """
+    unique = {}
+    for url, name, price, image, brand, old_price in items:
+        if is_catalog_url(url):
+            unique.setdefault(canonical_url(url), (url, name, price, image, brand, old_price))
+    if not unique:
+        return {}
+    
+    placeholder = get_placeholder()
+    row_placeholders = f"({', '.join([placeholder] * 9)})"
+    now = datetime.now()
+    catalog_ids = {}
+    for batch in chunked(list(unique.items()), BATCH_WRITE_SIZE):
+        params = []
+        for key, (url, name, price, image, brand, old_price) in batch:
+            params.extend((str(uuid.uuid4()), key, url, name, price, image, brand, old_price, now))
+        execute_query(cursor, f'''
+            INSERT INTO catalog_items (id, canonical_url, url, name, price, image, brand, old_price, updated_at)
+            VALUES {', '.join([row_placeholders] * len(batch))}
+            ON CONFLICT (canonical_url) DO UPDATE SET
+                name = COALESCE(catalog_items.name, excluded.name),
+                image = COALESCE(catalog_items.image, excluded.image),
+                brand = COALESCE(catalog_items.brand, excluded.brand),
+                updated_at = catalog_items.updated_at
+            RETURNING canonical_url, id
+        ''', params)
+        catalog_ids.update(cursor.fetchall())
+    return catalog_ids
+
+# Tablo kolonları: SELECT listeleri buradan üretilir, böylece satır tipleri fiziksel
+# kolon sırasına (ALTER TABLE ile sona eklenen kolonlar) bağlı kalmaz
+USER_COLUMNS = ('id', 'username', 'email', 'password_hash', 'created_at', 'profile_url')
+PRODUCT_COLUMNS = ('id', 'user_id', 'name', 'price', 'image', 'brand', 'url', 'created_at', 'old_price',
+                   'catalog_item_id')
+COLLECTION_COLUMNS = ('id', 'user_id', 'name', 'description', 'type', 'is_public', 'share_url', 'created_at')
+PRICE_TRACKING_COLUMNS = ('id', 'user_id', 'product_id', 'current_price', 'original_price', 'alert_price',
+                          'created_at', 'last_checked', 'next_check_at', 'check_count', 'change_count',
+                          'previous_price')
+NOTIFICATION_COLUMNS = ('id', 'user_id', 'title', 'message', 'type', 'is_read', 'created_at', 'dedup_key')
+
+def column_list(columns, alias=None):
+    """Kolon isimlerini SELECT listesine çevir (alias verilirse 'p.id, p.name, ...')"""
+    if alias:
+        return ', '.join(f'{alias}.{column}' for column in columns)
+    return ', '.join(columns)
+
+USER_SELECT = column_list(USER_COLUMNS)
+# Product satırları her zaman tracking_id ile birlikte 11 kolon gelir; takip durumu
+# yüklenmeyen sorgularda NULL seçilir ki Product._make doğrudan kullanılabilsin
+PRODUCT_SELECT = f"{column_list(PRODUCT_COLUMNS)}, NULL AS tracking_id"
+PRODUCT_SELECT_P = f"{column_list(PRODUCT_COLUMNS, 'p')}, NULL AS tracking_id"
+# Takip durumu JOIN yerine alt sorguyla okunur: (user_id, product_id) benzersiz değildir,
+# çift takip kaydı JOIN'de ürünü tekrarlar ve (created_at, id) imlecini bozardı
+PRODUCT_WITH_TRACKING_SELECT = f"""{column_list(PRODUCT_COLUMNS, 'p')}, (
+            SELECT MIN(pt.id) FROM price_tracking pt
+            WHERE pt.product_id = p.id AND pt.user_id = p.user_id
+        ) AS tracking_id"""
+COLLECTION_SELECT = column_list(COLLECTION_COLUMNS)
+PRICE_TRACKING_SELECT = column_list(PRICE_TRACKING_COLUMNS)
+NOTIFICATION_SELECT = column_list(NOTIFICATION_COLUMNS)
+
+# Model sorguları: {p} parametre, {true}/{false} boolean işaretleridir ve
+# DIALECT.register ile process başında bir kez derlenir
+STATEMENTS = {
+    # Kullanıcı
+    'load_user': f'SELECT {USER_SELECT} FROM users WHERE id = {{p}}',
+    'user_by_username': f'SELECT {USER_SELECT} FROM users WHERE username = {{p}}',
+    'user_by_email': f'SELECT {USER_SELECT} FROM users WHERE email = {{p}}',
+    'user_by_profile_url': f'SELECT {USER_SELECT} FROM users WHERE profile_url = {{p}}',
+    'user_insert': '''
+        INSERT INTO users (id, username, email, password_hash, profile_url)
+        VALUES ({p}, {p}, {p}, {p}, {p})
+    ''',
+    'user_update': '''
+        UPDATE users
+        SET username = {p}, email = {p}, password_hash = {p}
+        WHERE id = {p}
+    ''',
+    'user_update_profile': '''
+        UPDATE users
+        SET username = {p}, email = {p}
+        WHERE id = {p}
+    ''',
+    'user_password_hash': 'SELECT password_hash FROM users WHERE id = {p}',
+    'user_products': f'''
+        SELECT {PRODUCT_WITH_TRACKING_SELECT}
+        FROM products p
+        WHERE p.user_id = {{p}}
+        ORDER BY p.created_at DESC
+    ''',
+    'user_products_page_first': f'''
+        SELECT {PRODUCT_WITH_TRACKING_SELECT}
+        FROM products p
+        WHERE p.user_id = {{p}}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT {{p}}
+    ''',
+    'user_products_page_after': f'''
+        SELECT {PRODUCT_WITH_TRACKING_SELECT}
+        FROM products p
+        WHERE p.user_id = {{p}} AND (p.created_at, p.id) < ({{p}}, {{p}})
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT {{p}}
+    ''',
+    # Ürün
+    'product_insert': '''
+        INSERT INTO products (id, user_id, name, price, image, brand, url, created_at, old_price, catalog_item_id)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+    ''',
+    'product_by_id': f'SELECT {PRODUCT_SELECT} FROM products WHERE id = {{p}}',
+    # SQLite tablolarında ON DELETE CASCADE yok; foreign key kontrolü açıkken bağlı kayıtlar önce silinmeli
+    'product_delete_collection_links': '''
+        DELETE FROM collection_products
+        WHERE product_id IN (SELECT id FROM products WHERE id = {p} AND user_id = {p})
+    ''',
+    'product_delete_trackings': '''
+        DELETE FROM price_tracking
+        WHERE product_id IN (SELECT id FROM products WHERE id = {p} AND user_id = {p})
+    ''',
+    'product_delete': 'DELETE FROM products WHERE id = {p} AND user_id = {p}',
+    'products_by_user': f'SELECT {PRODUCT_SELECT} FROM products WHERE user_id = {{p}} ORDER BY created_at DESC',
+    'products_by_user_page_first': f'''
+        SELECT {PRODUCT_SELECT} FROM products
+        WHERE user_id = {{p}}
+        ORDER BY created_at DESC, id DESC
+        LIMIT {{p}}
+    ''',
+    'products_by_user_page_after': f'''
+        SELECT {PRODUCT_SELECT} FROM products
+        WHERE user_id = {{p}} AND (created_at, id) < ({{p}}, {{p}})
+        ORDER BY created_at DESC, id DESC
+        LIMIT {{p}}
+    ''',
+    # Koleksiyon
+    'collection_insert': '''
+        INSERT INTO collections (id, user_id, name, description, type, is_public, share_url)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+    ''',
+    'collection_by_id': f'SELECT {COLLECTION_SELECT} FROM collections WHERE id = {{p}}',
+    'collections_by_user': f'SELECT {COLLECTION_SELECT} FROM collections WHERE user_id = {{p}} ORDER BY created_at DESC',
+    'collection_by_share_url': f'SELECT {COLLECTION_SELECT} FROM collections WHERE share_url = {{p}}',
+    'collection_products': f'''
+        SELECT {PRODUCT_SELECT_P} FROM products p
+        JOIN collection_products cp ON p.id = cp.product_id
+        WHERE cp.collection_id = {{p}}
+        ORDER BY cp.added_at DESC
+    ''',
+    'collection_products_page_first': f'''
+        SELECT {PRODUCT_SELECT_P}, cp.added_at FROM products p
+        JOIN collection_products cp ON p.id = cp.product_id
+        WHERE cp.collection_id = {{p}}
+        ORDER BY cp.added_at DESC, cp.product_id DESC
+        LIMIT {{p}}
+    ''',
+    'collection_products_page_after': f'''
+        SELECT {PRODUCT_SELECT_P}, cp.added_at FROM products p
+        JOIN collection_products cp ON p.id = cp.product_id
+        WHERE cp.collection_id = {{p}} AND (cp.added_at, cp.product_id) < ({{p}}, {{p}})
+        ORDER BY cp.added_at DESC, cp.product_id DESC
+        LIMIT {{p}}
+    ''',
+    'collection_product_insert': '''
+        INSERT INTO collection_products (collection_id, product_id) VALUES ({p}, {p})
+        ON CONFLICT (collection_id, product_id) DO NOTHING
+    ''',
+    'collection_product_delete': 'DELETE FROM collection_products WHERE collection_id = {p} AND product_id = {p}',
+    'collection_clear': 'DELETE FROM collection_products WHERE collection_id = {p}',
+    'collection_delete': 'DELETE FROM collections WHERE id = {p}',
+    # Fiyat takibi
+    'tracking_insert': '''
+        INSERT INTO price_tracking (id, user_id, product_id, current_price, original_price, alert_price)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+    ''',
+    'tracking_by_product_and_user': f'SELECT {PRICE_TRACKING_SELECT} FROM price_tracking WHERE product_id = {{p}} AND user_id = {{p}}',
+    'trackings_by_user': f'SELECT {PRICE_TRACKING_SELECT} FROM price_tracking WHERE user_id = {{p}} ORDER BY created_at DESC',
+    # Değişmeyen kontroller sadece katalog satırının last_checked'ını günceller
+    'trackings_with_products': '''
+        SELECT pt.id, pt.user_id, pt.product_id, pt.current_price, pt.original_price,
+               pt.alert_price, pt.created_at, COALESCE(ci.last_checked, pt.last_checked),
+               p.name, p.brand, p.image, p.old_price
+        FROM price_tracking pt
+        JOIN products p ON pt.product_id = p.id
+        LEFT JOIN catalog_items ci ON p.catalog_item_id = ci.id
+        WHERE pt.user_id = {p}
+        ORDER BY pt.created_at DESC
+    ''',
+    # Takip edilen her katalog ürünü, takipçileriyle birlikte (katalog başına bir scrape)
+    'refresh_candidates': '''
+        SELECT ci.id, ci.url, COALESCE(ci.current_price, pt.current_price), ci.next_check_at,
+               ci.check_count, ci.change_count, pt.id, pt.product_id, pt.user_id, pt.alert_price,
+               ci.content_fingerprint
+        FROM price_tracking pt
+        JOIN products p ON pt.product_id = p.id
+        JOIN catalog_items ci ON p.catalog_item_id = ci.id
+    ''',
+    # Katalog kontrol sonucu: katalog satırı bir kez güncellenir, takipçilere tek UPDATE ile dağıtılır
+    'catalog_record_check': '''
+        UPDATE catalog_items
+        SET change_count = change_count + (CASE WHEN current_price <> {p} THEN 1 ELSE 0 END),
+            check_count = check_count + {p},
+            current_price = {p},
+            last_checked = {p},
+            next_check_at = {p}
+        WHERE id = {p}
+    ''',
+    'catalog_record_failure': 'UPDATE catalog_items SET next_check_at = {p} WHERE id = {p}',
+    'catalog_content': '''
+        UPDATE catalog_items
+        SET price = {p}, old_price = {p}, content_fingerprint = {p}, updated_at = {p}
+        WHERE id = {p}
+    ''',
+    # İçeriği değişmeyen kontroller: sadece sayaç ve zaman damgaları (write-behind ile toplu yazılır)
+    'catalog_touch': '''
+        UPDATE catalog_items
+        SET check_count = check_count + {p}, last_checked = {p}, next_check_at = {p}
+        WHERE id = {p}
+    ''',
+    'catalog_fanout_trackings': '''
+        UPDATE price_tracking
+        SET change_count = change_count + (CASE WHEN current_price <> {p} THEN 1 ELSE 0 END),
+            check_count = check_count + 1,
+            previous_price = current_price,
+            current_price = {p},
+            last_checked = {p},
+            next_check_at = {p}
+        WHERE product_id IN (SELECT id FROM products WHERE catalog_item_id = {p})
+    ''',
+    'catalog_fanout_products': 'UPDATE products SET price = {p}, old_price = {p} WHERE catalog_item_id = {p}',
+    'tracking_by_id': f'SELECT {PRICE_TRACKING_SELECT} FROM price_tracking WHERE id = {{p}}',
+    'tracking_delete': 'DELETE FROM price_tracking WHERE id = {p}',
+    # Bildirim
+    'notification_insert': '''
+        INSERT INTO notifications (id, user_id, title, message, type)
+        VALUES ({p}, {p}, {p}, {p}, {p})
+    ''',
+    'notifications_by_user': f'''
+        SELECT {NOTIFICATION_SELECT} FROM notifications
+        WHERE user_id = {{p}}
+        ORDER BY created_at DESC
+        LIMIT {{p}}
+    ''',
+    'notification_mark_read': 'UPDATE notifications SET is_read = {true} WHERE id = {p}',
+    'notifications_mark_all_read': 'UPDATE notifications SET is_read = {true} WHERE user_id = {p}',
+    'notifications_unread_count': 'SELECT COUNT(*) FROM notifications WHERE user_id = {p} AND is_read = {false}',
+}
+
+# PostgreSQL'de bağlantı başına PREPARE edilen en sık sorgular (load_user ve dashboard ürünleri)
+PREPARED_STATEMENTS = ('load_user', 'user_products', 'user_products_page_first', 'user_products_page_after')
+
+DIALECT.register(STATEMENTS, PREPARED_STATEMENTS)
 
 class User(UserMixin):
+    """Oturumdaki kullanıcı
+    
+    Diğer modellerin aksine değiştirilebilir sınıf olarak kalır: flask_login
+    UserMixin ile çalışır ve profil ayarları username/email/password_hash
+    alanlarını değiştirip save() çağırır.
+    
+    Session önbelleğinden kurulan kullanıcıda password_hash yüklenmez; ilk
+    erişimde veritabanından okunur.
+    """
+    # Session önbelleğine yazılan hassas olmayan alanlar
+    SESSION_FIELDS = ('id', 'username', 'email', 'created_at', 'profile_url')
+    
     def __init__(self, id, username, email, password_hash, created_at, profile_url):
         self.id = id
         self.username = username
         self.email = email
-        self.password_hash = password_hash
+        self._password_hash = password_hash
         self.created_at = created_at
         self.profile_url = profile_url
     
+    @property
+    def password_hash(self):
+        if self._password_hash is _MISSING:
+            self._password_hash = User.load_password_hash(self.id)
+        return self._password_hash
+    
+    @password_hash.setter
+    def password_hash(self, value):
+        self._password_hash = value
+    
+    def to_session(self):
+        """Session önbelleği için hassas olmayan alanları döndür"""
+        return {field: getattr(self, field) for field in User.SESSION_FIELDS}
+    
+    @staticmethod
+    def from_session(data):
+        """Session önbelleğinden kullanıcı kur (password_hash yüklenmeden)"""
+        user = User(data['id'], data['username'], data['email'], _MISSING, data['created_at'], data['profile_url'])
+        return remember('user', user.id, user)
+    
+    @staticmethod
+    def load_password_hash(user_id):
+        """Kullanıcının şifre hash'ini getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            execute_statement(cursor, 'user_password_hash', (user_id,))
+            row = cursor.fetchone()
+            conn.close()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"[HATA] Şifre hash'i getirme hatası: {e}")
+            return None
+    
     @staticmethod
     def get_by_id(user_id):
         """ID ile kullanıcı getir"""
+        cached = recall('user', user_id)
+        if cached is not _MISSING:
+            return cached
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM users WHERE id = {placeholder}', (user_id,))
+            execute_statement(cursor, 'load_user', (user_id,))
             user_data = cursor.fetchone()
             conn.close()
             
-            if user_data:
-                return User(*user_data)
-            return None
+            return remember('user', user_id, User(*user_data) if user_data else None)
         except Exception as e:
             print(f"[HATA] Kullanıcı getirme hatası: {e}")
             return None
@@ -289,13 +840,12 @@ class User(UserMixin):
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM users WHERE username = {placeholder}', (username,))
+            execute_statement(cursor, 'user_by_username', (username,))
             user_data = cursor.fetchone()
             conn.close()
             
             if user_data:
-                return User(*user_data)
+                return remember('user', user_data[0], User(*user_data))
             return None
         except Exception as e:
             print(f"[HATA] Kullanıcı adı ile getirme hatası: {e}")
@@ -307,13 +857,12 @@ class User(UserMixin):
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM users WHERE email = {placeholder}', (email,))
+            execute_statement(cursor, 'user_by_email', (email,))
             user_data = cursor.fetchone()
             conn.close()
             
             if user_data:
-                return User(*user_data)
+                return remember('user', user_data[0], User(*user_data))
             return None
         except Exception as e:
             print(f"[HATA] Email ile getirme hatası: {e}")
@@ -325,13 +874,12 @@ class User(UserMixin):
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM users WHERE profile_url = {placeholder}', (profile_url,))
+            execute_statement(cursor, 'user_by_profile_url', (profile_url,))
             user_data = cursor.fetchone()
             conn.close()
             
             if user_data:
-                return User(*user_data)
+                return remember('user', user_data[0], User(*user_data))
             return None
         except Exception as e:
             print(f"[HATA] Profile URL ile getirme hatası: {e}")
@@ -350,28 +898,9 @@ class User(UserMixin):
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            print(f"[DEBUG] Placeholder: {get_placeholder()}")
-            placeholder = get_placeholder()
-            
-            # Önce tabloyu kontrol et
-            try:
-                execute_query(cursor, "SELECT COUNT(*) FROM users")
-                print(f"[DEBUG] Users tablosu mevcut")
-            except Exception as table_error:
-                print(f"[HATA] Users tablosu bulunamadı: {table_error}")
-                # Tabloyu oluştur
-                init_db()
-                conn = get_db_connection()
-                cursor = conn.cursor()
-            
-            query = f'''
-                INSERT INTO users (id, username, email, password_hash, profile_url)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            '''
-            print(f"[DEBUG] Query: {query}")
             print(f"[DEBUG] Params: {user_id}, {username}, {email}, {password_hash}, {profile_url}")
             
-            execute_query(cursor, query, (user_id, username, email, password_hash, profile_url))
+            execute_statement(cursor, 'user_insert', (user_id, username, email, password_hash, profile_url))
             
             print(f"[DEBUG] Commit yapılıyor...")
             conn.commit()
@@ -386,6 +915,44 @@ class User(UserMixin):
                 raise Exception("Bu kullanıcı adı veya email zaten kullanılıyor")
             raise Exception(f"Kullanıcı oluşturulamadı: {str(e)}")
     
+    @staticmethod
+    def create_many(users):
+        """Birden fazla kullanıcıyı tek transaction'da multi-row INSERT'lerle oluştur
+        
+        users: (username, email, password_hash) tuple listesi. Şifre hash'i
+        çağıran tarafından üretilir (hash hesaplamak kayıt başına pahalıdır).
+        Oluşturulan kullanıcıları döndürür.
+        """
+        if not users:
+            return []
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            placeholder = get_placeholder()
+            
+            created_at = datetime.now()
+            created = []
+            for username, email, password_hash in users:
+                user_id = str(uuid.uuid4())
+                created.append(User(user_id, username, email, password_hash, created_at, f"user_{user_id[:8]}"))
+            row_placeholders = f"({', '.join([placeholder] * 5)})"
+            
+            for batch in chunked(created, BATCH_WRITE_SIZE):
+                params = [value for user in batch
+                          for value in (user.id, user.username, user.email, user.password_hash, user.profile_url)]
+                execute_query(cursor, f'''
+                    INSERT INTO users (id, username, email, password_hash, profile_url)
+                    VALUES {', '.join([row_placeholders] * len(batch))}
+                ''', params)
+            
+            conn.commit()
+            conn.close()
+            
+            return created
+        except Exception as e:
+            print(f"[HATA] Toplu kullanıcı oluşturma hatası: {e}")
+            return []
+    
     def check_password(self, password):
         """Şifre kontrolü"""
         return check_password_hash(self.password_hash, password)
@@ -395,14 +962,14 @@ class User(UserMixin):
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                UPDATE users 
-                SET username = {placeholder}, email = {placeholder}, password_hash = {placeholder}
-                WHERE id = {placeholder}
-            ''', (self.username, self.email, self.password_hash, self.id))
+            if self._password_hash is _MISSING:
+                # Hash session önbelleğinden yüklenmediyse password_hash kolonuna dokunma
+                execute_statement(cursor, 'user_update_profile', (self.username, self.email, self.id))
+            else:
+                execute_statement(cursor, 'user_update', (self.username, self.email, self._password_hash, self.id))
             conn.commit()
             conn.close()
+            remember('user', self.id, self)
             return True
         except Exception as e:
             print(f"[HATA] Kullanıcı güncelleme hatası: {e}")
@@ -414,35 +981,59 @@ class User(UserMixin):
         return self.save()
     
     def get_products(self):
-        """Kullanıcının ürünlerini getir"""
+        """Kullanıcının ürünlerini fiyat takip durumlarıyla birlikte getir"""
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM products WHERE user_id = {placeholder} ORDER BY created_at DESC', (self.id,))
+            execute_statement(cursor, 'user_products', (self.id,))
             products = cursor.fetchall()
             conn.close()
             
-            return [Product(*product) for product in products]
+            return list(map(Product._make, products))
         except Exception as e:
             print(f"[HATA] Kullanıcı ürünleri getirme hatası: {e}")
             return []
     
+    def get_products_page(self, limit=PRODUCT_PAGE_SIZE, after=None):
+        """Kullanıcının ürünlerini (created_at, id) keyset sayfalamasıyla getir
+        
+        after: önceki sayfanın decode_page_cursor ile çözülmüş imleci.
+        (ürünler, sonraki sayfa imleci) döndürür; son sayfada imleç None'dır.
+        """
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            if after:
+                execute_statement(cursor, 'user_products_page_after', (self.id, *after, limit + 1))
+            else:
+                execute_statement(cursor, 'user_products_page_first', (self.id, limit + 1))
+            rows = cursor.fetchall()
+            conn.close()
+            
+            products = list(map(Product._make, rows[:limit]))
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_page_cursor(products[-1].created_at, products[-1].id)
+            return products, next_cursor
+        except Exception as e:
+            print(f"[HATA] Kullanıcı ürün sayfası getirme hatası: {e}")
+            return [], None
+    
     def get_collections(self):
         """Kullanıcının koleksiyonlarını getir"""
         return Collection.get_user_collections(self.id)
 
-class Product:
-    def __init__(self, id, user_id, name, price, image, brand, url, created_at, old_price=None):
-        self.id = id
-        self.user_id = user_id
-        self.name = name
-        self.price = price
-        self.image = image
-        self.brand = brand
-        self.url = url
-        self.created_at = created_at
-        self.old_price = old_price
+class Product(namedtuple('ProductRow', PRODUCT_COLUMNS + ('tracking_id',), defaults=(None, None, None))):
+    """products satırı; cursor satırından doğrudan kurulan değiştirilemez tuple
+    
+    tracking_id sadece takip durumu ile birlikte yüklenen listelerde doludur.
+    """
+    __slots__ = ()
+    
+    @property
+    def is_tracked(self):
+        """Ürün fiyat takibinde mi (sadece takip durumu ile birlikte yüklendiyse anlamlı)"""
+        return self.tracking_id is not None
     
     @staticmethod
     def create(user_id, name, price, image, brand, url, old_price=None):
@@ -454,34 +1045,76 @@ class Product:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                INSERT INTO products (id, user_id, name, price, image, brand, url, created_at, old_price)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            ''', (product_id, user_id, name, price, image, brand, url, created_at, old_price))
+            # Aynı URL'yi kaydeden tüm kullanıcılar tek bir katalog ürününü paylaşır
+            catalog_ids = upsert_catalog_items(cursor, [(url, name, price, image, brand, old_price)])
+            catalog_item_id = catalog_ids.get(canonical_url(url)) if catalog_ids else None
+            execute_statement(cursor, 'product_insert', (product_id, user_id, name, price, image, brand, url, created_at, old_price, catalog_item_id))
             
             conn.commit()
             conn.close()
             
-            return Product(product_id, user_id, name, price, image, brand, url, created_at, old_price)
+            return Product(product_id, user_id, name, price, image, brand, url, created_at, old_price, catalog_item_id)
         except Exception as e:
             print(f"[HATA] Ürün oluşturma hatası: {e}")
             return None
     
+    @staticmethod
+    def create_many(user_id, products):
+        """Birden fazla ürünü tek transaction'da multi-row INSERT'lerle oluştur
+        
+        products: (name, price, image, brand, url, old_price) tuple listesi.
+        created_at verilen sıraya göre mikro saniye artar, böylece dashboard
+        sıralaması ekleme sırasını korur. Oluşturulan ürünleri döndürür.
+        """
+        if not products:
+            return []
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            placeholder = get_placeholder()
+            
+            catalog_ids = upsert_catalog_items(cursor, [
+                (url, name, price, image, brand, old_price)
+                for name, price, image, brand, url, old_price in products
+            ])
+            started_at = datetime.now()
+            created = [
+                Product(str(uuid.uuid4()), user_id, name, price, image, brand, url,
+                        started_at + timedelta(microseconds=index), old_price,
+                        catalog_ids.get(canonical_url(url)) if is_catalog_url(url) else None)
+                for index, (name, price, image, brand, url, old_price) in enumerate(products)
+            ]
+            row_placeholders = f"({', '.join([placeholder] * len(PRODUCT_COLUMNS))})"
+            
+            for batch in chunked(created, BATCH_WRITE_SIZE):
+                params = [value for product in batch for value in product[:len(PRODUCT_COLUMNS)]]
+                execute_query(cursor, f'''
+                    INSERT INTO products ({column_list(PRODUCT_COLUMNS)})
+                    VALUES {', '.join([row_placeholders] * len(batch))}
+                ''', params)
+            
+            conn.commit()
+            conn.close()
+            
+            return created
+        except Exception as e:
+            print(f"[HATA] Toplu ürün oluşturma hatası: {e}")
+            return []
+    
     @staticmethod
     def get_by_id(product_id):
         """ID ile ürün getir"""
+        cached = recall('product', product_id)
+        if cached is not _MISSING:
+            return cached
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM products WHERE id = {placeholder}', (product_id,))
+            execute_statement(cursor, 'product_by_id', (product_id,))
             product_data = cursor.fetchone()
             conn.close()
             
-            if product_data:
-                return Product(*product_data)
-            return None
+            return remember('product', product_id, Product._make(product_data) if product_data else None)
         except Exception as e:
             print(f"[HATA] Ürün getirme hatası: {e}")
             return None
@@ -492,10 +1125,12 @@ class Product:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'DELETE FROM products WHERE id = {placeholder} AND user_id = {placeholder}', (product_id, user_id))
+            execute_statement(cursor, 'product_delete_collection_links', (product_id, user_id))
+            execute_statement(cursor, 'product_delete_trackings', (product_id, user_id))
+            execute_statement(cursor, 'product_delete', (product_id, user_id))
             conn.commit()
             conn.close()
+            forget('product', product_id)
             return True
         except Exception as e:
             print(f"[HATA] Ürün silme hatası: {e}")
@@ -507,26 +1142,40 @@ class Product:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM products WHERE user_id = {placeholder} ORDER BY created_at DESC', (user_id,))
+            execute_statement(cursor, 'products_by_user', (user_id,))
             products = cursor.fetchall()
             conn.close()
             
-            return [Product(*product) for product in products]
+            return list(map(Product._make, products))
         except Exception as e:
             print(f"[HATA] Kullanıcı ürünleri getirme hatası: {e}")
             return []
 
-class Collection:
-    def __init__(self, id, user_id, name, description, type, is_public, share_url, created_at):
-        self.id = id
-        self.user_id = user_id
-        self.name = name
-        self.description = description
-        self.type = type
-        self.is_public = is_public
-        self.share_url = share_url
-        self.created_at = created_at
+    @staticmethod
+    def get_user_products_page(user_id, limit=PRODUCT_PAGE_SIZE, after=None):
+        """Kullanıcının ürünlerini (created_at, id) keyset sayfalamasıyla getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            if after:
+                execute_statement(cursor, 'products_by_user_page_after', (user_id, *after, limit + 1))
+            else:
+                execute_statement(cursor, 'products_by_user_page_first', (user_id, limit + 1))
+            rows = cursor.fetchall()
+            conn.close()
+            
+            products = list(map(Product._make, rows[:limit]))
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_page_cursor(products[-1].created_at, products[-1].id)
+            return products, next_cursor
+        except Exception as e:
+            print(f"[HATA] Kullanıcı ürün sayfası getirme hatası: {e}")
+            return [], None
+
+class Collection(namedtuple('CollectionRow', COLLECTION_COLUMNS)):
+    """collections satırı (değiştirilemez)"""
+    __slots__ = ()
     
     @staticmethod
     def create(user_id, name, description, type, is_public=True):
@@ -538,11 +1187,7 @@ class Collection:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                INSERT INTO collections (id, user_id, name, description, type, is_public, share_url)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            ''', (collection_id, user_id, name, description, type, get_boolean_value(is_public), share_url))
+            execute_statement(cursor, 'collection_insert', (collection_id, user_id, name, description, type, get_boolean_value(is_public), share_url))
             
             conn.commit()
             conn.close()
@@ -555,17 +1200,17 @@ class Collection:
     @staticmethod
     def get_by_id(collection_id):
         """ID ile koleksiyon getir"""
+        cached = recall('collection', collection_id)
+        if cached is not _MISSING:
+            return cached
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM collections WHERE id = {placeholder}', (collection_id,))
+            execute_statement(cursor, 'collection_by_id', (collection_id,))
             collection_data = cursor.fetchone()
             conn.close()
             
-            if collection_data:
-                return Collection(*collection_data)
-            return None
+            return remember('collection', collection_id, Collection._make(collection_data) if collection_data else None)
         except Exception as e:
             print(f"[HATA] Koleksiyon getirme hatası: {e}")
             return None
@@ -577,12 +1222,13 @@ class Collection:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM collections WHERE user_id = {placeholder} ORDER BY created_at DESC', (user_id,))
-            collections = cursor.fetchall()
+            execute_statement(cursor, 'collections_by_user', (user_id,))
+            collections = list(map(Collection._make, cursor.fetchall()))
             conn.close()
             
-            return [Collection(*collection) for collection in collections]
+            for collection in collections:
+                remember('collection', collection.id, collection)
+            return collections
         except Exception as e:
             print(f"[HATA] Kullanıcı koleksiyonları getirme hatası: {e}")
             return []
@@ -593,13 +1239,12 @@ class Collection:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM collections WHERE share_url = {placeholder}', (share_url,))
+            execute_statement(cursor, 'collection_by_share_url', (share_url,))
             collection_data = cursor.fetchone()
             conn.close()
             
             if collection_data:
-                return Collection(*collection_data)
+                return remember('collection', collection_data[0], Collection._make(collection_data))
             return None
         except Exception as e:
             print(f"[HATA] Share URL ile koleksiyon getirme hatası: {e}")
@@ -610,53 +1255,90 @@ class Collection:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                SELECT p.* FROM products p
-                JOIN collection_products cp ON p.id = cp.product_id
-                WHERE cp.collection_id = {placeholder}
-                ORDER BY cp.added_at DESC
-            ''', (self.id,))
+            execute_statement(cursor, 'collection_products', (self.id,))
             products = cursor.fetchall()
             conn.close()
             
-            return [Product(*product) for product in products]
+            return list(map(Product._make, products))
         except Exception as e:
             print(f"[HATA] Koleksiyon ürünleri getirme hatası: {e}")
             return []
     
+    def get_products_page(self, limit=PRODUCT_PAGE_SIZE, after=None):
+        """Koleksiyondaki ürünleri (added_at, product_id) keyset sayfalamasıyla getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            if after:
+                execute_statement(cursor, 'collection_products_page_after', (self.id, *after, limit + 1))
+            else:
+                execute_statement(cursor, 'collection_products_page_first', (self.id, limit + 1))
+            rows = cursor.fetchall()
+            conn.close()
+            
+            page = rows[:limit]
+            products = [Product._make(row[:-1]) for row in page]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_page_cursor(page[-1][-1], page[-1][0])
+            return products, next_cursor
+        except Exception as e:
+            print(f"[HATA] Koleksiyon ürün sayfası getirme hatası: {e}")
+            return [], None
+    
     def add_product(self, product_id):
-        """Koleksiyona ürün ekle"""
+        """Koleksiyona ürün ekle; ürün zaten koleksiyondaysa False döndür"""
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
+            execute_statement(cursor, 'collection_product_insert', (self.id, product_id))
+            added = cursor.rowcount > 0
             
-            # Ürünün zaten koleksiyonda olup olmadığını kontrol et
+            conn.commit()
+            conn.close()
+            return added
+        except Exception as e:
+            print(f"[HATA] Koleksiyona ürün ekleme hatası: {e}")
+            return False
+    
+    def add_products(self, product_ids):
+        """Birden fazla ürünü tek transaction'da koleksiyona ekle
+        
+        Sadece koleksiyon sahibinin ürünleri eklenir; zaten koleksiyonda olanlar
+        ON CONFLICT DO NOTHING ile atlanır. Yeni eklenen ürün id'lerini döndürür.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return []
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
             placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT id FROM collection_products WHERE collection_id = {placeholder} AND product_id = {placeholder}', (self.id, product_id))
-            if cursor.fetchone():
-                conn.close()
-                return False
             
-            execute_query(cursor, f'''
-                INSERT INTO collection_products (collection_id, product_id)
-                VALUES ({placeholder}, {placeholder})
-            ''', (self.id, product_id))
+            added = []
+            for batch in chunked(product_ids, BATCH_WRITE_SIZE):
+                execute_query(cursor, f'''
+                    INSERT INTO collection_products (collection_id, product_id)
+                    SELECT {placeholder}, id FROM products
+                    WHERE user_id = {placeholder} AND id IN ({', '.join([placeholder] * len(batch))})
+                    ON CONFLICT (collection_id, product_id) DO NOTHING
+                    RETURNING product_id
+                ''', (self.id, self.user_id, *batch))
+                added.extend(row[0] for row in cursor.fetchall())
             
             conn.commit()
             conn.close()
-            return True
+            return added
         except Exception as e:
-            print(f"[HATA] Koleksiyona ürün ekleme hatası: {e}")
-            return False
+            print(f"[HATA] Koleksiyona toplu ürün ekleme hatası: {e}")
+            return []
     
     def remove_product(self, product_id):
         """Koleksiyondan ürün çıkar"""
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'DELETE FROM collection_products WHERE collection_id = {placeholder} AND product_id = {placeholder}', (self.id, product_id))
+            execute_statement(cursor, 'collection_product_delete', (self.id, product_id))
             conn.commit()
             conn.close()
             return True
@@ -664,16 +1346,41 @@ class Collection:
             print(f"[HATA] Koleksiyondan ürün çıkarma hatası: {e}")
             return False
     
+    def remove_products(self, product_ids):
+        """Birden fazla ürünü tek transaction'da koleksiyondan çıkar, çıkarılan sayısını döndür"""
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return 0
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            placeholder = get_placeholder()
+            
+            removed = 0
+            for batch in chunked(product_ids, BATCH_WRITE_SIZE):
+                execute_query(cursor, f'''
+                    DELETE FROM collection_products
+                    WHERE collection_id = {placeholder} AND product_id IN ({', '.join([placeholder] * len(batch))})
+                ''', (self.id, *batch))
+                removed += cursor.rowcount
+            
+            conn.commit()
+            conn.close()
+            return removed
+        except Exception as e:
+            print(f"[HATA] Koleksiyondan toplu ürün çıkarma hatası: {e}")
+            return 0
+    
     def delete(self):
         """Koleksiyonu sil"""
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'DELETE FROM collection_products WHERE collection_id = {placeholder}', (self.id,))
-            execute_query(cursor, f'DELETE FROM collections WHERE id = {placeholder}', (self.id,))
+            execute_statement(cursor, 'collection_clear', (self.id,))
+            execute_statement(cursor, 'collection_delete', (self.id,))
             conn.commit()
             conn.close()
+            forget('collection', self.id)
             return True
         except Exception as e:
             print(f"[HATA] Koleksiyon silme hatası: {e}")
@@ -681,16 +1388,9 @@ class Collection:
     
 
 
-class PriceTracking:
-    def __init__(self, id, user_id, product_id, current_price, original_price, alert_price, created_at, last_checked):
-        self.id = id
-        self.user_id = user_id
-        self.product_id = product_id
-        self.current_price = current_price
-        self.original_price = original_price
-        self.alert_price = alert_price
-        self.created_at = created_at
-        self.last_checked = last_checked
+class PriceTracking(namedtuple('PriceTrackingRow', PRICE_TRACKING_COLUMNS, defaults=(None, 0, 0, None))):
+    """price_tracking satırı (değiştirilemez)"""
+    __slots__ = ()
     
     @staticmethod
     def create(user_id, product_id, current_price, original_price=None, alert_price=None):
@@ -702,11 +1402,7 @@ class PriceTracking:
             tracking_id = str(uuid.uuid4())
             original_price = original_price or current_price
             
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                INSERT INTO price_tracking (id, user_id, product_id, current_price, original_price, alert_price)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            ''', (tracking_id, user_id, product_id, current_price, original_price, alert_price))
+            execute_statement(cursor, 'tracking_insert', (tracking_id, user_id, product_id, current_price, original_price, alert_price))
             
             conn.commit()
             conn.close()
@@ -722,30 +1418,50 @@ class PriceTracking:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM price_tracking WHERE product_id = {placeholder} AND user_id = {placeholder}', (product_id, user_id))
+            execute_statement(cursor, 'tracking_by_product_and_user', (product_id, user_id))
             tracking_data = cursor.fetchone()
             conn.close()
             
             if tracking_data:
-                return PriceTracking(*tracking_data)
+                return PriceTracking._make(tracking_data)
             return None
         except Exception as e:
             print(f"[HATA] Fiyat takibi getirme hatası: {e}")
             return None
     
+    @staticmethod
+    def get_statuses_for_products(user_id, product_ids):
+        """Birden fazla ürünün takip durumunu tek sorguda getir: {product_id: tracking_id}"""
+        if not product_ids:
+            return {}
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            placeholder = get_placeholder()
+            product_in = ', '.join([placeholder] * len(product_ids))
+            execute_query(cursor, f'''
+                SELECT product_id, id FROM price_tracking
+                WHERE user_id = {placeholder} AND product_id IN ({product_in})
+            ''', (user_id, *product_ids))
+            statuses = dict(cursor.fetchall())
+            conn.close()
+            
+            return statuses
+        except Exception as e:
+            print(f"[HATA] Toplu takip durumu getirme hatası: {e}")
+            return {}
+    
     @staticmethod
     def get_user_trackings(user_id):
         """Kullanıcının fiyat takiplerini getir"""
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM price_tracking WHERE user_id = {placeholder} ORDER BY created_at DESC', (user_id,))
+            execute_statement(cursor, 'trackings_by_user', (user_id,))
             trackings = cursor.fetchall()
             conn.close()
             
-            return [PriceTracking(*tracking) for tracking in trackings]
+            return list(map(PriceTracking._make, trackings))
         except Exception as e:
             print(f"[HATA] Kullanıcı fiyat takipleri getirme hatası: {e}")
             return []
@@ -753,23 +1469,138 @@ class PriceTracking:
     @staticmethod
     def get_user_trackings_with_products(user_id):
         """Kullanıcının fiyat takiplerini ürün bilgileriyle birlikte getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            execute_statement(cursor, 'trackings_with_products', (user_id,))
+            trackings = cursor.fetchall()
+            conn.close()
+            
+            return list(map(TrackingWithProduct._make, trackings))
+        except Exception as e:
+            print(f"[HATA] Kullanıcı fiyat takipleri (ürünlerle) getirme hatası: {e}")
+            return []
+    
+    @staticmethod
+    def get_refresh_candidates():
+        """Yenileme zamanlayıcısı için takip edilen ürünleri URL bilgisiyle getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            execute_statement(cursor, 'refresh_candidates')
+            candidates = cursor.fetchall()
+            conn.close()
+            
+            return candidates
+        except Exception as e:
+            print(f"[HATA] Yenileme adayları getirme hatası: {e}")
+            return []
+    
+    @staticmethod
+    def record_check(catalog_item_id, next_check_at, new_price=None, price_text=None, old_price_text=None,
+                     fingerprint=None, check_increment=1):
+        """Katalog ürününün fiyat kontrolü sonucunu kaydet ve bir sonraki kontrolü planla
+        
+        Sonuç katalog satırına bir kez yazılır; ürünü takip eden tüm kayıtlara ve
+        kullanıcı ürünlerine catalog_item_id üzerinden tek UPDATE ile dağıtılır.
+        new_price None ise (scraping başarısız) sadece next_check_at güncellenir.
+        İçeriği değişmeyen kontroller için touch_checks kullanılır; check_increment
+        tamponda bekleyen bu tür kontrolleri de sayaca katar.
+        """
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            now = datetime.now()
+            
+            if new_price is None:
+                execute_statement(cursor, 'catalog_record_failure', (next_check_at, catalog_item_id))
+            else:
+                execute_statement(cursor, 'catalog_record_check', (new_price, check_increment, new_price, now, next_check_at, catalog_item_id))
+                execute_statement(cursor, 'catalog_fanout_trackings', (new_price, new_price, now, next_check_at, catalog_item_id))
+                
+                execute_statement(cursor, 'catalog_content', (price_text, old_price_text, fingerprint, now, catalog_item_id))
+                if price_text:
+                    execute_statement(cursor, 'catalog_fanout_products', (price_text, old_price_text, catalog_item_id))
+            
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"[HATA] Fiyat kontrolü kaydetme hatası: {e}")
+            return False
+    
+    @staticmethod
+    def touch_checks(checks):
+        """İçeriği değişmeyen kontrolleri tek toplu UPDATE ile kaydet
+        
+        checks: [(catalog_item_id, (last_checked, next_check_at, check_increment)), ...]
+        Sadece katalog satırının check_count, last_checked ve next_check_at alanları
+        güncellenir. PostgreSQL'de UPDATE ... FROM (VALUES ...), SQLite'ta executemany.
+        """
+        if not checks:
+            return True
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            if DIALECT.is_postgres:
+                for batch in chunked(checks, BATCH_WRITE_SIZE):
+                    params = []
+                    for catalog_item_id, (last_checked, next_check_at, check_increment) in batch:
+                        params.extend((catalog_item_id, last_checked, next_check_at, check_increment))
+                    execute_query(cursor, f'''
+                        UPDATE catalog_items AS ci
+                        SET check_count = ci.check_count + v.check_increment,
+                            last_checked = v.last_checked,
+                            next_check_at = v.next_check_at
+                        FROM (VALUES {', '.join(['(%s, %s::timestamp, %s::timestamp, %s::integer)'] * len(batch))})
+                            AS v (id, last_checked, next_check_at, check_increment)
+                        WHERE ci.id = v.id
+                    ''', params)
+            else:
+                execute_statement_many(cursor, 'catalog_touch', [
+                    (check_increment, last_checked, next_check_at, catalog_item_id)
+                    for catalog_item_id, (last_checked, next_check_at, check_increment) in checks
+                ])
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"[HATA] Kontrol zamanı kaydetme hatası: {e}")
+            return False
+    
+    @staticmethod
+    def find_triggered_alerts(tracking_ids, drop_ratio):
+        """Son kontrolde alarm fiyatının altına inen veya drop_ratio kadar düşen takipleri bul
+        
+        Tek bir sorgu ile çalışır; (id, user_id, previous_price, current_price, alert_price, name, change_count)
+        döndürür. change_count son fiyat değişimini tanımlar; aynı değişim tekrar değerlendirilirse aynı kalır.
+        """
+        if not tracking_ids:
+            return []
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
             placeholder = get_placeholder()
+            tracking_in = ', '.join([placeholder] * len(tracking_ids))
             execute_query(cursor, f'''
-                SELECT pt.*, p.name, p.brand, p.image, p.old_price
+                SELECT pt.id, pt.user_id, pt.previous_price, pt.current_price, pt.alert_price, p.name, pt.change_count
                 FROM price_tracking pt
                 JOIN products p ON pt.product_id = p.id
-                WHERE pt.user_id = {placeholder}
-                ORDER BY pt.created_at DESC
-            ''', (user_id,))
-            trackings = cursor.fetchall()
+                WHERE pt.id IN ({tracking_in})
+                  AND pt.previous_price IS NOT NULL
+                  AND (
+                      (pt.alert_price IS NOT NULL
+                       AND pt.previous_price > pt.alert_price
+                       AND pt.current_price <= pt.alert_price)
+                      OR pt.current_price <= pt.previous_price * {placeholder}
+                  )
+            ''', (*tracking_ids, 1 - drop_ratio))
+            triggered = cursor.fetchall()
             conn.close()
             
-            return trackings
+            return triggered
         except Exception as e:
-            print(f"[HATA] Kullanıcı fiyat takipleri (ürünlerle) getirme hatası: {e}")
+            print(f"[HATA] Fiyat alarmı değerlendirme hatası: {e}")
             return []
     
     @staticmethod
@@ -778,13 +1609,12 @@ class PriceTracking:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT * FROM price_tracking WHERE id = {placeholder}', (tracking_id,))
+            execute_statement(cursor, 'tracking_by_id', (tracking_id,))
             tracking_data = cursor.fetchone()
             conn.close()
             
             if tracking_data:
-                return PriceTracking(*tracking_data)
+                return PriceTracking._make(tracking_data)
             return None
         except Exception as e:
             print(f"[HATA] Fiyat takibi getirme hatası: {e}")
@@ -795,8 +1625,7 @@ class PriceTracking:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'DELETE FROM price_tracking WHERE id = {placeholder}', (self.id,))
+            execute_statement(cursor, 'tracking_delete', (self.id,))
             conn.commit()
             conn.close()
             return True
@@ -810,8 +1639,7 @@ class PriceTracking:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'DELETE FROM price_tracking WHERE id = {placeholder}', (tracking_id,))
+            execute_statement(cursor, 'tracking_delete', (tracking_id,))
             conn.commit()
             conn.close()
             return True
@@ -820,15 +1648,24 @@ class PriceTracking:
             return False
 
 
-class Notification:
-    def __init__(self, id, user_id, title, message, type, is_read, created_at):
-        self.id = id
-        self.user_id = user_id
-        self.title = title
-        self.message = message
-        self.type = type
-        self.is_read = is_read
-        self.created_at = created_at
+class TrackingWithProduct(namedtuple('TrackingWithProductRow', (
+        'id', 'user_id', 'product_id', 'current_price', 'original_price', 'alert_price', 'created_at',
+        'last_checked', 'product_name', 'product_brand', 'product_image', 'product_old_price'))):
+    """Fiyat takip sayfası satırı: takip kolonları ve ürünün görüntülenen alanları"""
+    __slots__ = ()
+    
+    @property
+    def price_change(self):
+        """Orijinal fiyata göre değişim (fiyatlardan biri yoksa 0)"""
+        try:
+            return round(float(self.current_price) - float(self.original_price), 2)
+        except (TypeError, ValueError):
+            return 0
+
+
+class Notification(namedtuple('NotificationRow', NOTIFICATION_COLUMNS, defaults=(None,))):
+    """notifications satırı (değiştirilemez)"""
+    __slots__ = ()
     
     @staticmethod
     def create(user_id, title, message, type="info"):
@@ -839,11 +1676,7 @@ class Notification:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            placeholder = get_placeholder()
-            execute_query(cursor, f'''
-                INSERT INTO notifications (id, user_id, title, message, type)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            ''', (notification_id, user_id, title, message, type))
+            execute_statement(cursor, 'notification_insert', (notification_id, user_id, title, message, type))
             
             conn.commit()
             conn.close()
@@ -854,34 +1687,56 @@ class Notification:
             return None
     
     @staticmethod
-    def get_user_notifications(user_id, limit=50):
-        """Kullanıcının bildirimlerini getir"""
+    def create_many(notifications):
+        """Birden fazla bildirimi tek transaction'da multi-row INSERT'lerle oluştur
+        
+        notifications: (user_id, title, message, type, dedup_key) tuple listesi.
+        Aynı dedup_key ile daha önce oluşturulmuş bildirimler atlanır.
+        Satırlar BATCH_WRITE_SIZE'lık gruplar halinde yazılır; çok takipçili bir
+        ürünün bildirimleri bind parametresi sınırını aşmaz.
+        Yeni eklenen bildirimleri döndürür.
+        """
+        if not notifications:
+            return []
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
             placeholder = get_placeholder()
             
-            if os.environ.get('RENDER'):
-                # PostgreSQL için LIMIT syntax
-                execute_query(cursor, f'''
-                    SELECT * FROM notifications 
-                    WHERE user_id = {placeholder} 
-                    ORDER BY created_at DESC 
-                    LIMIT {limit}
-                ''', (user_id,))
-            else:
-                # SQLite için LIMIT syntax
-                execute_query(cursor, f'''
-                    SELECT * FROM notifications 
-                    WHERE user_id = {placeholder} 
-                    ORDER BY created_at DESC 
-                    LIMIT {placeholder}
-                ''', (user_id, limit))
+            row_placeholders = f"({', '.join([placeholder] * 6)})"
+            created = []
+            for batch in chunked(notifications, BATCH_WRITE_SIZE):
+                params = []
+                for user_id, title, message, type, dedup_key in batch:
+                    params.extend((str(uuid.uuid4()), user_id, title, message, type, dedup_key))
                 
+                execute_query(cursor, f'''
+                    INSERT INTO notifications (id, user_id, title, message, type, dedup_key)
+                    VALUES {', '.join([row_placeholders] * len(batch))}
+                    ON CONFLICT (dedup_key) DO NOTHING
+                    RETURNING {NOTIFICATION_SELECT}
+                ''', params)
+                created.extend(map(Notification._make, cursor.fetchall()))
+            
+            conn.commit()
+            conn.close()
+            
+            return created
+        except Exception:
+            logger.exception("Toplu bildirim oluşturma hatası (%s bildirim)", len(notifications))
+            return []
+    
+    @staticmethod
+    def get_user_notifications(user_id, limit=50):
+        """Kullanıcının bildirimlerini getir"""
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            execute_statement(cursor, 'notifications_by_user', (user_id, limit))
             notifications = cursor.fetchall()
             conn.close()
             
-            return [Notification(*notification) for notification in notifications]
+            return list(map(Notification._make, notifications))
         except Exception as e:
             print(f"[HATA] Bildirimler getirme hatası: {e}")
             return []
@@ -892,8 +1747,7 @@ class Notification:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'UPDATE notifications SET is_read = {get_boolean_value(True)} WHERE id = {placeholder}', (notification_id,))
+            execute_statement(cursor, 'notification_mark_read', (notification_id,))
             conn.commit()
             conn.close()
             return True
@@ -907,8 +1761,7 @@ class Notification:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'UPDATE notifications SET is_read = {get_boolean_value(True)} WHERE user_id = {placeholder}', (user_id,))
+            execute_statement(cursor, 'notifications_mark_all_read', (user_id,))
             conn.commit()
             conn.close()
             return True
@@ -922,8 +1775,7 @@ class Notification:
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
-            placeholder = get_placeholder()
-            execute_query(cursor, f'SELECT COUNT(*) FROM notifications WHERE user_id = {placeholder} AND is_read = {get_boolean_value(False)}', (user_id,))
+            execute_statement(cursor, 'notifications_unread_count', (user_id,))
             count = cursor.fetchone()[0]
             conn.close()
             
@@ -0,0 +1,413 @@
+"""
+Fiyat yenileme zamanlayıcısı
+Her katalog ürününün bir sonraki kontrol zamanını (catalog_items.next_check_at)
+fiyat oynaklığına, alarm fiyatına yakınlığa ve takip eden kullanıcı sayısına
+göre belirler. Kontrol sırası bir öncelik kuyruğundan (heap) okunur.
+"""
+import hashlib
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from events import event_bus
+from models import PriceTracking, Notification
+from write_behind import WriteBehindBuffer
+
+# Yenileme aralıkları (saniye)
+BASE_REFRESH_INTERVAL = 6 * 3600
+MIN_REFRESH_INTERVAL = 15 * 60
+MAX_REFRESH_INTERVAL = 24 * 3600
+FAILED_REFRESH_INTERVAL = 2 * 3600  # Scraping başarısızsa tekrar deneme aralığı
+
+# Ağırlıklar
+VOLATILITY_WEIGHT = 4.0  # Her kontrolde değişen bir ürün ~5 kat sık kontrol edilir
+VOLATILITY_PRIOR_CHANGES = 1  # Geçmişi olmayan ürünler için varsayılan değişim oranı: 1/4
+VOLATILITY_PRIOR_CHECKS = 4
+ALERT_PROXIMITY_WINDOW = 0.20  # Fiyat alarmın %20 yakınındaysa sıklaştır
+ALERT_PROXIMITY_WEIGHT = 2.0
+
+PRICE_DROP_ALERT_RATIO = 0.10  # Tek kontrolde %10 ve üzeri düşüşte bildirim
+
+REFRESH_BATCH_SIZE = 10
+RELOAD_INTERVAL = 300  # Yeni takipleri almak için heap'i DB'den yeniden yükleme aralığı
+POLL_INTERVAL = 30
+
+
+def parse_price(price_text):
+    """'1.299,90 TL' gibi fiyat metnini float'a çevir, çevrilemezse None"""
+    if price_text is None:
+        return None
+    if isinstance(price_text, (int, float)):
+        return float(price_text)
+
+    cleaned = re.sub(r'[^\d,\.]', '', str(price_text))
+    if not cleaned:
+        return None
+
+    if ',' in cleaned and '.' in cleaned:
+        # Son görülen ayraç ondalık ayracıdır
+        if cleaned.rfind(',') > cleaned.rfind('.'):
+            cleaned = cleaned.replace('.', '').replace(',', '.')
+        else:
+            cleaned = cleaned.replace(',', '')
+    elif ',' in cleaned or '.' in cleaned:
+        separator = ',' if ',' in cleaned else '.'
+        head, _, tail = cleaned.rpartition(separator)
+        if cleaned.count(separator) > 1 or len(tail) == 3:
+            # '1.299' / '1.299.000' -> binlik ayracı
+            cleaned = cleaned.replace(separator, '')
+        else:
+            cleaned = f"{head}.{tail}"
+
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def normalize_text(value):
+    """Boşlukları sadeleştirip küçük harfe çevir (parmak izi için)"""
+    return ' '.join(str(value).split()).casefold() if value else ''
+
+
+def content_fingerprint(result):
+    """Scrape sonucunun normalize alanlarından kararlı bir parmak izi üret
+
+    Başlık, fiyat, eski fiyat ve görsel yolu kullanılır; boşluk/büyük harf
+    farkları, fiyat yazım biçimi ve görsel URL'sindeki CDN parametreleri
+    parmak izini değiştirmez.
+    """
+    image = result.get('image')
+    fields = [
+        normalize_text(result.get('title') or result.get('name')),
+        parse_price(result.get('price')),
+        parse_price(result.get('old_price')),
+        urlsplit(str(image)).path if image else ''
+    ]
+    payload = json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def merge_touch(old, new):
+    """Aynı katalog ürününün bekleyen kontrollerini birleştir: son zamanlar, toplam sayaç"""
+    return new[0], new[1], old[2] + new[2]
+
+
+def to_datetime(value):
+    """DB'den gelen TIMESTAMP değerini datetime'a çevir (SQLite string döndürür)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def compute_refresh_interval(check_count, change_count, current_price, alert_prices, tracker_count):
+    """Bir ürün için saniye cinsinden yenileme aralığını hesapla
+
+    - Oynaklık: gözlenen değişim oranı (change_count / check_count, önsel ile yumuşatılmış)
+    - Alarm yakınlığı: fiyat herhangi bir alarm fiyatına ALERT_PROXIMITY_WINDOW kadar yakınsa
+    - Popülerlik: takip eden kullanıcı sayısının logaritması
+    """
+    change_rate = (change_count + VOLATILITY_PRIOR_CHANGES) / (check_count + VOLATILITY_PRIOR_CHECKS)
+    volatility_factor = 1 + VOLATILITY_WEIGHT * change_rate
+
+    proximity_factor = 1.0
+    if current_price and current_price > 0:
+        for alert_price in alert_prices:
+            if not alert_price:
+                continue
+            gap = (current_price - float(alert_price)) / current_price
+            # Alarm zaten tetiklenmişse (gap <= 0) aciliyet yok
+            if 0 < gap < ALERT_PROXIMITY_WINDOW:
+                factor = 1 + ALERT_PROXIMITY_WEIGHT * (1 - gap / ALERT_PROXIMITY_WINDOW)
+                proximity_factor = max(proximity_factor, factor)
+
+    popularity_factor = 1 + math.log2(max(tracker_count, 1))
+
+    interval = BASE_REFRESH_INTERVAL / (volatility_factor * proximity_factor * popularity_factor)
+    return max(MIN_REFRESH_INTERVAL, min(MAX_REFRESH_INTERVAL, interval))
+
+
+def format_price(value):
+    """Bildirim metinleri için fiyatı biçimlendir"""
+    return f"{float(value):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+
+
+def evaluate_alerts(tracking_ids, drop_ratio=PRICE_DROP_ALERT_RATIO):
+    """Bir yenileme batch'inden sonra tetiklenen alarmlar için bildirim üret
+
+    Tetiklenen takipler tek sorguyla bulunur, bildirimler tek bir INSERT ile eklenir.
+    dedup_key takip kaydı ve fiyat değişimi (change_count) ile oluşur: aynı değişim
+    tekrar değerlendirilirse bildirim bir kez üretilir. Fiyat alarmın üstüne çıkıp
+    tekrar indiğinde veya aynı indirim fiyatına yeniden düştüğünde yeni bildirim gider.
+    Yeni bildirimler açık SSE bağlantılarına yayınlanır.
+    """
+    notifications = []
+    for tracking_id, user_id, previous_price, current_price, alert_price, name, change_count in \
+            PriceTracking.find_triggered_alerts(tracking_ids, drop_ratio):
+        if alert_price is not None and float(previous_price) > float(alert_price) >= float(current_price):
+            notifications.append((
+                user_id,
+                "Fiyat alarmı",
+                f"{name} {format_price(current_price)} ₺ oldu (alarm: {format_price(alert_price)} ₺)",
+                "price_alert",
+                f"alert:{tracking_id}:{change_count}"
+            ))
+        else:
+            drop_percent = (1 - float(current_price) / float(previous_price)) * 100
+            notifications.append((
+                user_id,
+                "Fiyat düştü",
+                f"{name} fiyatı %{drop_percent:.0f} düştü: {format_price(previous_price)} ₺ → {format_price(current_price)} ₺",
+                "price_drop",
+                f"drop:{tracking_id}:{change_count}"
+            ))
+
+    created = Notification.create_many(notifications)
+    for notification in created:
+        event_bus.publish(notification.user_id, 'notification', {
+            'id': notification.id,
+            'title': notification.title,
+            'message': notification.message,
+            'type': notification.type,
+            'created_at': notification.created_at
+        })
+    return created
+
+
+class RefreshScheduler:
+    """Takip edilen katalog ürünlerini next_check_at sırasıyla yenileyen zamanlayıcı
+
+    Heap girdileri catalog_item_id ile anahtarlanır: aynı canonical URL'yi
+    takip eden tüm kayıtlar tek girdide toplanır, URL bir kez scrape edilir ve
+    sonuç takipçilere tek UPDATE ile dağıtılır.
+    """
+
+    def __init__(self, scrape_func, batch_size=REFRESH_BATCH_SIZE):
+        self.scrape_func = scrape_func
+        self.batch_size = batch_size
+        self.heap = []
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.last_loaded = 0
+        # İçeriği değişmeyen kontroller katalog id'si bazında birleştirilip toplu yazılır
+        self.touch_buffer = WriteBehindBuffer(PriceTracking.touch_checks, merge=merge_touch, name='catalog-touch')
+        self.stats = {
+            'refreshed': 0,
+            'changed': 0,
+            'failed': 0,
+            'notifications': 0,
+            'writes': 0,
+            'writes_skipped': 0,
+            'last_batch_at': None
+        }
+
+    def load(self):
+        """Heap'i veritabanındaki takip kayıtlarından yeniden oluştur"""
+        entries = {}
+        for row in PriceTracking.get_refresh_candidates():
+            (catalog_item_id, url, current_price, next_check_at, check_count, change_count,
+             tracking_id, product_id, user_id, alert_price, fingerprint) = row
+            entry = entries.get(catalog_item_id)
+            if entry is None:
+                next_check_at = to_datetime(next_check_at)
+                entry = entries[catalog_item_id] = {
+                    'catalog_item_id': catalog_item_id,
+                    'url': url,
+                    'tracking_ids': [],
+                    'product_ids': [],
+                    'user_ids': [],
+                    'alert_prices': [],
+                    'current_price': current_price,
+                    'check_count': check_count or 0,
+                    'change_count': change_count or 0,
+                    'fingerprint': fingerprint,
+                    # Hiç kontrol edilmemiş katalog ürünü hemen sıraya girer
+                    'next_check_at': next_check_at or datetime.min
+                }
+            entry['tracking_ids'].append(tracking_id)
+            entry['product_ids'].append(product_id)
+            entry['user_ids'].append(user_id)
+            entry['alert_prices'].append(alert_price)
+
+        heap = [(entry['next_check_at'], catalog_item_id) for catalog_item_id, entry in entries.items()]
+        heapq.heapify(heap)
+
+        with self.lock:
+            self.entries = entries
+            self.heap = heap
+            self.last_loaded = time.time()
+
+        print(f"[DEBUG] Fiyat zamanlayıcısı yüklendi: {len(entries)} ürün")
+        return len(entries)
+
+    def pop_due(self, now=None, limit=None):
+        """Zamanı gelmiş en fazla `limit` girdiyi heap'ten çıkar"""
+        now = now or datetime.now()
+        limit = limit or self.batch_size
+        due = []
+        with self.lock:
+            while self.heap and len(due) < limit and self.heap[0][0] <= now:
+                next_check_at, catalog_item_id = heapq.heappop(self.heap)
+                entry = self.entries.get(catalog_item_id)
+                # Yeniden planlanmış (eski) heap girdilerini atla
+                if entry is None or entry['next_check_at'] != next_check_at:
+                    continue
+                due.append(entry)
+        return due
+
+    def schedule(self, entry, interval):
+        """Girdiyi `interval` saniye sonrası için heap'e geri koy"""
+        next_check_at = datetime.now() + timedelta(seconds=interval)
+        with self.lock:
+            entry['next_check_at'] = next_check_at
+            self.entries[entry['catalog_item_id']] = entry
+            heapq.heappush(self.heap, (next_check_at, entry['catalog_item_id']))
+        return next_check_at
+
+    def refresh_entry(self, entry):
+        """Tek bir katalog ürününü scrape et, sonucu kaydet ve yeniden planla"""
+        url = entry['url']
+        try:
+            result = self.scrape_func(url)
+        except Exception as e:
+            print(f"[HATA] Fiyat yenileme scraping hatası ({url}): {e}")
+            result = None
+
+        new_price = parse_price(result.get('price')) if result else None
+        if new_price is None:
+            self.stats['failed'] += 1
+            next_check_at = self.schedule(entry, FAILED_REFRESH_INTERVAL)
+            PriceTracking.record_check(entry['catalog_item_id'], next_check_at)
+            return None
+
+        old_value = float(entry['current_price']) if entry['current_price'] is not None else None
+        changed = old_value is not None and abs(old_value - new_price) > 0.005
+
+        entry['check_count'] += 1
+        if changed:
+            entry['change_count'] += 1
+            self.stats['changed'] += 1
+        entry['current_price'] = new_price
+        self.stats['refreshed'] += 1
+
+        interval = compute_refresh_interval(
+            entry['check_count'],
+            entry['change_count'],
+            new_price,
+            entry['alert_prices'],
+            len(entry['tracking_ids'])
+        )
+        next_check_at = self.schedule(entry, interval)
+
+        fingerprint = content_fingerprint(result)
+        if fingerprint == entry['fingerprint']:
+            # İçerik aynı: satırlara dokunma, sadece kontrol zamanını write-behind tamponuna ekle
+            self.touch_buffer.add(entry['catalog_item_id'], (datetime.now(), next_check_at, 1))
+            self.stats['writes_skipped'] += 1
+        else:
+            # Tamponda bekleyen kontroller bu yazmaya katılır; sonraki flush yeni değerleri ezmez
+            pending = self.touch_buffer.pop(entry['catalog_item_id'])
+            PriceTracking.record_check(
+                entry['catalog_item_id'],
+                next_check_at,
+                new_price,
+                result.get('price'),
+                result.get('old_price'),
+                fingerprint,
+                check_increment=1 + (pending[2] if pending else 0)
+            )
+            entry['fingerprint'] = fingerprint
+            self.stats['writes'] += 1
+
+        if changed:
+            for tracking_id, product_id, user_id in zip(entry['tracking_ids'], entry['product_ids'], entry['user_ids']):
+                event_bus.publish(user_id, 'price_change', {
+                    'tracking_id': tracking_id,
+                    'product_id': product_id,
+                    'price': new_price,
+                    'price_text': result.get('price'),
+                    'old_price_text': result.get('old_price')
+                })
+        return {
+            'catalog_item_id': entry['catalog_item_id'],
+            'url': url,
+            'price': new_price,
+            'changed': changed,
+            'tracking_ids': entry['tracking_ids'],
+            'next_check_at': next_check_at
+        }
+
+    def refresh_due(self, now=None):
+        """Zamanı gelmiş bir batch'i yenile"""
+        if time.time() - self.last_loaded > RELOAD_INTERVAL:
+            # Yeniden yüklemeden önce bekleyen next_check_at değerleri yazılmalı
+            self.touch_buffer.flush()
+            self.load()
+
+        results = []
+        for entry in self.pop_due(now):
+            result = self.refresh_entry(entry)
+            if result:
+                results.append(result)
+
+        self.touch_buffer.flush_if_due()
+
+        changed_ids = [tracking_id for result in results if result['changed'] for tracking_id in result['tracking_ids']]
+        self.stats['notifications'] += len(evaluate_alerts(changed_ids))
+
+        self.stats['last_batch_at'] = datetime.now().isoformat()
+        return results
+
+    def get_stats(self):
+        """Zamanlayıcı durumunu döndür"""
+        with self.lock:
+            next_due = self.heap[0][0] if self.heap else None
+            queued = len(self.entries)
+        checks = self.stats['writes'] + self.stats['writes_skipped']
+        return {
+            **self.stats,
+            # Başarılı kontrollerden yazma yapılmadan geçilenlerin oranı
+            'write_avoidance_ratio': round(self.stats['writes_skipped'] / checks, 3) if checks else None,
+            'write_behind': self.touch_buffer.get_stats(),
+            'queued_products': queued,
+            'next_check_at': next_due.isoformat() if next_due and next_due != datetime.min else None
+        }
+
+    def run_forever(self, poll_interval=POLL_INTERVAL):
+        """Arka plan döngüsü"""
+        while not self.stop_event.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                print(f"[HATA] Fiyat zamanlayıcısı hatası: {e}")
+            self.stop_event.wait(poll_interval)
+
+    def start(self, poll_interval=POLL_INTERVAL):
+        """Zamanlayıcıyı arka plan thread'inde başlat (idempotent)"""
+        if self.thread and self.thread.is_alive():
+            return False
+        self.stop_event.clear()
+        self.thread = threading.Thread(
+            target=self.run_forever,
+            args=(poll_interval,),
+            name='price-refresh-scheduler',
+            daemon=True
+        )
+        self.thread.start()
+        print(f"[DEBUG] Fiyat zamanlayıcısı başlatıldı")
+        return True
+
+    def stop(self):
+        """Arka plan döngüsünü durdur ve bekleyen kontrolleri yaz"""
+        self.stop_event.set()
+        self.touch_buffer.flush()
@@ -0,0 +1,181 @@
+"""
+Scraping istatistikleri: sınırlı hata kaydı ve kayan pencere sayaçları
+Son hatalar sabit boyutlu bir halka tamponda (deque) tutulur; domain bazında
+başarı/hata sayıları zaman kovalı kayan sayaçlarla izlenir. Başarı oranları
+ve problemli domain listesi her kayıtta artımlı güncellenir, okumalar tüm
+domain'leri taramaz.
+"""
+import os
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from metrics import MAX_METRIC_DOMAINS, OTHER_DOMAIN
+
+ERROR_LOG_SIZE = int(os.environ.get('SCRAPE_ERROR_LOG_SIZE', 200))
+
+# Kayan pencere: ROLLING_BUCKETS adet ROLLING_BUCKET_SECONDS'lık kova (varsayılan 1 saat)
+ROLLING_BUCKET_SECONDS = 60
+ROLLING_BUCKETS = 60
+
+# Problemli domain eşiği: pencerede en az bu kadar istek ve bu oranın altında başarı
+PROBLEM_MIN_REQUESTS = 5
+PROBLEM_SUCCESS_RATE = 50
+
+
+class RollingCounter:
+    """Zaman kovalı kayan sayaç
+
+    Kovalar halka dizide tutulur; süresi dolan kovalar ilerlerken toplamdan
+    düşülür, böylece total() her çağrıda kovaları toplamaz.
+    """
+
+    def __init__(self, bucket_seconds=ROLLING_BUCKET_SECONDS, buckets=ROLLING_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.counts = [0] * buckets
+        self.current = None
+        self.sum = 0
+
+    def _advance(self, now):
+        bucket = int(now // self.bucket_seconds)
+        if self.current is None:
+            self.current = bucket
+            return
+        steps = min(bucket - self.current, len(self.counts))
+        for offset in range(1, steps + 1):
+            index = (self.current + offset) % len(self.counts)
+            self.sum -= self.counts[index]
+            self.counts[index] = 0
+        if bucket > self.current:
+            self.current = bucket
+
+    def add(self, amount=1, now=None):
+        self._advance(time.time() if now is None else now)
+        self.counts[self.current % len(self.counts)] += amount
+        self.sum += amount
+
+    def total(self, now=None):
+        self._advance(time.time() if now is None else now)
+        return self.sum
+
+
+def success_rate(success, total):
+    return (success / total * 100) if total > 0 else 0
+
+
+class DomainStats:
+    """Domain'in toplam ve kayan pencere sayaçları"""
+
+    __slots__ = ('success', 'failed', 'recent_success', 'recent_failed')
+
+    def __init__(self):
+        self.success = 0
+        self.failed = 0
+        self.recent_success = RollingCounter()
+        self.recent_failed = RollingCounter()
+
+    def recent(self, now=None):
+        """(pencerede başarılı, pencerede toplam)"""
+        success = self.recent_success.total(now)
+        return success, success + self.recent_failed.total(now)
+
+    def to_dict(self, now=None):
+        recent_success, recent_total = self.recent(now)
+        return {
+            'success': self.success,
+            'failed': self.failed,
+            'recent_requests': recent_total,
+            'recent_success_rate': success_rate(recent_success, recent_total)
+        }
+
+
+class ScrapingStats:
+    """Process geneli scraping sayaçları"""
+
+    def __init__(self, error_log_size=ERROR_LOG_SIZE, max_domains=MAX_METRIC_DOMAINS):
+        self.max_domains = max_domains
+        self.lock = threading.Lock()
+        self.total_requests = 0
+        self.successful_requests = 0
+        self.failed_requests = 0
+        self.error_count = 0
+        self.error_log = deque(maxlen=error_log_size)
+        self.domains = {}
+        # domain -> {'success_rate', 'total_requests'}; her kayıtta sadece ilgili domain güncellenir
+        self.problematic = {}
+
+    def _domain(self, domain):
+        stats = self.domains.get(domain)
+        if stats is None:
+            if len(self.domains) >= self.max_domains:
+                domain = OTHER_DOMAIN
+            stats = self.domains.setdefault(domain, DomainStats())
+        return domain, stats
+
+    def _update_health(self, domain, stats, now):
+        recent_success, recent_total = stats.recent(now)
+        rate = success_rate(recent_success, recent_total)
+        if recent_total > PROBLEM_MIN_REQUESTS and rate < PROBLEM_SUCCESS_RATE:
+            self.problematic[domain] = {'success_rate': rate, 'total_requests': recent_total}
+        else:
+            self.problematic.pop(domain, None)
+
+    def record_request(self):
+        with self.lock:
+            self.total_requests += 1
+
+    def record_success(self, domain):
+        now = time.time()
+        with self.lock:
+            self.successful_requests += 1
+            domain, stats = self._domain(domain)
+            stats.success += 1
+            stats.recent_success.add(1, now)
+            self._update_health(domain, stats, now)
+
+    def record_error(self, domain, error_info):
+        now = time.time()
+        with self.lock:
+            self.failed_requests += 1
+            self.error_count += 1
+            self.error_log.append(error_info)
+            domain, stats = self._domain(domain)
+            stats.failed += 1
+            stats.recent_failed.add(1, now)
+            self._update_health(domain, stats, now)
+
+    def recent_errors(self, limit):
+        """Son `limit` hata (eskiden yeniye)"""
+        with self.lock:
+            start = max(len(self.error_log) - limit, 0)
+            return list(islice(self.error_log, start, None))
+
+    def summary(self):
+        """Toplam sayaçlar ve problemli domain'ler; domain sayısından bağımsız"""
+        now = time.time()
+        with self.lock:
+            # Pencereden çıkan problemli domain'ler yeni istek gelmeden de temizlensin
+            for domain in list(self.problematic):
+                self._update_health(domain, self.domains[domain], now)
+            return {
+                'total_requests': self.total_requests,
+                'successful_requests': self.successful_requests,
+                'failed_requests': self.failed_requests,
+                'success_rate': success_rate(self.successful_requests, self.total_requests),
+                'total_errors': self.error_count,
+                'problematic_domains': [
+                    {'domain': domain, **info} for domain, info in self.problematic.items()
+                ]
+            }
+
+    def domain_stats(self):
+        """{domain: sayaçlar} - tüm domain'leri döndürür"""
+        now = time.time()
+        with self.lock:
+            return {domain: stats.to_dict(now) for domain, stats in self.domains.items()}
+
+    def domain_counts(self):
+        """[(domain, başarılı, hatalı), ...] - metrik dışa aktarımı için"""
+        with self.lock:
+            return sorted((domain, stats.success, stats.failed) for domain, stats in self.domains.items())
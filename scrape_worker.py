@@ -0,0 +1,210 @@
+"""
+Ayrı process'te çalışan scrape worker'ı
+Playwright/Chromium web process'inden ayrılır: browser bellek sıçraması veya
+takılması HTTP tarafını düşürmez, web ve scraping kapasitesi ayrı ölçeklenir.
+Web process'i SCRAPE_WORKER_SOCKET tanımlıysa scrape_product() çağrılarını bu
+worker'a Unix socket üzerinden gönderir.
+
+Protokol: satır başına bir JSON mesajı (UTF-8, '\\n' ile biter)
+    istek   {"id": 1, "method": "scrape", "params": {"url": "https://..."}}
+    yanıt   {"id": 1, "result": {...}}  veya  {"id": 1, "error": "..."}
+    method  scrape  normalize edilmiş ürün sonucu (RESULT_FIELDS)
+            ping    worker durumu (pid, aktif/toplam/başarısız iş)
+
+Ortam değişkenleri:
+    SCRAPE_WORKER_SOCKET     Socket yolu (worker dinler, web process'i bağlanır)
+    SCRAPE_WORKER_THREADS    Aynı anda çalışan iş sayısı (varsayılan 4); worker'da
+                             SCRAPE_MAX_BROWSERS bu değere eşitlenir, her iş kendi
+                             Chromium'unu açar
+    SCRAPE_WORKER_TIMEOUT    Web process'inin bir yanıtı bekleme sınırı, saniye
+                             (varsayılan 180; kuyrukta bekleme ve tekrar denemeler dahil)
+
+Tek bir browser oturumunun süresini app.py'deki SCRAPE_BROWSER_TIMEOUT sınırlar;
+süre yuva alındıktan sonra başlar ve dolunca o işin Chromium'u kapatılır.
+
+Kullanım:
+    SCRAPE_WORKER_SOCKET=/tmp/wishya-scrape.sock python scrape_worker.py
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCRAPE_WORKER_SOCKET = os.environ.get('SCRAPE_WORKER_SOCKET')
+SCRAPE_WORKER_THREADS = int(os.environ.get('SCRAPE_WORKER_THREADS', 4))
+SCRAPE_WORKER_TIMEOUT = float(os.environ.get('SCRAPE_WORKER_TIMEOUT', 180))
+
+# Tek mesaj için üst sınır (sonuçlar birkaç KB)
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+# Worker'ın döndürdüğü alanlar; web tarafı sadece bunlara güvenir
+RESULT_FIELDS = ('id', 'url', 'name', 'price', 'old_price', 'image', 'brand', 'sizes')
+
+logger = logging.getLogger('wishya.scrape_worker')
+
+
+class ScrapeWorkerError(Exception):
+    """Worker'a ulaşılamadı, zaman aşımı veya worker hata döndürdü"""
+
+
+def normalize_result(url, result):
+    """Scraper sonucunu RESULT_FIELDS şekline getir
+
+    Bazı site scraper'ları name/price yerine title/current_price döndürür.
+    """
+    result = result or {}
+    normalized = {field: result.get(field) for field in RESULT_FIELDS}
+    normalized['url'] = normalized['url'] or url
+    normalized['name'] = normalized['name'] or result.get('title')
+    normalized['price'] = normalized['price'] or result.get('current_price')
+    normalized['sizes'] = list(normalized['sizes'] or [])
+    # JSON'a çevrilemeyen değerler (datetime vb.) metin olarak gider
+    return json.loads(json.dumps(normalized, default=str))
+
+
+def encode_message(message):
+    return json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class ScrapeWorkerClient:
+    """Web process'i tarafı: her çağrı için kısa ömürlü bir bağlantı açar"""
+
+    def __init__(self, socket_path, timeout=SCRAPE_WORKER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    async def call(self, method, params=None):
+        try:
+            return await asyncio.wait_for(self._call(method, params or {}), self.timeout)
+        except asyncio.TimeoutError:
+            raise ScrapeWorkerError(f"Scrape worker zaman aşımı ({method})")
+        except OSError as e:
+            raise ScrapeWorkerError(f"Scrape worker'a bağlanılamadı: {e}")
+
+    async def _call(self, method, params):
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_MESSAGE_SIZE)
+        try:
+            writer.write(encode_message({'id': 1, 'method': method, 'params': params}))
+            await writer.drain()
+            line = await reader.readline()
+        finally:
+            writer.close()
+        if not line:
+            raise ScrapeWorkerError(f"Scrape worker yanıt vermeden bağlantıyı kapattı ({method})")
+        response = json.loads(line)
+        if 'error' in response:
+            raise ScrapeWorkerError(response['error'])
+        return response['result']
+
+    async def scrape(self, url):
+        return await self.call('scrape', {'url': url})
+
+    async def ping(self):
+        return await self.call('ping')
+
+
+class ScrapeWorker:
+    """Worker tarafı: Unix socket üzerinden gelen işleri thread havuzunda çalıştırır
+
+    Her iş kendi thread'inde ve event loop'unda çalışır (web process'indeki
+    gthread modeli gibi); rate limit beklemesi diğer işleri durdurmaz. Süre
+    sınırı burada değil browser oturumunda (app.browser_slot) uygulanır: thread
+    dışarıdan durdurulamadığı için takılan iş ancak kendi Chromium'u kapatılınca
+    havuza döner.
+    """
+
+    def __init__(self, scrape_func, threads=SCRAPE_WORKER_THREADS):
+        self.scrape_func = scrape_func
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='scrape-job')
+        self.started_at = time.time()
+        self.stats = {'active': 0, 'total': 0, 'failed': 0}
+
+    async def scrape(self, url):
+        loop = asyncio.get_running_loop()
+        self.stats['active'] += 1
+        self.stats['total'] += 1
+        try:
+            result = await loop.run_in_executor(self.executor, self.scrape_func, url)
+            return normalize_result(url, result)
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        finally:
+            self.stats['active'] -= 1
+
+    def ping(self):
+        return {'pid': os.getpid(), 'uptime': round(time.time() - self.started_at, 1), **self.stats}
+
+    async def dispatch(self, message):
+        method = message.get('method')
+        params = message.get('params') or {}
+        if method == 'scrape':
+            if not params.get('url'):
+                raise ScrapeWorkerError('url gerekli')
+            return await self.scrape(params['url'])
+        if method == 'ping':
+            return self.ping()
+        raise ScrapeWorkerError(f"Bilinmeyen method: {method}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message_id = None
+                try:
+                    message = json.loads(line)
+                    message_id = message.get('id')
+                    response = {'id': message_id, 'result': await self.dispatch(message)}
+                except Exception as e:
+                    logger.warning("İş başarısız: %s", e)
+                    response = {'id': message_id, 'error': str(e)}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            logger.warning("Bağlantı hatası: %s", e)
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path):
+        # Önceki çalışmadan kalan socket dosyası bind'ı engeller
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, socket_path, limit=MAX_MESSAGE_SIZE)
+        os.chmod(socket_path, 0o660)
+        # SIGTERM'de (deploy/ölçekleme) socket dosyası temizlensin
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, asyncio.current_task().cancel)
+        logger.info("Scrape worker dinliyor: %s (pid %s)", socket_path, os.getpid())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def main():
+    if not SCRAPE_WORKER_SOCKET:
+        raise SystemExit('SCRAPE_WORKER_SOCKET tanımlı değil')
+
+    # Her thread'in kendi browser yuvası olsun; aksi halde işler tek Chromium'u sırayla bekler
+    os.environ['SCRAPE_MAX_BROWSERS'] = str(SCRAPE_WORKER_THREADS)
+
+    # Scraping pipeline'ı app.py'dedir; worker onu kendi process'inde, web'e yönlendirmeden çalıştırır
+    from app import scrape_product_local_sync
+
+    try:
+        asyncio.run(ScrapeWorker(scrape_product_local_sync).serve(SCRAPE_WORKER_SOCKET))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Scrape worker durduruldu")
+
+
+if __name__ == '__main__':
+    main()
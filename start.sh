@@ -0,0 +1,53 @@
+#!/bin/bash
+
+# Tek container başlatıcı: scrape worker + gunicorn aynı makinede çalışır
+# Worker'ın Unix socket'i container dışına açılmaz; bu yüzden iki process ayrı
+# servis/container olarak değil, burada birlikte başlatılır.
+# SCRAPE_WORKER_ENABLED=0 ile worker başlatılmaz, scraping web process'inde yapılır.
+#
+# Worker varken web process'i Playwright çalıştırmaz ve gevent worker'ıyla açılır:
+# /events (SSE) bağlantıları request thread'i değil sadece bir greenlet tutar.
+# gevent process'i uygulamayı import etmeden önce patch'lemeli; bu yüzden --preload yok.
+# Worker yoksa Playwright web process'inde çalışır; gevent ile uyumsuz olduğu için gthread
+# kullanılır ve SSE kapalıdır (istemciler polling yapar).
+
+PORT="${PORT:-8080}"
+COMMON_ARGS=(
+    --bind "0.0.0.0:${PORT}" --workers 1
+    --timeout 120 --keep-alive 2 --max-requests 1000 --max-requests-jitter 100
+)
+
+if [ "${SCRAPE_WORKER_ENABLED:-1}" = "0" ]; then
+    unset SCRAPE_WORKER_SOCKET
+    exec gunicorn "${COMMON_ARGS[@]}" --worker-class gthread --threads 4 --preload app:app
+fi
+
+GUNICORN_ARGS=("${COMMON_ARGS[@]}" --worker-class gevent --worker-connections "${WEB_WORKER_CONNECTIONS:-500}")
+
+export SCRAPE_WORKER_SOCKET="${SCRAPE_WORKER_SOCKET:-/tmp/wishya-scrape.sock}"
+
+python scrape_worker.py &
+WORKER_PID=$!
+
+# Worker app'i import ederken socket henüz yoktur; ilk istekler hata dönmesin diye beklenir
+for _ in $(seq 1 60); do
+    [ -S "$SCRAPE_WORKER_SOCKET" ] && break
+    if ! kill -0 "$WORKER_PID" 2>/dev/null; then
+        echo "[HATA] Scrape worker başlatılamadı"
+        exit 1
+    fi
+    sleep 0.5
+done
+
+gunicorn "${GUNICORN_ARGS[@]}" app:app &
+WEB_PID=$!
+
+# Docker SIGTERM'ü sadece bu script'e (PID 1) gönderir; iki process'e de iletilir
+trap 'kill -TERM "$WEB_PID" "$WORKER_PID" 2>/dev/null' TERM INT
+
+# Biri çökerse diğeri de durdurulur; platform container'ı yeniden başlatır
+wait -n "$WEB_PID" "$WORKER_PID"
+STATUS=$?
+kill -TERM "$WEB_PID" "$WORKER_PID" 2>/dev/null
+wait
+exit "$STATUS"
@@ -0,0 +1,122 @@
+"""
+Process içi write-behind tamponu
+Sık tekrarlanan metadata güncellemeleri (kontrol zamanı, sayaçlar) anahtar
+bazında birleştirilir ve zaman ya da boyut eşiğinde tek bir toplu yazmayla
+veritabanına aktarılır. Yazma başarısız olursa kayıtlar tampona geri konur;
+process kapanırken (atexit) bekleyen kayıtlar yazılır.
+"""
+import atexit
+import os
+import threading
+import time
+
+WRITE_BEHIND_MAX_SIZE = int(os.environ.get('WRITE_BEHIND_MAX_SIZE', 500))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', 60))
+
+
+def replace_value(old, new):
+    """Varsayılan birleştirme: son yazılan değer kazanır"""
+    return new
+
+
+class WriteBehindBuffer:
+    """Anahtar bazında birleştirilen güncellemeleri toplu yazan tampon
+
+    flush_func: [(anahtar, değer), ...] listesini alıp tek transaction'da
+    yazan fonksiyon; başarısızsa False döndürmeli veya hata fırlatmalı.
+    merge: aynı anahtar için (eski, yeni) değerlerini birleştiren fonksiyon.
+    """
+
+    def __init__(self, flush_func, merge=replace_value, max_size=WRITE_BEHIND_MAX_SIZE,
+                 flush_interval=WRITE_BEHIND_FLUSH_INTERVAL, name='write-behind'):
+        self.flush_func = flush_func
+        self.merge = merge
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self.pending = {}
+        self.lock = threading.Lock()
+        # Aynı anda tek flush; sıralama korunur
+        self.flush_lock = threading.Lock()
+        self.last_flush = time.time()
+        self.stats = {
+            'added': 0,
+            'coalesced': 0,
+            'flushes': 0,
+            'flushed_rows': 0,
+            'failed_flushes': 0
+        }
+        atexit.register(self.flush)
+
+    def add(self, key, value):
+        """Güncellemeyi tampona ekle; boyut eşiği aşıldıysa hemen yaz"""
+        with self.lock:
+            if key in self.pending:
+                self.pending[key] = self.merge(self.pending[key], value)
+                self.stats['coalesced'] += 1
+            else:
+                self.pending[key] = value
+            self.stats['added'] += 1
+            full = len(self.pending) >= self.max_size
+
+        if full:
+            self.flush()
+
+    def pop(self, key):
+        """Anahtarın bekleyen güncellemesini tampondan çıkarıp döndür (yoksa None)
+
+        Aynı satıra doğrudan yazılacaksa bekleyen değer o yazmaya katılır,
+        böylece sonraki flush daha yeni değerin üzerine yazmaz.
+        """
+        with self.lock:
+            return self.pending.pop(key, None)
+
+    def flush_if_due(self):
+        """Son flush'tan bu yana flush_interval geçtiyse yaz"""
+        if time.time() - self.last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """Bekleyen tüm güncellemeleri tek toplu yazmayla aktar, yazılan satır sayısını döndür"""
+        with self.flush_lock:
+            with self.lock:
+                items, self.pending = list(self.pending.items()), {}
+            self.last_flush = time.time()
+            if not items:
+                return 0
+
+            try:
+                written = self.flush_func(items)
+            except Exception as e:
+                print(f"[HATA] {self.name} flush hatası: {e}")
+                written = False
+
+            if written is False:
+                self.requeue(items)
+                self.stats['failed_flushes'] += 1
+                return 0
+
+            self.stats['flushes'] += 1
+            self.stats['flushed_rows'] += len(items)
+            return len(items)
+
+    def requeue(self, items):
+        """Yazılamayan kayıtları tampona geri koy; bu arada gelen daha yeni değerler üstte kalır"""
+        with self.lock:
+            for key, value in items:
+                if key in self.pending:
+                    self.pending[key] = self.merge(value, self.pending[key])
+                else:
+                    self.pending[key] = value
+
+    def get_stats(self):
+        """Tampon durumunu döndür"""
+        with self.lock:
+            pending = len(self.pending)
+        return {
+            **self.stats,
+            'pending': pending,
+            'max_size': self.max_size,
+            'flush_interval': self.flush_interval
+        }